@@ -0,0 +1,446 @@
+"""
+Performance benchmarks for NeuCBOT.
+
+Run from the repository root, so that ./neucbot/elements.json, ./AlphaLists,
+./Chains and ./Data/StoppingPowers resolve as they do for neucbot.py:
+
+  python -m benchmarks.run                      # run and compare to baseline.json
+  python -m benchmarks.run --sizes small        # only the small composition
+  python -m benchmarks.run --save-baseline      # overwrite baseline.json
+
+Isotope data is generated by benchmarks/synthetic.py into a temporary
+directory, and TALYS is replaced by benchmarks/bin/talys. The startup stages time complete
+neucbot.py invocations in a new interpreter. Every stage reports
+its best wall time over --repeat runs and the peak memory allocated by Python
+and numpy during one further run, traced with tracemalloc.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from argparse import ArgumentParser
+
+import numpy
+
+from benchmarks import synthetic
+from neucbot import cache
+from neucbot import config
+from neucbot import datastore
+from neucbot import material
+from neucbot import response
+from neucbot import runner
+from neucbot import talys
+from neucbot import utils
+from neucbot.alpha import ChainAlphaList
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+FAKE_TALYS_DIR = os.path.join(BENCHMARKS_DIR, "bin")
+
+CHAIN_FILE = "Chains/Th232Chain.dat"
+STEP_SIZE = 0.01
+
+# Elements (with all natural isotopes) in each benchmark composition, in
+# equal mass fractions
+COMPOSITIONS = {
+    "small": ["C"],
+    "medium": ["C", "H", "O"],
+    "large": ["C", "H", "O", "N", "F", "Na", "Al", "Si", "Cl", "K", "Ca", "Fe"],
+}
+
+STARTUP_COMMANDS = {
+    "startup_help": ["-h"],
+    "startup_print_alphas_only": [
+        "-c",
+        CHAIN_FILE,
+        "-m",
+        "Materials/Acrylic.dat",
+        "--print-alphas-only",
+    ],
+}
+
+TALYS_ENERGIES = 16
+TALYS_WORKERS = 4
+
+
+# Returns the best wall time (in seconds) of repeat runs of function, and the
+# peak memory (in bytes) traced during one more run. setup is run before
+# every run, untimed, and its return value passed as arguments to function.
+def measure(function, setup=None, repeat=3):
+    best = None
+
+    for _ in range(repeat):
+        args = setup() if setup else ()
+
+        start = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    args = setup() if setup else ()
+
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def composition_json(symbols):
+    return {
+        "elements": [
+            {"element": symbol, "mass_number": 0, "fraction": 100.0 / len(symbols)}
+            for symbol in symbols
+        ]
+    }
+
+
+# Forgets every parsed and memory-mapped isotope file, as in a new process
+def drop_isotope_data():
+    cache.ISOTOPE_DATA.clear()
+    datastore.OPEN_STORES.clear()
+    response.RESPONSES.clear()
+    material.STOPPING_POWER_LISTS.clear()
+
+
+def quiet_runner(engine):
+    return runner.create_runner(config.Config({"engine": engine, "quiet": True}))
+
+
+def benchmark_common(repeat):
+    results = {}
+
+    chain = ChainAlphaList.from_filepath(CHAIN_FILE)
+    chain.load_or_fetch()
+
+    results["condense"] = measure(lambda: chain.condense(STEP_SIZE), repeat=repeat)
+
+    spectra = [
+        utils.Histogram(
+            {
+                int(energy * 1000): value * 1e-30
+                for energy, value in synthetic.spectrum("C", 13, alpha_energy)
+            }
+        )
+        for alpha_energy in synthetic.energy_grid(9.0, 0.05)
+    ]
+
+    results["rebin"] = measure(
+        lambda: [spectrum.rebin() for spectrum in spectra], repeat=repeat
+    )
+
+    energies = numpy.array([energy for energy, _ in chain.condense(STEP_SIZE)])
+    stopping_power_lists = [
+        material.StoppingPowerList.for_element(symbol)
+        for symbol in COMPOSITIONS["large"]
+    ]
+
+    results["stopping_power"] = measure(
+        lambda: [
+            [stopping_powers.for_alpha(energy) for energy in energies]
+            for stopping_powers in stopping_power_lists
+        ],
+        repeat=repeat,
+    )
+    results["stopping_power_array"] = measure(
+        lambda: [
+            stopping_powers.for_alpha(energies)
+            for stopping_powers in stopping_power_lists
+        ],
+        repeat=repeat,
+    )
+
+    return results
+
+
+# Wall time of short neucbot.py invocations, each in a new interpreter
+def benchmark_startup(repeat):
+    results = {}
+
+    for stage, args in STARTUP_COMMANDS.items():
+        command = [sys.executable, "neucbot.py", *args]
+
+        results[stage] = measure(
+            lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True),
+            repeat=repeat,
+        )
+
+    return results
+
+
+def benchmark_talys(repeat):
+    results = {}
+    energies = synthetic.energy_grid(9.0, 9.0 / TALYS_ENERGIES)
+    jobs = [("C", 13, energy) for energy in energies]
+
+    path = os.environ["PATH"]
+    os.environ["PATH"] = FAKE_TALYS_DIR + os.pathsep + path
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["talys_serial"] = measure(
+                lambda: [
+                    talys.Runner(element, mass_number).run_in_scratch_dir(energy)
+                    for element, mass_number, energy in jobs
+                ],
+                repeat=repeat,
+            )
+            results["talys_parallel"] = measure(
+                lambda: talys.run_parallel(jobs, TALYS_WORKERS), repeat=repeat
+            )
+    finally:
+        os.environ["PATH"] = path
+
+    return results
+
+
+def benchmark_composition(symbols, condensed_alphas, repeat):
+    results = {}
+    request_json = composition_json(symbols)
+
+    def new_composition():
+        drop_isotope_data()
+        return (material.Composition.from_json(request_json),)
+
+    composition = material.Composition.from_json(request_json)
+
+    def warm_composition():
+        return (composition,)
+
+    def run(engine):
+        return lambda comp: quiet_runner(engine).compute(
+            condensed_alphas, comp, STEP_SIZE
+        )
+
+    results["load_composition"] = measure(
+        lambda: material.Composition.from_json(request_json), repeat=repeat
+    )
+    results["run_cold"] = measure(run("loop"), new_composition, repeat)
+    results["run_warm"] = measure(run("loop"), warm_composition, repeat)
+    results["run_vectorized_cold"] = measure(run("vectorized"), new_composition, repeat)
+    results["run_vectorized_warm"] = measure(
+        run("vectorized"), warm_composition, repeat
+    )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["compile_data"] = measure(
+            lambda comp: comp.compile_data(), new_composition, repeat
+        )
+
+    def no_responses():
+        response.RESPONSES.clear()
+        shutil.rmtree(response.RESPONSES_DIR, ignore_errors=True)
+        return new_composition()
+
+    results["build_response"] = measure(run("response"), no_responses, repeat)
+    results["run_response_warm"] = measure(run("response"), warm_composition, repeat)
+
+    results["run_compiled_cold"] = measure(run("loop"), new_composition, repeat)
+    results["run_vectorized_compiled_cold"] = measure(
+        run("vectorized"), new_composition, repeat
+    )
+
+    return results
+
+
+# Every file the benchmarks write (isotope data, compiled stores, the stopping
+# power bundle and responses) goes to a temporary directory, removed after
+def run_benchmarks(sizes, repeat, max_energy):
+    paths = (
+        talys.ISOTOPES_DIR,
+        response.RESPONSES_DIR,
+        material.STOPPING_POWER_BUNDLE,
+    )
+
+    isotopes_dir = tempfile.mkdtemp(prefix="neucbot-benchmarks-")
+    talys.ISOTOPES_DIR = isotopes_dir
+    response.RESPONSES_DIR = os.path.join(isotopes_dir, "Responses")
+    material.STOPPING_POWER_BUNDLE = os.path.join(isotopes_dir, "stopping_powers.npy")
+
+    results = {"common": {}}
+
+    try:
+        print("Running common benchmarks", file=sys.stderr)
+        results["common"].update(benchmark_common(repeat))
+        results["common"].update(benchmark_talys(repeat))
+        results["common"].update(benchmark_startup(repeat))
+
+        chain = ChainAlphaList.from_filepath(CHAIN_FILE)
+        chain.load_or_fetch()
+        condensed_alphas = chain.condense(STEP_SIZE)
+
+        for size in sizes:
+            symbols = COMPOSITIONS[size]
+            isotopes = [
+                (material_isotope.element.symbol, material_isotope.mass_number)
+                for material_isotope in material.Composition.from_json(
+                    composition_json(symbols)
+                ).materials
+            ]
+
+            print(
+                f"Generating {len(isotopes)} isotopes for {size} composition",
+                file=sys.stderr,
+            )
+            start = time.perf_counter()
+            n_files = synthetic.generate(
+                isotopes_dir,
+                isotopes,
+                synthetic.energy_grid(max_energy, STEP_SIZE),
+                gap_every=97,
+            )
+            print(
+                f"Wrote {n_files} files in {time.perf_counter() - start:.1f}s",
+                file=sys.stderr,
+            )
+
+            print(f"Running {size} benchmarks", file=sys.stderr)
+            results[size] = benchmark_composition(symbols, condensed_alphas, repeat)
+    finally:
+        drop_isotope_data()
+        shutil.rmtree(isotopes_dir, ignore_errors=True)
+
+        (
+            talys.ISOTOPES_DIR,
+            response.RESPONSES_DIR,
+            material.STOPPING_POWER_BUNDLE,
+        ) = paths
+
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# Compares two result sets and returns the rows to print, as
+# (group, stage, result, baseline result or None, regression)
+def compare(results, baseline, tolerance):
+    rows = []
+
+    for group, stages in results.items():
+        for stage, result in stages.items():
+            base = baseline.get(group, {}).get(stage)
+            regression = (
+                base is not None and result["seconds"] > tolerance * base["seconds"]
+            )
+            rows.append((group, stage, result, base, regression))
+
+    return rows
+
+
+def print_report(rows):
+    print(
+        f"{'group':<8} {'stage':<30} {'seconds':>10} {'baseline':>10} {'ratio':>7} {'peak MB':>9}"
+    )
+
+    for group, stage, result, base, regression in rows:
+        seconds = result["seconds"]
+        peak_mb = result["peak_bytes"] / 1024 / 1024
+
+        if base is None:
+            baseline_text, ratio_text = "-", "-"
+        else:
+            baseline_text = f"{base['seconds']:.4f}"
+            ratio_text = f"{seconds / base['seconds']:.2f}"
+
+        print(
+            f"{group:<8} {stage:<30} {seconds:>10.4f} {baseline_text:>10} {ratio_text:>7} {peak_mb:>9.1f}"
+            + ("  REGRESSION" if regression else "")
+        )
+
+
+def main():
+    parser = ArgumentParser(
+        prog="benchmarks",
+        description="Benchmarks NeuCBOT on synthetic isotopic data and compares the timings to a stored baseline.",
+    )
+
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=list(COMPOSITIONS),
+        default=list(COMPOSITIONS),
+        help="Composition sizes to benchmark (options: %(choices)s)",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Timed runs per stage"
+    )
+    parser.add_argument(
+        "--max-energy",
+        type=float,
+        default=9.0,
+        help="Highest alpha energy (in MeV) of the synthetic data",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_FILE,
+        help="Baseline results file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="Slowdown relative to the baseline reported as a regression",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write these results to the baseline file",
+    )
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with a non-zero status if any stage regressed",
+    )
+
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeat, args.max_energy)
+    report = {
+        "environment": environment(),
+        "repeat": args.repeat,
+        "max_energy": args.max_energy,
+        "results": results,
+    }
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+
+    rows = compare(results, baseline, args.tolerance)
+    print_report(rows)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.check and any(regression for *_, regression in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Synthetic TALYS data for benchmarks.
+
+Writes TalysOut/outputE<energy> and NSpectra/nspec<energy>.tot files in the
+layout NeuCBOT reads from Data/Isotopes, for any list of isotopes and alpha
+energy grid. Values are smooth, deterministic functions of the isotope and
+alpha energy, so the same arguments always produce the same tree:
+
+  - the (alpha,n) cross section is zero below a threshold that depends on the
+    mass number, and rises towards a plateau above it
+  - the neutron spectrum is an evaporation-like E * exp(-E / T) shape up to
+    the alpha energy plus the isotope's pseudo Q-value, on a grid whose
+    number of points varies from one alpha energy to the next
+
+Below threshold, spectra files hold "EMPTY", as TALYS outputs do.
+"""
+
+import math
+
+from argparse import ArgumentParser
+
+from neucbot import elements
+from neucbot import talys
+
+OUTPUT_TEMPLATE = """ TALYS-synthetic
+
+ 2. Binary non-elastic cross sections (non-exclusive)
+
+   gamma   = 1.00000E-03
+   neutron = {cross_section:.5E}
+   proton  = 0.00000E+00
+   deuteron= 0.00000E+00
+"""
+
+SPECTRUM_HEADER = """# a + {mass_number}{element} : neutron spectrum
+# E-incident = {alpha_energy:8.3f}
+#
+# # energies = {n_points}
+#  E-out     Total       Direct    Pre-equil.  Mult. emis. Compound
+"""
+
+
+def threshold(mass_number):
+    return 0.5 + (mass_number % 7) * 0.4
+
+
+def q_value(mass_number):
+    return 2.0 - (mass_number % 5) * 0.8
+
+
+# (alpha,n) cross section in mb
+def cross_section(element, mass_number, alpha_energy):
+    excess = alpha_energy - threshold(mass_number)
+
+    if excess <= 0:
+        return 0.0
+
+    plateau = 20.0 + 5.0 * (len(element) + mass_number % 11)
+
+    return plateau * (1 - math.exp(-excess)) * (1 + 0.1 * math.sin(7 * alpha_energy))
+
+
+# Returns [(neutron energy in MeV, differential cross section in mb/MeV)]
+def spectrum(element, mass_number, alpha_energy):
+    total = cross_section(element, mass_number, alpha_energy)
+
+    if total == 0:
+        return []
+
+    max_energy = max(alpha_energy + q_value(mass_number), 0.5)
+    temperature = 0.3 + 0.15 * alpha_energy
+    n_points = 40 + int(100 * alpha_energy) % 30
+
+    points = []
+    for index in range(1, n_points + 1):
+        energy = max_energy * index / n_points
+        points.append(
+            (energy, total * energy / temperature**2 * math.exp(-energy / temperature))
+        )
+
+    return points
+
+
+def output_text(element, mass_number, alpha_energy):
+    return OUTPUT_TEMPLATE.format(
+        cross_section=cross_section(element, mass_number, alpha_energy)
+    )
+
+
+def spectrum_text(element, mass_number, alpha_energy):
+    points = spectrum(element, mass_number, alpha_energy)
+
+    if not points:
+        return "EMPTY"
+
+    lines = [
+        SPECTRUM_HEADER.format(
+            element=element,
+            mass_number=mass_number,
+            alpha_energy=alpha_energy,
+            n_points=len(points),
+        )
+    ]
+    for energy, value in points:
+        lines.append(
+            f" {energy:8.3f}  {value:.5E}  0.00000E+00  0.00000E+00  0.00000E+00  {value:.5E}\n"
+        )
+
+    return "".join(lines)
+
+
+# Alpha energies (in MeV) from step up to max_energy, as written in TALYS
+# file names
+def energy_grid(max_energy=10.0, step=0.01):
+    return [
+        int(100 * index * step + 0.5) / 100.0
+        for index in range(1, int(round(max_energy / step)) + 1)
+    ]
+
+
+# Writes one TALYS output and one spectra file per (isotope, alpha energy).
+# Every gap_every-th energy of each isotope is skipped, to leave holes like
+# the ones found in real downloads. Returns the number of files written.
+def generate(isotopes_dir, isotopes, energies, gap_every=0):
+    n_files = 0
+
+    for element, mass_number in isotopes:
+        runner = talys.Runner(element, mass_number, isotopes_dir)
+
+        for index, alpha_energy in enumerate(energies, start=1):
+            if gap_every and index % gap_every == 0:
+                continue
+
+            with open(runner.output_file(alpha_energy), "w") as file:
+                file.write(output_text(element, mass_number, alpha_energy))
+
+            with open(runner.spectra_file(alpha_energy), "w") as file:
+                file.write(spectrum_text(element, mass_number, alpha_energy))
+
+            n_files += 2
+
+    return n_files
+
+
+def main():
+    parser = ArgumentParser(
+        prog="synthetic",
+        description="Writes synthetic TALYS outputs and neutron spectra for benchmarking NeuCBOT.",
+    )
+
+    parser.add_argument("isotopes_dir", help="Directory to write isotope data to")
+    parser.add_argument(
+        "-e",
+        "--elements",
+        nargs="+",
+        default=["C", "H", "O"],
+        help="Elements to generate data for, with all their natural isotopes",
+    )
+    parser.add_argument(
+        "--max-energy",
+        type=float,
+        default=10.0,
+        help="Highest alpha energy (in MeV)",
+    )
+    parser.add_argument(
+        "--step", type=float, default=0.01, help="Alpha energy step (in MeV)"
+    )
+    parser.add_argument(
+        "--gap-every",
+        type=int,
+        default=0,
+        help="Leave out every Nth alpha energy of each isotope",
+    )
+
+    args = parser.parse_args()
+
+    isotopes = [
+        (symbol, int(mass_number))
+        for symbol in args.elements
+        for mass_number in elements.Element(symbol).isotopes()
+    ]
+
+    n_files = generate(
+        args.isotopes_dir,
+        isotopes,
+        energy_grid(args.max_energy, args.step),
+        args.gap_every,
+    )
+    print(f"Wrote {n_files} files to {args.isotopes_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+from argparse import ArgumentParser
+
+from neucbot import decay_db
+
+
+def main():
+    parser = ArgumentParser(
+        prog="importDecays",
+        description="Imports the ground state alpha decays in bulk ENSDF files into a local decay database, so that alpha lists can be resolved without network access.",
+    )
+
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="ENSDF files to import, plain or gzipped",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=decay_db.DECAY_DB_PATH,
+        help="Database file to write (default: %(default)s)",
+    )
+
+    args = parser.parse_args()
+
+    n_nuclides = decay_db.import_files(args.files, args.output)
+    print(f"Imported alpha decays of {n_nuclides} nuclides into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
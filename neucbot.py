@@ -2,9 +2,15 @@
 from argparse import ArgumentParser
 
 from neucbot.alpha import AlphaList, ChainAlphaList
+from neucbot import cache
+from neucbot import chain
 from neucbot import config
+from neucbot import download
+from neucbot import ensemble
 from neucbot import material
-from neucbot.runner import NeucbotRunner
+from neucbot import profiling
+from neucbot import sweep
+from neucbot.runner import ENGINES, create_runner
 
 
 def main():
@@ -36,6 +42,11 @@ def main():
         choices=["v1", "v2"],
         help="Download isotopic data for isotopes missing from database (options: %(choices)s)",
     )
+    parser.add_argument(
+        "--download-source",
+        default=download.DEFAULT_SOURCE,
+        help="URL, file:// URL or local directory to download isotopic data from (default: %(default)s)",
+    )
     parser.add_argument("-o", "--output", help="Output file name")
     parser.add_argument("--print-alphas", action="store_true", help="Print alpha list")
     parser.add_argument(
@@ -48,32 +59,147 @@ def main():
         action="store_true",
         help="Force recalculation of TALYS outputs",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to run TALYS for missing reactions, and by --engine parallel",
+    )
+    parser.add_argument(
+        "--compile-data",
+        choices=["float64", "float32"],
+        help="Compile isotopic data into one memory-mapped store per isotope before running (options: %(choices)s)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        help="Memory budget for parsed isotopic data kept in memory (in MB)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Periodically save partial results to this file, for resuming with --resume",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=100,
+        help="Number of alpha steps between checkpoints (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the file given to --checkpoint, if it exists",
+    )
+    parser.add_argument(
+        "--stream",
+        help="Write each alpha step's contributions to this file as JSON lines",
+    )
+    parser.add_argument(
+        "--cache-results",
+        action="store_true",
+        help="Reuse results of earlier runs with the same inputs and data, stored in ./Data/Results",
+    )
+    parser.add_argument(
+        "--adaptive-tolerance",
+        type=float,
+        help="Merge alpha steps where the integrand is flat, keeping the estimated relative error of the total yield below this tolerance",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["energy", "isotope"],
+        default="energy",
+        help="With --engine parallel, split the work between jobs by contiguous alpha energy ranges or by isotope (options: %(choices)s)",
+    )
+    parser.add_argument(
+        "--ensemble",
+        help="JSON file describing an uncertainty ensemble; evaluates all its realizations in one pass and prints the mean, spread and percentiles of the yields and spectrum",
+    )
+    parser.add_argument(
+        "--sweep",
+        help="File of composition sweep points, one line of fractions per point with one fraction per line of the material file; evaluates every point reading the isotope data once and prints the yields of each",
+    )
+    parser.add_argument(
+        "--activity-ratios",
+        help="With -c, file of member activity ratios to secular equilibrium, member names on the first line and one line of ratios per point; computes each member's yield once and prints the yields of every point",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write a JSON report of the time spent in each phase and hot function, data files read and cache hit rates to this file",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=list(ENGINES),
+        default="loop",
+        help="Yield computation engine (options: %(choices)s)",
+    )
 
     args = parser.parse_args()
 
-    cfg = config.Config(vars(args))
-    cfg.validate()
-    runner = NeucbotRunner(cfg)
+    if not args.profile:
+        return run(args)
 
+    profiler = profiling.Profiler()
+    profiler.start()
+
+    # The report is also written for runs that fail part way
+    try:
+        run(args)
+    finally:
+        profiler.stop()
+        profiler.write(args.profile)
+
+
+def run(args):
     if args.alpha_list:
         alpha_list = AlphaList.from_filepath(args.alpha_list)
     elif args.chain_list:
         alpha_list = ChainAlphaList.from_filepath(args.chain_list)
 
-    alpha_list.load_or_fetch()
-
-    material_composition = material.Composition.from_file(args.material)
+    with profiling.phase("load_alpha_list"):
+        alpha_list.load_or_fetch()
 
     if args.print_alphas or args.print_alphas_only:
         print("Alpha List: ")
         print(alpha_list.max_alpha())
-        for [alpha, intensity] in alpha_list.condense(step_size):
+        for [alpha, intensity] in alpha_list.condense(args.step_size):
             print(alpha, "&", intensity, "\\\\")
 
+        if args.print_alphas_only:
+            return
+
+    cfg = config.Config(vars(args))
+    cfg.validate()
+
+    if args.cache_size is not None:
+        cache.ISOTOPE_DATA.resize(int(args.cache_size * 1024 * 1024))
+
+    runner = create_runner(cfg)
+
+    with profiling.phase("load_composition"):
+        material_composition = material.Composition.from_file(args.material)
+
     if args.download:
-        material_composition.download_data(args.download)
+        with profiling.phase("download_data"):
+            material_composition.download_data(args.download, args.download_source)
+
+    if args.compile_data:
+        with profiling.phase("compile_data"):
+            material_composition.compile_data(args.compile_data)
 
-    runner.run(alpha_list, material_composition, args.step_size)
+    if args.ensemble:
+        spec = ensemble.EnsembleSpec.from_file(args.ensemble)
+        runner.run_ensemble(alpha_list, material_composition, spec, args.step_size)
+    elif args.activity_ratios:
+        ratio_points = chain.read_ratios(args.activity_ratios)
+        runner.run_chain(alpha_list, material_composition, ratio_points, args.step_size)
+    elif args.sweep:
+        fraction_vectors = sweep.read_fractions(args.sweep)
+        runner.run_sweep(
+            alpha_list, material_composition, fraction_vectors, args.step_size
+        )
+    else:
+        runner.run(alpha_list, material_composition, args.step_size)
 
 
 if __name__ == "__main__":
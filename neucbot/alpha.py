@@ -3,7 +3,7 @@ import re
 import numpy
 from operator import itemgetter
 
-from neucbot import ensdf, utils
+from neucbot import decay_db, ensdf, utils
 
 ALPHA_LIST_DIR = "./AlphaLists"
 CHAIN_LIST_DIR = "./Chains"
@@ -40,7 +40,8 @@ class AlphaList:
         alphas = request_json["alphas"]
 
         alpha_list.set_alphas(
-            [[alpha, intensity] for alpha, intensity in alphas.items()]
+            # JSON object keys are always strings, so convert energies back
+            [[float(alpha), float(intensity)] for alpha, intensity in alphas.items()]
         )
 
         return alpha_list
@@ -53,6 +54,8 @@ class AlphaList:
 
     def load_or_fetch(self):
         while not os.path.isfile(self.file_path):
+            if self.load_from_database():
+                return self.alphas
             if self.fetch_attempts < 0:
                 raise RuntimeError(f"Unable to write alpha file to {self.file_path}")
             self.write()
@@ -60,6 +63,18 @@ class AlphaList:
 
         return self.load()
 
+    # Alpha lists without a file are looked up in the local decay database
+    # before they are fetched from NNDC
+    def load_from_database(self):
+        with decay_db.DecayDatabase() as database:
+            alphas = database.alphas(self.element, self.isotope)
+
+        if alphas is None:
+            return False
+
+        self.alphas = alphas
+        return True
+
     def load(self):
         file = open(self.file_path)
 
@@ -110,10 +125,22 @@ class AlphaList:
     #      of alpha_energy until the former expression is less than the next
     #      alpha_energy in the sorted list.
     def condense(self, alpha_step_size):
-        sorted_alphas = sorted(self.alphas, key=itemgetter(0), reverse=True)
+        sorted_alphas, energies, alpha_indices = self.condensed_steps(alpha_step_size)
 
         cumulative_intensities = numpy.cumsum([alpha[1] for alpha in sorted_alphas])
 
+        return [
+            [energy, cumulative_intensities[alpha_index]]
+            for energy, alpha_index in zip(energies, alpha_indices)
+        ]
+
+    # Returns the alphas sorted by decreasing energy, the energies of the
+    # condensed steps, and for each step the index of the last sorted alpha
+    # whose intensity counts towards it. Each step's intensity is the sum of
+    # the intensities of the sorted alphas up to that index.
+    def condensed_steps(self, alpha_step_size):
+        sorted_alphas = sorted(self.alphas, key=itemgetter(0), reverse=True)
+
         # Starting from (0 + step size) to (max sorted_alpha) in increments of alpha_step_size
         max_alpha = utils.round_half_up(sorted_alphas[0][0])
         alpha_steps = numpy.arange(max_alpha, 0, -alpha_step_size)
@@ -123,7 +150,8 @@ class AlphaList:
 
         # This will create a duplicate entry for [max_alpha, max_alpha_intensity]
         # in the condensed alpha list. This is here intentionally.
-        condensed_alphas = [[max_alpha, cumulative_intensities[alpha_index]]]
+        energies = [max_alpha]
+        alpha_indices = [alpha_index]
 
         for step in alpha_steps:
             # If the alpha step is LESS THAN the next alpha energy (rounded to 2
@@ -133,10 +161,10 @@ class AlphaList:
             ):
                 alpha_index += 1
 
-            intensity = cumulative_intensities[alpha_index]
-            condensed_alphas.append([step, intensity])
+            energies.append(step)
+            alpha_indices.append(alpha_index)
 
-        return condensed_alphas
+        return sorted_alphas, energies, alpha_indices
 
     def max_alpha(self):
         return max(self.alphas)
@@ -175,18 +203,77 @@ class ChainAlphaList(AlphaList):
         # load_or_fetch() alpha list for each symbol/mass_number pair
         # Scale intensity down by branching_ratio / 100
         file = open(self.file_path)
+        members = []
 
         for line in file.readlines():
             if match := self.CHAIN_LIST_LINE_PATTERN.match(line):
                 branch_fraction = float(match.group("branch_frac")) / 100.0
 
                 alpha_list = AlphaList(match.group("element"), match.group("isotope"))
-                alpha_list.load_or_fetch()
-                alpha_list.scale_by(branch_fraction)
-
-                self._alpha_lists.append(alpha_list)
-                self.alphas += alpha_list.alphas
+                members.append((alpha_list, branch_fraction))
 
         file.close()
 
+        self.prefetch([alpha_list for alpha_list, _ in members])
+
+        for alpha_list, branch_fraction in members:
+            alpha_list.load_or_fetch()
+            alpha_list.scale_by(branch_fraction)
+
+            self._alpha_lists.append(alpha_list)
+            self.alphas += alpha_list.alphas
+
         return self.alphas
+
+    def member_names(self):
+        return [
+            f"{alpha_list.element}{alpha_list.isotope}"
+            for alpha_list in self._alpha_lists
+        ]
+
+    # Condenses the chain as condense does, but keeps apart the intensity each
+    # member contributes to every step. Returns the condensed alphas and, for
+    # each member, its intensities at every step, which add up to those of
+    # the condensed alphas.
+    def condense_members(self, alpha_step_size):
+        sorted_alphas, _, alpha_indices = self.condensed_steps(alpha_step_size)
+
+        # Member of every alpha, in the (stable) order condensed_steps sorts
+        # them in
+        members = [
+            name
+            for name, alpha_list in zip(self.member_names(), self._alpha_lists)
+            for _ in alpha_list.alphas
+        ]
+        order = sorted(
+            range(len(self.alphas)),
+            key=lambda index: self.alphas[index][0],
+            reverse=True,
+        )
+        sorted_members = [members[index] for index in order]
+
+        member_intensities = {}
+        for name in dict.fromkeys(self.member_names()):
+            cumulative_intensities = numpy.cumsum(
+                [
+                    alpha[1] if member == name else 0.0
+                    for alpha, member in zip(sorted_alphas, sorted_members)
+                ]
+            )
+            member_intensities[name] = cumulative_intensities[alpha_indices]
+
+        return self.condense(alpha_step_size), member_intensities
+
+    # Fetches the decay files of all members without an alpha list file or
+    # database entry at once, so that writing their alpha lists only reads files from disk
+    def prefetch(self, alpha_lists, concurrency=ensdf.DEFAULT_CONCURRENCY):
+        with decay_db.DecayDatabase() as database:
+            missing = [
+                (alpha_list.element, alpha_list.isotope)
+                for alpha_list in alpha_lists
+                if not os.path.isfile(alpha_list.file_path)
+                and database.alphas(alpha_list.element, alpha_list.isotope) is None
+            ]
+
+        if missing:
+            ensdf.fetch_all(missing, concurrency=concurrency)
@@ -0,0 +1,106 @@
+"""
+Batch mode evaluates many (material, alpha source) pairs in one process.
+
+Jobs are read from a manifest file with four whitespace-separated columns:
+
+  # material              alpha list or chain        step size   output
+  Materials/Acrylic.dat   Chains/Th232Chain.dat      0.01        acrylic-th232.txt
+  Materials/Acrylic.dat   AlphaLists/Bi212Alphas.dat 0.01        acrylic-bi212.txt
+
+Lines starting with "#" are skipped. Each material composition, alpha list
+and stopping power table is loaded once no matter how many jobs use it, and
+isotope data is shared between jobs through cache.ISOTOPE_DATA.
+"""
+
+from neucbot import config
+from neucbot import download
+from neucbot import material
+from neucbot import runner
+from neucbot.alpha import AlphaList, ChainAlphaList
+
+
+class Job:
+    def __init__(self, material_path, alpha_path, step_size, output):
+        self.material_path = material_path
+        self.alpha_path = alpha_path
+        self.step_size = float(step_size)
+        self.output = output
+
+
+class Manifest:
+    @classmethod
+    def from_file(cls, file_path):
+        file = open(file_path)
+        jobs = []
+
+        for line_number, line in enumerate(file.readlines(), start=1):
+            tokens = line.split()
+
+            if len(tokens) == 0 or line.startswith("#"):
+                continue
+            elif len(tokens) != 4:
+                raise RuntimeError(
+                    f"Invalid batch manifest line {line_number} in {file_path}"
+                )
+
+            jobs.append(Job(*tokens))
+
+        file.close()
+
+        return jobs
+
+
+class BatchRunner:
+    # Expects args in the same format as config.Config, without an output
+    def __init__(self, args):
+        self.args = args
+        self.compositions = {}
+        self.alpha_lists = {}
+
+    def composition(self, file_path):
+        if file_path not in self.compositions:
+            composition = material.Composition.from_file(file_path)
+
+            if self.args.get("download"):
+                composition.download_data(
+                    self.args.get("download"),
+                    self.args.get("download_source") or download.DEFAULT_SOURCE,
+                )
+
+            self.compositions[file_path] = composition
+
+        return self.compositions[file_path]
+
+    def alpha_list(self, file_path):
+        if file_path not in self.alpha_lists:
+            if ChainAlphaList.CHAIN_LIST_FILE_PATTERN.match(file_path):
+                alpha_list = ChainAlphaList.from_filepath(file_path)
+            else:
+                alpha_list = AlphaList.from_filepath(file_path)
+
+            alpha_list.load_or_fetch()
+            self.alpha_lists[file_path] = alpha_list
+
+        return self.alpha_lists[file_path]
+
+    def run(self, jobs):
+        results = []
+
+        for index, job in enumerate(jobs, start=1):
+            print(f"Job {index}/{len(jobs)}: {job.material_path} with {job.alpha_path}")
+
+            cfg = config.Config({**self.args, "output": job.output})
+            cfg.validate()
+
+            try:
+                results.append(
+                    runner.create_runner(cfg).run(
+                        self.alpha_list(job.alpha_path),
+                        self.composition(job.material_path),
+                        job.step_size,
+                    )
+                )
+            finally:
+                cfg.close()
+
+        return results
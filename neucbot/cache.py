@@ -0,0 +1,120 @@
+import sys
+import threading
+
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# Rough estimate of the memory held by a cached value. Objects that know
+# their own size (e.g. utils.Histogram) expose an nbytes() method, while
+# numpy arrays and scalars have an nbytes attribute.
+def sizeof(value):
+    if callable(nbytes := getattr(value, "nbytes", None)):
+        return nbytes()
+    elif isinstance(nbytes, int):
+        return nbytes
+    elif isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items()
+        )
+    elif isinstance(value, list):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    else:
+        return sys.getsizeof(value)
+
+
+class LRUCache:
+    # Least-recently-used cache bounded by the estimated size of its values
+    # and, for values whose size can't be estimated (e.g. objects holding
+    # references to shared data), optionally by the number of entries
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+                return self.entries[key][0]
+            else:
+                self.misses += 1
+
+                return default
+
+    def put(self, key, value):
+        size = sizeof(value)
+
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+
+            # Values larger than the whole budget are never cached
+            if size > self.max_bytes:
+                return
+
+            self.entries[key] = (value, size)
+            self.bytes += size
+            self.evict()
+
+    def invalidate(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+
+    def resize(self, max_bytes):
+        with self.lock:
+            self.max_bytes = max_bytes
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def evict(self):
+        while self.entries and (
+            self.bytes > self.max_bytes
+            or (self.max_entries is not None and len(self.entries) > self.max_entries)
+        ):
+            self.bytes -= self.entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+        }
+
+
+# Parsed TALYS cross sections and neutron spectra, shared by every Isotope in
+# the process. Keys are (kind, absolute isotope data path, alpha energy),
+# where alpha energy is truncated to 0.01 MeV as in talys.Runner file names.
+# Entries of energies TALYS is run for are invalidated by
+# Isotope.reset_talys_data.
+ISOTOPE_DATA = LRUCache()
@@ -0,0 +1,205 @@
+"""
+Decay chain yields kept apart per chain member.
+
+Yields are linear in alpha intensity, so the yield of a decay chain is the
+sum of the yields of its members' alphas. Keeping each member's yield apart
+lets any member activities be applied afterwards, e.g. to study broken
+secular equilibrium, without reading the isotope data again.
+
+Activities are given as ratios to the activity of secular equilibrium (in
+which each member decays at its branch fraction of the chain's rate), so a
+ratio of 1 reproduces the chain file. An activity ratio file names the
+members in its first line, followed by one line of ratios per point.
+Members not named keep a ratio of 1. Lines starting with a # are skipped.
+For a radium excess in the lower U238 chain:
+
+  # Ra226 in excess of Rn222 and its progeny
+  Ra226
+  1
+  2
+  5
+
+All members share the condensed alpha steps of the whole chain, so a point
+matches a run of the chain file with its branch fractions scaled by the
+ratios to rounding, as long as the member with the highest alpha energy
+keeps a nonzero ratio.
+"""
+
+import copy
+import numpy
+
+from neucbot import alpha
+from neucbot import engine
+from neucbot import utils
+
+
+# Returns a dict of member name to activity ratio for every point of an
+# activity ratio file
+def read_ratios(file_path):
+    names = None
+    ratio_points = []
+
+    with open(file_path) as file:
+        for line in file.readlines():
+            if line.startswith("#") or not line.split():
+                continue
+
+            if names is None:
+                names = line.split()
+                continue
+
+            ratios = [float(ratio) for ratio in line.split()]
+            if len(ratios) != len(names):
+                raise RuntimeError(
+                    f"Activity ratio points need {len(names)} ratios, got {len(ratios)}"
+                )
+
+            ratio_points.append(dict(zip(names, ratios)))
+
+    return ratio_points
+
+
+def check_ratios(ratios, members):
+    for name, ratio in ratios.items():
+        if name not in members:
+            raise RuntimeError(f"{name} is not a member of the decay chain")
+
+        if ratio < 0:
+            raise RuntimeError("Activity ratios must not be negative")
+
+
+class MemberYields:
+    # member_results maps each member's name to the result dict of its alphas
+    # alone, as computed by the runners
+    def __init__(self, member_results):
+        self.member_results = member_results
+
+    @classmethod
+    def build(
+        cls,
+        chain_alpha_list,
+        material_composition,
+        step_size,
+        run_talys=False,
+        force_recalculation=False,
+        progress=True,
+    ):
+        if not isinstance(chain_alpha_list, alpha.ChainAlphaList):
+            raise RuntimeError("Activity ratios need a decay chain")
+
+        condensed_alphas, member_intensities = chain_alpha_list.condense_members(
+            step_size
+        )
+        tensors = engine.YieldTensors.build(
+            condensed_alphas,
+            material_composition,
+            step_size,
+            run_talys,
+            force_recalculation,
+            progress,
+        )
+
+        # Only the intensities differ between members
+        member_results = {}
+        for name, intensities in member_intensities.items():
+            member_tensors = copy.copy(tensors)
+            member_tensors.intensities = numpy.asarray(intensities, dtype=float)
+            member_results[name] = member_tensors.contract()
+
+        return cls(member_results)
+
+    # The result dict of the chain with each member's activity scaled by its
+    # ratio in ratios (1 if not given)
+    def combine(self, ratios=None):
+        ratios = ratios or {}
+        check_ratios(ratios, self.member_results)
+
+        results = {
+            "total_cross_section": 0.0,
+            "cross_sections": {},
+            "spectra_totals": {},
+            "ratios": {},
+        }
+
+        for name, member in self.member_results.items():
+            ratio = float(ratios.get(name, 1.0))
+            results["ratios"][name] = ratio
+
+            results["total_cross_section"] += ratio * member["total_cross_section"]
+
+            for isotope, xsect in member["cross_sections"].items():
+                results["cross_sections"][isotope] = (
+                    results["cross_sections"].get(isotope, 0) + ratio * xsect
+                )
+
+            for e, value in member["spectra_totals"].items():
+                results["spectra_totals"][e] = (
+                    results["spectra_totals"].get(e, 0) + ratio * value
+                )
+
+        return results
+
+
+# Computes the yields of each member of a decay chain, then applies every
+# point of activity ratios to them. Returns the MemberYields and one result
+# dict per point, with the ratios of the point added.
+def run(
+    chain_alpha_list,
+    material_composition,
+    ratio_points,
+    step_size,
+    run_talys=False,
+    force_recalculation=False,
+    progress=True,
+):
+    # Checked before any isotope data is read
+    if isinstance(chain_alpha_list, alpha.ChainAlphaList):
+        for ratios in ratio_points:
+            check_ratios(ratios, chain_alpha_list.member_names())
+
+    member_yields = MemberYields.build(
+        chain_alpha_list,
+        material_composition,
+        step_size,
+        run_talys,
+        force_recalculation,
+        progress,
+    )
+
+    return member_yields, [member_yields.combine(ratios) for ratios in ratio_points]
+
+
+# Prints the yields of each member at secular equilibrium, then one line per
+# point of activity ratios: the ratios, total neutron yield and the yield of
+# each isotope
+def print_tables(member_yields, results, output_file):
+    members = list(member_yields.member_results)
+    names = list(member_yields.combine()["cross_sections"])
+
+    def yield_columns(point):
+        return " ".join(
+            [utils.format_float(point["total_cross_section"])]
+            + [utils.format_float(point["cross_sections"][name]) for name in names]
+        )
+
+    print("", file=output_file)
+    print("# Decay chain members at secular equilibrium", file=output_file)
+    print(f"# member total {' '.join(names)} (n/decay)", file=output_file)
+
+    for member in members:
+        print(
+            member,
+            yield_columns(member_yields.member_results[member]),
+            file=output_file,
+        )
+
+    print("", file=output_file)
+    print(f"# Activity ratio sweep of {len(results)} points", file=output_file)
+    print(f"# {' '.join(members)} total {' '.join(names)} (n/decay)", file=output_file)
+
+    for point in results:
+        print(
+            " ".join(f"{point['ratios'][member]:g}" for member in members),
+            yield_columns(point),
+            file=output_file,
+        )
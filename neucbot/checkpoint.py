@@ -0,0 +1,130 @@
+"""
+Checkpoints and streamed output for long runs.
+
+A checkpoint is a JSON file holding the sums accumulated by
+NeucbotRunner.compute after a number of completed alpha steps:
+
+  {
+    "input_key": "<sha256 of the condensed alphas, isotopes and step size>",
+    "steps": 1200,
+    "completed_steps": 800,
+    "total_cross_section": ...,
+    "cross_sections": {"C13": ..., ...},
+    "spectra_totals": {"1000": ..., ...}
+  }
+
+It is rewritten atomically, so a run killed at any point leaves either the
+previous or the new checkpoint behind. Floats are written with repr, so a
+resumed run adds up to exactly the same results as an uninterrupted one.
+
+A stream is a JSON lines file with one line per completed alpha step, holding
+that step's contributions to the cross sections and neutron spectrum.
+"""
+
+import hashlib
+import json
+import os
+
+
+# Identifies the inputs of a run, so that a checkpoint is never resumed with
+# a different alpha list, material composition or step size
+def input_key(condensed_alphas, material_composition, step_size):
+    inputs = {
+        "alphas": [
+            [float(energy), float(intensity)] for energy, intensity in condensed_alphas
+        ],
+        "isotopes": [
+            [material.name(), material.material_term()]
+            for material in material_composition.materials
+        ],
+        "step_size": step_size,
+    }
+
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+class Checkpoint:
+    def __init__(self, file_path, input_key, steps):
+        self.file_path = file_path
+        self.input_key = input_key
+        self.steps = steps
+
+    # Returns the saved state as (completed_steps, total_cross_section,
+    # cross_sections, spectra_totals), or None if there is no checkpoint yet
+    def load(self):
+        if not os.path.exists(self.file_path):
+            return None
+
+        with open(self.file_path) as file:
+            state = json.load(file)
+
+        if state.get("input_key") != self.input_key:
+            raise RuntimeError(
+                f"Checkpoint {self.file_path} was written for a different alpha list, material or step size"
+            )
+
+        return (
+            state["completed_steps"],
+            state["total_cross_section"],
+            state["cross_sections"],
+            {int(e): value for e, value in state["spectra_totals"].items()},
+        )
+
+    def save(self, completed_steps, total_cross_section, cross_sections, spec_totals):
+        state = {
+            "input_key": self.input_key,
+            "steps": self.steps,
+            "completed_steps": completed_steps,
+            "total_cross_section": total_cross_section,
+            "cross_sections": cross_sections,
+            "spectra_totals": spec_totals,
+        }
+
+        tmp_file_path = f"{self.file_path}.tmp"
+
+        with open(tmp_file_path, "w") as file:
+            json.dump(state, file)
+
+        os.replace(tmp_file_path, self.file_path)
+
+
+class Stream:
+    # When resuming from a checkpoint after completed_steps steps, keeps the
+    # lines already written for those steps and drops any written after the
+    # checkpoint was saved, so that the stream holds every step exactly once.
+    # The kept lines are written to a new file that replaces the stream, so a
+    # run killed while resuming never loses them.
+    def __init__(self, file_path, completed_steps=0):
+        lines = []
+
+        if completed_steps and os.path.exists(file_path):
+            with open(file_path) as file:
+                lines = [
+                    line
+                    for line in file.readlines()
+                    if line.endswith("\n")
+                    and json.loads(line)["step"] < completed_steps
+                ]
+
+        tmp_file_path = f"{file_path}.tmp"
+
+        with open(tmp_file_path, "w") as file:
+            file.writelines(lines)
+
+        os.replace(tmp_file_path, file_path)
+        self.file = open(file_path, "a")
+
+    def write(self, step, energy, intensity, cross_sections, spectrum):
+        line = {
+            "step": step,
+            "alpha_energy": float(energy),
+            "intensity": float(intensity),
+            "cross_sections": cross_sections,
+            "spectrum": spectrum,
+        }
+
+        self.file.write(json.dumps(line) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
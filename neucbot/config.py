@@ -1,17 +1,87 @@
 import sys
 import shutil
 
+DEFAULT_CHECKPOINT_INTERVAL = 100  # alpha steps
+
 
 class Config:
     def __init__(self, args):
         self.talys = args.get("talys")
         self.download = args.get("download")
         self.force_recalculation = args.get("force_recalculation")
+        self.engine = args.get("engine") or "loop"
+        self.jobs = int(args.get("jobs") or 1)
+        self.quiet = bool(args.get("quiet"))
+        self.checkpoint = args.get("checkpoint")
+        self.checkpoint_interval = int(
+            args.get("checkpoint_interval") or DEFAULT_CHECKPOINT_INTERVAL
+        )
+        self.resume = bool(args.get("resume"))
+        self.stream = args.get("stream")
+        self.cache_results = bool(args.get("cache_results"))
+        self.adaptive_tolerance = args.get("adaptive_tolerance")
+        self.shard_by = args.get("shard_by") or "energy"
+        self.ensemble = args.get("ensemble")
+        self.sweep = args.get("sweep")
+        self.activity_ratios = args.get("activity_ratios")
+        self.chain_list = args.get("chain_list")
         self.output = (
             open(args.get("output"), "w") if args.get("output") else sys.stdout
         )
 
     def validate(self):
+        if self.resume and not self.checkpoint:
+            raise RuntimeError("Resuming requires a checkpoint file")
+
+        if self.checkpoint_interval < 1:
+            raise RuntimeError("Checkpoint interval must be at least one alpha step")
+
+        if self.jobs < 1:
+            raise RuntimeError("Number of jobs must be at least one")
+
+        if self.shard_by not in ("energy", "isotope"):
+            raise RuntimeError(f"Unknown shard kind {self.shard_by}")
+
+        if self.adaptive_tolerance is not None:
+            if self.adaptive_tolerance < 0:
+                raise RuntimeError("Adaptive stepping tolerance must not be negative")
+
+            # Steps are chosen from the TALYS data already on disk
+            if self.talys:
+                raise RuntimeError(
+                    "Adaptive stepping cannot be combined with running TALYS"
+                )
+
+        # Ensembles are evaluated on the uniform grid of the alpha list
+        if self.ensemble and self.adaptive_tolerance is not None:
+            raise RuntimeError("Ensembles cannot be combined with adaptive stepping")
+
+        if self.sweep and self.adaptive_tolerance is not None:
+            raise RuntimeError("Sweeps cannot be combined with adaptive stepping")
+
+        if self.sweep and self.ensemble:
+            raise RuntimeError("Sweeps cannot be combined with ensembles")
+
+        if self.activity_ratios and (
+            self.adaptive_tolerance is not None or self.ensemble or self.sweep
+        ):
+            raise RuntimeError(
+                "Activity ratios cannot be combined with adaptive stepping, ensembles or sweeps"
+            )
+
+        # Activity ratios weight the members of a decay chain
+        if self.activity_ratios and not self.chain_list:
+            raise RuntimeError("Activity ratios require a decay chain file")
+
+        # Only the single run over the alpha list saves checkpoints and streams
+        # its steps
+        if (self.checkpoint or self.stream) and (
+            self.activity_ratios or self.ensemble or self.sweep
+        ):
+            raise RuntimeError(
+                "Checkpoints and streams cannot be combined with activity ratios, ensembles or sweeps"
+            )
+
         # Return True if TALYS is not being run
         if not self.talys:
             return
@@ -23,3 +93,7 @@ class Config:
             raise RuntimeError(
                 "Attempting to run TALYS when talys command is not available"
             )
+
+    def close(self):
+        if self.output is not sys.stdout:
+            self.output.close()
@@ -0,0 +1,408 @@
+"""
+Compiled per-isotope data store.
+
+All TALYS (alpha,n) cross sections and neutron spectra for one isotope are
+packed into a single flat .npy array (Data/Isotopes/<El>/<Iso>/compiled.npy)
+so that a run can memory-map one file per isotope instead of opening and
+parsing one TalysOut and one NSpectra file per alpha step. The layout is:
+
+  [FORMAT_VERSION, n_energies, n_points, 0]     header
+  energies        (n_energies)                  alpha energies in units of 0.01 MeV
+  flags           (n_energies)                  HAS_OUTPUT | HAS_SPECTRUM
+  cross_sections  (n_energies)                  (alpha,n) cross section in cm^2
+  offsets         (n_energies + 1)              start of each spectrum in the arrays below
+  spec_energies   (n_points)                    neutron energies in keV
+  spec_values     (n_points)                    differential cross sections in cm^2/keV
+
+Values are stored after unit conversion, so a float64 store returns exactly
+what parsing the text files would.
+
+The SRIM stopping power tables of every element in Data/StoppingPowers are
+packed the same way into a single bundle (Data/stopping_powers.npy):
+
+  [FORMAT_VERSION, n_elements, n_points, 0]     header
+  codes           (n_elements)                  element symbols, see element_code
+  offsets         (n_elements + 1)              start of each table in the arrays below
+  energies        (n_points)                    alpha energies in MeV
+  values          (n_points)                    electronic + nuclear stopping power
+"""
+
+import hashlib
+import os
+import re
+import numpy
+
+from neucbot import utils
+
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+HAS_OUTPUT = 1
+HAS_SPECTRUM = 2
+
+OUTPUT_FILE_PATTERN = re.compile(r"^outputE(?P<energy>\d+\.\d+)$")
+SPECTRA_FILE_PATTERN = re.compile(r"^nspec(?P<energy>\d+\.\d+)\.tot$")
+
+# Stores opened in this process, keyed by (store class, path), with the
+# modification time of the file they were mapped from
+OPEN_STORES = {}
+
+
+# Alpha energies are stored at 0.01 MeV resolution. Lookups expect energies
+# already truncated to that resolution, as done in Isotope.differential_n_spec
+# and Isotope.cross_section
+def energy_key(alpha_energy):
+    return int(round(100 * alpha_energy))
+
+
+def list_energy_files(directory, pattern):
+    energy_files = {}
+
+    for file_name in os.listdir(directory):
+        if match := pattern.match(file_name):
+            energy_files[energy_key(float(match.group("energy")))] = file_name
+
+    return energy_files
+
+
+# Digest of the names, sizes and modification times of the files in each
+# directory, which changes whenever any of them is added, removed or rewritten
+def fingerprint(directories):
+    digest = hashlib.sha256()
+
+    for directory in directories:
+        try:
+            entries = sorted(
+                (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in os.scandir(directory)
+                if entry.is_file()
+            )
+        except FileNotFoundError:
+            entries = []
+
+        digest.update(repr((directory, entries)).encode())
+
+    return digest.hexdigest()
+
+
+# Latest modification time of the given directories and of the files in them.
+# A directory's own time only changes when files are added, removed or
+# renamed, not when a file is rewritten in place.
+def newest_mtime(directories):
+    mtimes = []
+
+    for directory in directories:
+        mtimes.append(os.stat(directory).st_mtime_ns)
+        mtimes += [
+            entry.stat().st_mtime_ns
+            for entry in os.scandir(directory)
+            if entry.is_file()
+        ]
+
+    return max(mtimes)
+
+
+# Writes to a temporary file first so that readers never see a partially
+# written store
+def save(file_path, data):
+    tmp_file_path = f"{file_path}.tmp"
+
+    with open(tmp_file_path, "wb") as file:
+        numpy.save(file, data)
+
+    os.replace(tmp_file_path, file_path)
+
+
+# Memory-maps a store, unless it is missing, was written with another format
+# version, or is older than any of the directories it was compiled from or
+# any file in them. Opened stores are shared by every Isotope in the process,
+# and a store is unmapped once its file is recompiled or goes stale.
+def load(store_class, file_path, data_dirs):
+    key = (store_class.__name__, os.path.abspath(file_path))
+
+    try:
+        compiled_mtime = os.stat(file_path).st_mtime_ns
+        data_mtime = newest_mtime(data_dirs)
+    except FileNotFoundError:
+        OPEN_STORES.pop(key, None)
+        return None
+
+    if compiled_mtime < data_mtime:
+        OPEN_STORES.pop(key, None)
+        return None
+
+    open_mtime, store = OPEN_STORES.get(key, (None, None))
+
+    if open_mtime != compiled_mtime:
+        OPEN_STORES.pop(key, None)
+        data = numpy.load(file_path, mmap_mode="r")
+
+        if int(data[0]) != FORMAT_VERSION:
+            return None
+
+        store = store_class(data)
+        OPEN_STORES[key] = (compiled_mtime, store)
+
+    return store
+
+
+class IsotopeDataStore:
+    def __init__(self, data):
+        n_energies = int(data[1])
+        n_points = int(data[2])
+
+        start = HEADER_SIZE
+        self.energies = data[start : start + n_energies]
+        start += n_energies
+        self.flags = data[start : start + n_energies]
+        start += n_energies
+        self.cross_sections = data[start : start + n_energies]
+        start += n_energies
+        self.offsets = data[start : start + n_energies + 1]
+        start += n_energies + 1
+        self.spec_energies = data[start : start + n_points]
+        start += n_points
+        self.spec_values = data[start : start + n_points]
+
+        self.index = {int(key): i for i, key in enumerate(self.energies.tolist())}
+
+    @classmethod
+    def compile(cls, isotope, dtype=numpy.float64):
+        runner = isotope.talys_runner
+
+        output_keys = list_energy_files(runner.output_dir, OUTPUT_FILE_PATTERN)
+        spectra_keys = list_energy_files(runner.spectra_dir, SPECTRA_FILE_PATTERN)
+
+        energies = sorted(set(output_keys) | set(spectra_keys))
+        flags = []
+        cross_sections = []
+        offsets = [0]
+        spec_energies = []
+        spec_values = []
+
+        for key in energies:
+            flag = 0
+            cross_section = 0
+
+            if key in output_keys:
+                flag |= HAS_OUTPUT
+                cross_section = isotope.read_output_file(
+                    os.path.join(runner.output_dir, output_keys[key])
+                )
+
+            if key in spectra_keys:
+                flag |= HAS_SPECTRUM
+                spectrum = isotope.read_spectra_file(
+                    os.path.join(runner.spectra_dir, spectra_keys[key])
+                )
+
+                spec_energies += spectrum.bins.tolist()
+                spec_values += spectrum.values.tolist()
+
+            flags.append(flag)
+            cross_sections.append(cross_section)
+            offsets.append(len(spec_energies))
+
+        data = numpy.concatenate(
+            [
+                [FORMAT_VERSION, len(energies), len(spec_energies), 0],
+                energies,
+                flags,
+                cross_sections,
+                offsets,
+                spec_energies,
+                spec_values,
+            ]
+        ).astype(dtype)
+
+        save(runner.compiled_file(), data)
+
+        return cls(data)
+
+    # Returns None if no store has been compiled for this isotope, or if the
+    # TALYS directories have changed since it was compiled
+    @classmethod
+    def load(cls, talys_runner):
+        return load(
+            cls,
+            talys_runner.compiled_file(),
+            [talys_runner.output_dir, talys_runner.spectra_dir],
+        )
+
+    def has(self, alpha_energy, flag):
+        index = self.index.get(energy_key(alpha_energy))
+
+        return index is not None and bool(int(self.flags[index]) & flag)
+
+    # Returns None if the store has no TALYS output for this energy
+    def cross_section(self, alpha_energy):
+        if not self.has(alpha_energy, HAS_OUTPUT):
+            return None
+
+        return float(self.cross_sections[self.index[energy_key(alpha_energy)]])
+
+    # Returns None if the store has no spectrum file for this energy
+    def differential_n_spec(self, alpha_energy):
+        if not self.has(alpha_energy, HAS_SPECTRUM):
+            return None
+
+        index = self.index[energy_key(alpha_energy)]
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+
+        return utils.Histogram.from_arrays(
+            numpy.array(self.spec_energies[start:end], dtype=int),
+            numpy.array(self.spec_values[start:end], dtype=float),
+        )
+
+
+# Rebinned neutron spectra for one isotope and one binning, stored in
+# Data/Isotopes/<El>/<Iso>/rebinned_<step>_<min>_<max>.npy as:
+#
+#   [FORMAT_VERSION, n_energies, n_bins, 0]     header
+#   energies        (n_energies)                alpha energies in units of 0.01 MeV
+#   bins            (n_bins)                    rebinned neutron energies in keV
+#   values          (n_energies * n_bins)       row-major, NaN where a spectrum
+#                                               has no entry for a bin
+class RebinnedSpectraStore:
+    def __init__(self, data):
+        n_energies = int(data[1])
+        n_bins = int(data[2])
+
+        start = HEADER_SIZE
+        self.energies = data[start : start + n_energies]
+        start += n_energies
+        self.bins = numpy.array(data[start : start + n_bins], dtype=int)
+        start += n_bins
+        self.values = data[start : start + n_energies * n_bins].reshape(
+            (n_energies, n_bins)
+        )
+
+        self.index = {int(key): i for i, key in enumerate(self.energies.tolist())}
+
+    @classmethod
+    def compile(
+        cls,
+        isotope,
+        step=utils.HISTO_DELTA_BIN,
+        min_bin=utils.HISTO_MIN_BIN,
+        max_bin=utils.HISTO_MAX_BIN,
+        dtype=numpy.float64,
+    ):
+        runner = isotope.talys_runner
+        spectra_keys = list_energy_files(runner.spectra_dir, SPECTRA_FILE_PATTERN)
+
+        energies = sorted(spectra_keys)
+        spectra = [
+            isotope.read_spectra_file(
+                os.path.join(runner.spectra_dir, spectra_keys[key])
+            ).rebin(step, min_bin, max_bin)
+            for key in energies
+        ]
+
+        bins = numpy.unique(
+            numpy.concatenate([[]] + [spectrum.bins for spectrum in spectra])
+        ).astype(int)
+        values = numpy.full((len(energies), len(bins)), numpy.nan)
+
+        for row, spectrum in enumerate(spectra):
+            values[row, numpy.searchsorted(bins, spectrum.bins)] = spectrum.values
+
+        data = numpy.concatenate(
+            [
+                [FORMAT_VERSION, len(energies), len(bins), 0],
+                energies,
+                bins,
+                values.ravel(),
+            ]
+        ).astype(dtype)
+
+        save(runner.rebinned_file(step, min_bin, max_bin), data)
+
+        return cls(data)
+
+    @classmethod
+    def load(
+        cls,
+        talys_runner,
+        step=utils.HISTO_DELTA_BIN,
+        min_bin=utils.HISTO_MIN_BIN,
+        max_bin=utils.HISTO_MAX_BIN,
+    ):
+        return load(
+            cls,
+            talys_runner.rebinned_file(step, min_bin, max_bin),
+            [talys_runner.spectra_dir],
+        )
+
+    # Returns None if the store has no spectrum for this energy
+    def rebinned_n_spec(self, alpha_energy):
+        index = self.index.get(energy_key(alpha_energy))
+
+        if index is None:
+            return None
+
+        row = numpy.array(self.values[index], dtype=float)
+        present = ~numpy.isnan(row)
+
+        return utils.Histogram.from_arrays(self.bins[present], row[present])
+
+
+# Element symbols are stored as the little-endian integer of their lower case
+# ASCII bytes, which every float dtype holds exactly
+def element_code(element_symbol):
+    return int.from_bytes(element_symbol.lower().encode(), "little")
+
+
+class StoppingPowerBundle:
+    def __init__(self, data):
+        n_elements = int(data[1])
+        n_points = int(data[2])
+
+        start = HEADER_SIZE
+        self.codes = data[start : start + n_elements]
+        start += n_elements
+        self.offsets = numpy.array(data[start : start + n_elements + 1], dtype=int)
+        start += n_elements + 1
+        self.energies = data[start : start + n_points]
+        start += n_points
+        self.values = data[start : start + n_points]
+
+        self.index = {int(code): i for i, code in enumerate(self.codes.tolist())}
+
+    # Packs the already loaded StoppingPowerLists into a single store
+    @classmethod
+    def compile(cls, stopping_power_lists, file_path, dtype=numpy.float64):
+        lengths = [len(stop_list.energies) for stop_list in stopping_power_lists]
+
+        data = numpy.concatenate(
+            [
+                [FORMAT_VERSION, len(stopping_power_lists), sum(lengths), 0],
+                [
+                    element_code(stop_list.element_symbol)
+                    for stop_list in stopping_power_lists
+                ],
+                numpy.cumsum([0] + lengths),
+            ]
+            + [stop_list.energies for stop_list in stopping_power_lists]
+            + [stop_list.values for stop_list in stopping_power_lists]
+        ).astype(dtype)
+
+        save(file_path, data)
+
+        return cls(data)
+
+    @classmethod
+    def load(cls, file_path, data_dir):
+        return load(cls, file_path, [data_dir])
+
+    # Returns the (energies, values) of an element's table as read-only views
+    # of the store, or None if the store has no table for the element
+    def table(self, element_symbol):
+        index = self.index.get(element_code(element_symbol))
+
+        if index is None:
+            return None
+
+        start, stop = self.offsets[index], self.offsets[index + 1]
+
+        return self.energies[start:stop], self.values[start:stop]
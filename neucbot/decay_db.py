@@ -0,0 +1,221 @@
+"""
+Local database of ground state alpha decays, imported from bulk ENSDF files.
+
+NNDC distributes the whole ENSDF database as a few large text files, each
+holding thousands of datasets of 80 column records separated by blank lines.
+import_files reads them in one streaming pass, keeps the first ground state
+alpha decay dataset of each parent nuclide, and writes an SQLite database:
+
+  decays (element, isotope, dsid, dataset)
+      one row per parent nuclide, with the dataset's ENSDF records
+  alphas (element, isotope, position, energy, intensity)
+      the parsed alpha energies (in MeV) and intensities, in the order
+      Parser.parse returns them, matching the lines of an alpha list file
+
+Both tables are indexed by (element, isotope). AlphaList and ChainAlphaList
+look alpha lists up in DECAY_DB_PATH before fetching them from NNDC, so that
+nodes without network access only need this one file. To build it, run:
+
+  python importDecays.py ensdf_*.txt
+"""
+
+import gzip
+import os
+import re
+import sqlite3
+
+from neucbot.ensdf import Parser
+
+DECAY_DB_PATH = "./Data/Decays/ensdf.sqlite"
+
+NUCID_PATTERN = re.compile(r"^\s*(?P<isotope>\d{1,3})(?P<element>[A-Z]{1,2})\s*$")
+
+SCHEMA = """
+CREATE TABLE decays (
+  element TEXT NOT NULL,
+  isotope INTEGER NOT NULL,
+  dsid TEXT NOT NULL,
+  dataset TEXT NOT NULL,
+  PRIMARY KEY (element, isotope)
+);
+CREATE TABLE alphas (
+  element TEXT NOT NULL,
+  isotope INTEGER NOT NULL,
+  position INTEGER NOT NULL,
+  energy REAL NOT NULL,
+  intensity REAL NOT NULL,
+  PRIMARY KEY (element, isotope, position)
+);
+"""
+
+
+# Splits a nuclide ID such as "212BI" into ("Bi", 212)
+def parse_nucid(nucid):
+    if match := NUCID_PATTERN.match(nucid):
+        return match.group("element").capitalize(), int(match.group("isotope"))
+
+    return None
+
+
+# Yields the datasets of an ENSDF file as lists of records, reading one line
+# at a time
+def datasets(file):
+    records = []
+
+    for line in file:
+        record = line.rstrip("\r\n")
+
+        if record.strip() == "":
+            if records:
+                yield records
+            records = []
+        else:
+            records.append(record)
+
+    if records:
+        yield records
+
+
+# Returns (element, isotope) of the parent of a ground state alpha decay
+# dataset, or None for any other dataset. Only the identification record is
+# checked for most datasets, so the record parsers run on alpha decays alone.
+def alpha_decay_parent(records):
+    if records[0].find(" A DECAY") == -1:
+        return None
+
+    for record in records:
+        if Parser.GROUND_STATE_DECAY_RECORD.match(record):
+            return parse_nucid(record[0:5])
+
+    return None
+
+
+def open_file(file_path):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt")
+
+    return open(file_path, "r")
+
+
+# Imports every ground state alpha decay in the ENSDF files into a new
+# database at db_path, replacing any existing one once the import is done.
+# Returns the number of nuclides imported.
+def import_files(file_paths, db_path=DECAY_DB_PATH):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    tmp_db_path = f"{db_path}.tmp"
+
+    if os.path.exists(tmp_db_path):
+        os.remove(tmp_db_path)
+
+    connection = sqlite3.connect(tmp_db_path)
+    connection.executescript(SCHEMA)
+    imported = set()
+
+    for file_path in file_paths:
+        with open_file(file_path) as file:
+            for records in datasets(file):
+                parent = alpha_decay_parent(records)
+
+                if parent is None or parent in imported:
+                    continue
+
+                element, isotope = parent
+                dataset = "\n".join(records)
+                alphas = Parser.parse(dataset)["alphas"]
+
+                connection.execute(
+                    "INSERT INTO decays VALUES (?, ?, ?, ?)",
+                    (element, isotope, records[0][9:39].strip(), dataset),
+                )
+                connection.executemany(
+                    "INSERT INTO alphas VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (element, isotope, position, energy / 1000, intensity)
+                        for position, (energy, intensity) in enumerate(alphas.items())
+                    ],
+                )
+                imported.add(parent)
+
+    connection.commit()
+    connection.close()
+    os.replace(tmp_db_path, db_path)
+
+    return len(imported)
+
+
+class DecayDatabase:
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DECAY_DB_PATH
+        self.connection = None
+
+    def exists(self):
+        return os.path.exists(self.db_path)
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Returns the alpha list of a parent nuclide as [[energy, intensity]], as
+    # it would be read from its alpha list file, or None if the database has
+    # no ground state alpha decay for it
+    def alphas(self, element, isotope):
+        if not self.exists():
+            return None
+
+        key = (str(element).capitalize(), int(isotope))
+        connection = self.connect()
+
+        if (
+            connection.execute(
+                "SELECT 1 FROM decays WHERE element = ? AND isotope = ?", key
+            ).fetchone()
+            is None
+        ):
+            return None
+
+        rows = connection.execute(
+            "SELECT energy, intensity FROM alphas WHERE element = ? AND isotope = ? ORDER BY position",
+            key,
+        )
+
+        return [[energy, intensity] for energy, intensity in rows]
+
+    def decay_file(self, element, isotope):
+        if not self.exists():
+            return None
+
+        row = (
+            self.connect()
+            .execute(
+                "SELECT dataset FROM decays WHERE element = ? AND isotope = ?",
+                (str(element).capitalize(), int(isotope)),
+            )
+            .fetchone()
+        )
+
+        return row[0] if row else None
+
+    def nuclides(self):
+        if not self.exists():
+            return []
+
+        return (
+            self.connect()
+            .execute("SELECT element, isotope FROM decays ORDER BY element, isotope")
+            .fetchall()
+        )
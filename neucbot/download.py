@@ -0,0 +1,282 @@
+"""
+Downloads of the precompiled (alpha,n) datasets.
+
+The data of each element is a gzipped tarball, <Symbol>.tar.gz, kept in one
+repository per element and dataset version under DEFAULT_SOURCE:
+
+  v1: <source>/<symbol>/<Symbol>.tar.gz      made with TALYS-1.6
+  v2: <source>/<symbol>_v2/<Symbol>.tar.gz   made with TALYS-1.95
+
+The source may also be a local mirror with the same layout (e.g. clones of
+the dataset repositories), given as a directory or a file:// URL.
+
+Archives are unpacked while they are read, into a staging directory in
+ISOTOPES_DIR, and every byte read is also appended to <Symbol>.tar.gz.part
+there. A transfer that fails part way leaves the .part file behind, and the
+next download of the element only fetches the rest of the archive. If the
+source has a <Symbol>.tar.gz.sha256 file next to the archive, the archive
+must match the SHA-256 digest in it. Only complete, verified archives have
+their files moved into ISOTOPES_DIR.
+"""
+
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from neucbot import ensdf
+from neucbot import talys
+
+DATASET_REPOSITORIES = {"v1": "{symbol}", "v2": "{symbol}_v2"}
+DEFAULT_VERSION = "v2"
+DEFAULT_SOURCE = "https://github.com/neucbot-datasets"
+
+# Files in GitHub repositories are served from this path of the default branch
+GITHUB_RAW_PATH = "raw/HEAD"
+
+# Number of elements downloaded at once by download_elements
+DEFAULT_CONCURRENCY = 4
+
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 60  # seconds
+
+
+def archive_name(symbol):
+    return f"{symbol.capitalize()}.tar.gz"
+
+
+# Returns the URL or local path of an element's archive
+def archive_location(source, version, symbol):
+    if version not in DATASET_REPOSITORIES:
+        raise RuntimeError(f"Unknown dataset version {version}")
+
+    repository = DATASET_REPOSITORIES[version].format(symbol=symbol.lower())
+    url = urlparse(source)
+
+    if url.scheme in ("http", "https"):
+        parts = [source.rstrip("/"), repository]
+        if url.netloc == "github.com":
+            parts.append(GITHUB_RAW_PATH)
+
+        return "/".join(parts + [archive_name(symbol)])
+
+    if url.scheme == "file":
+        source = url2pathname(url.path)
+
+    return os.path.join(source, repository, archive_name(symbol))
+
+
+def is_url(location):
+    return urlparse(location).scheme in ("http", "https")
+
+
+# Returns (stream, size, resumed) for the archive from byte offset onwards,
+# where size is the full size of the archive if known, and resumed is False
+# if the source sent the whole archive instead
+def open_archive(location, offset, http):
+    if not is_url(location):
+        file = open(location, "rb")
+        file.seek(offset)
+
+        return file, os.path.getsize(location), True
+
+    headers = dict(ensdf.REQUEST_HEADERS)
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+    response = http.get(location, headers=headers, stream=True, timeout=TIMEOUT)
+
+    # The part file already holds the whole archive
+    if response.status_code == 416:
+        response.close()
+        return open(os.devnull, "rb"), offset, True
+
+    response.raise_for_status()
+    response.raw.decode_content = True
+
+    resumed = response.status_code == 206
+    size = response.headers.get("Content-Length")
+    if size is not None:
+        size = int(size) + (offset if resumed else 0)
+
+    return response.raw, size, resumed
+
+
+# Returns the SHA-256 digest published next to the archive, or None
+def read_checksum(location, http):
+    if not is_url(location):
+        try:
+            with open(f"{location}.sha256") as file:
+                return file.read().split()[0].lower()
+        except FileNotFoundError:
+            return None
+
+    response = http.get(
+        f"{location}.sha256", headers=ensdf.REQUEST_HEADERS, timeout=TIMEOUT
+    )
+    if response.status_code == 404:
+        return None
+
+    response.raise_for_status()
+
+    return response.text.split()[0].lower()
+
+
+class ArchiveReader:
+    # Reads the bytes already in part_file first, then the rest of the archive
+    # from stream, appending them to part_file. Every byte read is hashed.
+    def __init__(self, part_file, offset, stream, size):
+        self.part_file = part_file
+        self.part_remaining = offset
+        self.stream = stream
+        self.size = size
+        self.position = 0  # bytes of the archive read so far
+        self.digest = hashlib.sha256()
+        self.interrupted = False
+
+    def read(self, size=CHUNK_SIZE):
+        if size is None or size < 0:
+            size = CHUNK_SIZE
+
+        if self.part_remaining:
+            data = self.part_file.read(min(size, self.part_remaining))
+            self.part_remaining -= len(data)
+        else:
+            try:
+                data = self.stream.read(size)
+            except Exception:
+                self.interrupted = True
+                raise
+
+            if not data and self.size is not None and self.position < self.size:
+                self.interrupted = True
+
+            self.part_file.write(data)
+
+        self.position += len(data)
+        self.digest.update(data)
+
+        return data
+
+    # Reads whatever the archive has left after the end of the tar stream
+    def drain(self):
+        while self.read(CHUNK_SIZE):
+            pass
+
+
+# Moves every file unpacked in staging_dir to the same place in isotopes_dir
+def install(staging_dir, isotopes_dir):
+    for directory, _, file_names in os.walk(staging_dir):
+        target_dir = os.path.join(isotopes_dir, os.path.relpath(directory, staging_dir))
+        os.makedirs(target_dir, exist_ok=True)
+
+        for file_name in file_names:
+            os.replace(
+                os.path.join(directory, file_name), os.path.join(target_dir, file_name)
+            )
+
+
+# Downloads, verifies and unpacks the dataset of one element into isotopes_dir.
+# http is a requests session, needed only for http(s) sources.
+def download_element(
+    symbol, version=DEFAULT_VERSION, source=DEFAULT_SOURCE, http=None, isotopes_dir=None
+):
+    isotopes_dir = isotopes_dir or talys.ISOTOPES_DIR
+    os.makedirs(isotopes_dir, exist_ok=True)
+
+    location = archive_location(source, version, symbol)
+    part_file_path = os.path.join(isotopes_dir, f"{archive_name(symbol)}.part")
+
+    expected_checksum = read_checksum(location, http)
+
+    offset = 0
+    if os.path.exists(part_file_path):
+        offset = os.path.getsize(part_file_path)
+
+    stream, size, resumed = open_archive(location, offset, http)
+    if not resumed:
+        offset = 0
+
+    staging_dir = tempfile.mkdtemp(prefix=f".{symbol}.", dir=isotopes_dir)
+    reader = None
+
+    try:
+        with open(part_file_path, "ab+") as part_file:
+            part_file.truncate(offset)
+            part_file.seek(0)
+
+            reader = ArchiveReader(part_file, offset, stream, size)
+
+            with tarfile.open(fileobj=reader, mode="r|gz") as archive:
+                archive.extractall(staging_dir, filter="data")
+
+            reader.drain()
+
+        checksum = reader.digest.hexdigest()
+        if expected_checksum and checksum != expected_checksum:
+            os.remove(part_file_path)
+            raise RuntimeError(
+                f"Checksum mismatch for {location}: expected {expected_checksum}, got {checksum}"
+            )
+
+        install(staging_dir, isotopes_dir)
+        os.remove(part_file_path)
+    except (tarfile.TarError, EOFError, OSError) as error:
+        # Keep the bytes received so far only when the transfer was cut short.
+        # Anything else means they do not make up a valid archive.
+        if reader and reader.interrupted:
+            raise RuntimeError(f"Download of {location} was interrupted: {error}")
+
+        if os.path.exists(part_file_path):
+            os.remove(part_file_path)
+
+        raise RuntimeError(f"Unable to unpack {location}: {error}")
+    finally:
+        stream.close()
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+# Downloads the datasets of several elements, up to concurrency at once and
+# each element only once. Raises a RuntimeError naming every element that
+# could not be downloaded once all others are done.
+def download_elements(
+    symbols,
+    version=DEFAULT_VERSION,
+    source=DEFAULT_SOURCE,
+    concurrency=DEFAULT_CONCURRENCY,
+    retries=ensdf.DEFAULT_RETRIES,
+    isotopes_dir=None,
+):
+    from concurrent.futures import ThreadPoolExecutor
+
+    symbols = list(dict.fromkeys(symbol.capitalize() for symbol in symbols))
+    http = None
+
+    if is_url(source):
+        http = ensdf.create_session(concurrency, retries)
+
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {
+            symbol: pool.submit(
+                download_element, symbol, version, source, http, isotopes_dir
+            )
+            for symbol in symbols
+        }
+
+        for symbol, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                errors.append(f"{symbol}: {error}")
+
+    if http is not None:
+        http.close()
+
+    if errors:
+        raise RuntimeError("Unable to download data for " + "; ".join(errors))
@@ -1,9 +1,12 @@
 import json
+import os
 
 from neucbot import chemistry
+from neucbot.isotope_table import ISOTOPES
 
 """
-Reads in the map from elements.json, which is structured in the following format:
+The map of isotopes and natural abundances is maintained in elements.json, which
+is structured in the following format:
 
 {
   "H": {
@@ -25,10 +28,38 @@ Reads in the map from elements.json, which is structured in the following format
   },
   ...
 }
+
+Parsing JSON at every start up is slow, so it is shipped as the Python module
+isotope_table.py, which is compiled to bytecode like any other module. After
+editing elements.json, regenerate it with:
+
+  python -m neucbot.elements
 """
 
-with open("./neucbot/elements.json", "r") as file:
-    isotopesMap = json.load(file)
+ELEMENTS_JSON = os.path.join(os.path.dirname(__file__), "elements.json")
+ISOTOPE_TABLE = os.path.join(os.path.dirname(__file__), "isotope_table.py")
+
+ISOTOPE_TABLE_HEADER = """# Generated from elements.json by neucbot.elements.write_isotope_table.
+# Do not edit by hand, run `python -m neucbot.elements` instead.
+
+# fmt: off
+ISOTOPES = {
+"""
+
+isotopesMap = ISOTOPES
+
+
+def write_isotope_table(json_path=ELEMENTS_JSON, table_path=ISOTOPE_TABLE):
+    with open(json_path, "r") as file:
+        isotopes = json.load(file)
+
+    with open(table_path, "w") as file:
+        file.write(ISOTOPE_TABLE_HEADER)
+
+        for symbol, isos in isotopes.items():
+            file.write(f"    {json.dumps(symbol)}: {json.dumps(isos)},\n")
+
+        file.write("}\n# fmt: on\n")
 
 
 class Element:
@@ -42,3 +73,7 @@ class Element:
     # This should return a value between 0 and 1
     def abundance(self, isotope):
         return float(self.isos.get(isotope).get("abundance")) / 100.0
+
+
+if __name__ == "__main__":
+    write_isotope_table()
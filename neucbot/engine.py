@@ -0,0 +1,121 @@
+import numpy
+
+
+class YieldTensors:
+    # Holds every quantity NeucbotRunner.run reads inside its per-step loop as
+    # arrays indexed by (alpha step, isotope, neutron bin):
+    #   - energies, intensities, deltas and stopping_powers have shape (steps,)
+    #   - mat_terms has shape (isotopes,)
+    #   - cross_sections has shape (steps, isotopes)
+    #   - spectra has shape (steps, isotopes, bins), with bins listing the
+    #     rebinned neutron energies (in keV) along the last axis
+    #   - present has the same shape as spectra, and marks the bins each
+    #     rebinned spectrum actually has an entry for
+    def __init__(
+        self,
+        energies,
+        intensities,
+        deltas,
+        stopping_powers,
+        names,
+        mat_terms,
+        cross_sections,
+        bins,
+        spectra,
+        present=None,
+    ):
+        self.energies = energies
+        self.intensities = intensities
+        self.deltas = deltas
+        self.stopping_powers = stopping_powers
+        self.names = names
+        self.mat_terms = mat_terms
+        self.cross_sections = cross_sections
+        self.bins = bins
+        self.spectra = spectra
+        self.present = present
+
+    @classmethod
+    def build(
+        cls,
+        condensed_alphas,
+        material_composition,
+        step_size,
+        run_talys=False,
+        force_recalculation=False,
+        progress=True,
+    ):
+        materials = material_composition.materials
+        steps = len(condensed_alphas)
+
+        energies = numpy.array([energy for energy, _ in condensed_alphas], dtype=float)
+        intensities = numpy.array(
+            [intensity for _, intensity in condensed_alphas], dtype=float
+        )
+        deltas = numpy.where(step_size > energies, energies, step_size)
+        stopping_powers = material_composition.stopping_power_table(energies)
+
+        names = [material.name() for material in materials]
+        mat_terms = numpy.array(
+            [material.material_term() for material in materials], dtype=float
+        )
+        cross_sections = numpy.zeros((steps, len(materials)))
+        histograms = []
+
+        from tqdm import tqdm
+
+        for step, energy in enumerate(tqdm(energies, disable=not progress)):
+            for index, material in enumerate(materials):
+                histograms.append(
+                    material.rebinned_n_spec(energy, run_talys, force_recalculation)
+                )
+                cross_sections[step, index] = material.cross_section(energy)
+
+        bins = numpy.unique(
+            numpy.concatenate([[]] + [histogram.bins for histogram in histograms])
+        ).astype(int)
+        spectra = numpy.zeros((steps * len(materials), len(bins)))
+        present = numpy.zeros((steps * len(materials), len(bins)), dtype=bool)
+
+        for row, histogram in enumerate(histograms):
+            columns = numpy.searchsorted(bins, histogram.bins)
+            spectra[row, columns] = histogram.values
+            present[row, columns] = True
+
+        return cls(
+            energies,
+            intensities,
+            deltas,
+            stopping_powers,
+            names,
+            mat_terms,
+            cross_sections,
+            bins,
+            spectra.reshape((steps, len(materials), len(bins))),
+            present.reshape((steps, len(materials), len(bins))),
+        )
+
+    # Per-step, per-isotope weights: (intensity / 100) * mat_term * dE / S(E)
+    def prefactors(self):
+        step_terms = (self.intensities / 100.0) * self.deltas / self.stopping_powers
+
+        return numpy.outer(step_terms, self.mat_terms)
+
+    # Contracts the tensors into the same result dict NeucbotRunner.run returns
+    def contract(self):
+        prefactors = self.prefactors()
+
+        isotope_cross_sections = (prefactors * self.cross_sections).sum(axis=0)
+        spectra_totals = numpy.einsum("si,sib->b", prefactors, self.spectra)
+
+        cross_sections = {}
+        for name, xsect in zip(self.names, isotope_cross_sections):
+            cross_sections[name] = cross_sections.get(name, 0) + float(xsect)
+
+        return {
+            "total_cross_section": float(isotope_cross_sections.sum()),
+            "cross_sections": cross_sections,
+            "spectra_totals": {
+                int(e): float(value) for e, value in zip(self.bins, spectra_totals)
+            },
+        }
@@ -8,10 +8,6 @@ https://www.nndc.bnl.gov/ensdf/ensdf-manual.pdf
 
 import os
 import re
-from requests import Session
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
 
 from neucbot import elements
 
@@ -26,19 +22,118 @@ ALPHA_DECAY_HREF_PATTERN = re.compile("getdecaydataset.jsp" + ".*a\\sdecay")
 
 DECAY_DATA_DIR = "./Data/Decays/ensdf"
 
+# Number of decay files fetched at once by fetch_all, which is also the number
+# of pooled connections kept open to the server
+DEFAULT_CONCURRENCY = 4
+
+# Number of times each request is retried on connection errors and on the
+# status codes below, backing off exponentially between attempts
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+# Creates a session whose connections are reused across requests and threads,
+# for both the NNDC server and local stand-ins served over plain HTTP
+def create_session(pool_size=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES):
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+# Reads or fetches the decay files of all (element, isotope) pairs, fetching
+# up to concurrency files at once over one shared session. Returns a dict of
+# decay file texts keyed by (element, isotope), and raises a RuntimeError
+# naming every isotope that could not be fetched once all others are done.
+def fetch_all(
+    isotopes,
+    concurrency=DEFAULT_CONCURRENCY,
+    retries=DEFAULT_RETRIES,
+    url_base=URL_BASE,
+):
+    from concurrent.futures import ThreadPoolExecutor
+
+    isotopes = list(
+        dict.fromkeys((element, str(isotope)) for element, isotope in isotopes)
+    )
+    clients = {}
+    http = None
+
+    for element, isotope in isotopes:
+        client = Client(element, isotope, url_base=url_base)
+
+        if not os.path.exists(client.decay_file_path()):
+            if http is None:
+                http = create_session(concurrency, retries)
+            client.http = http
+
+        clients[(element, isotope)] = client
+
+    decay_files = {}
+    errors = []
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {
+            key: pool.submit(client.read_or_fetch_decay_file)
+            for key, client in clients.items()
+        }
+
+        for (element, isotope), future in futures.items():
+            try:
+                decay_files[(element, isotope)] = future.result()
+            except Exception as error:
+                errors.append(f"{element}{isotope}: {error}")
+
+    if http is not None:
+        http.close()
+
+    if errors:
+        raise RuntimeError("Unable to fetch decay files for " + "; ".join(errors))
+
+    return decay_files
+
 
 class Client:
-    def __init__(self, element, isotope):
+    def __init__(self, element, isotope, http=None, url_base=URL_BASE):
         self.element = elements.Element(element)
         self.isotope = str(isotope)
+        self.url_base = url_base
         self.nndc_url = (
-            URL_BASE
+            url_base
             + DECAY_SEARCH_URL
             + "?unc=NDS&nuc="
             + self.isotope
             + element.upper()
         )
-        self.http = self.setup_http()
+        self._http = http
+
+    # The HTTP session (and the requests library) is only set up once a decay
+    # file actually has to be fetched, unless a shared session is passed in
+    @property
+    def http(self):
+        if self._http is None:
+            self._http = self.setup_http()
+
+        return self._http
+
+    @http.setter
+    def http(self, session):
+        self._http = session
 
     def read_or_fetch_decay_file(self):
         if os.path.exists(self.decay_file_path()):
@@ -51,6 +146,8 @@ class Client:
             return self.fetch_and_write_decay_file()
 
     def fetch_and_write_decay_file(self):
+        from bs4 import BeautifulSoup
+
         search_results = self.http.get(self.nndc_url, headers=REQUEST_HEADERS).content
         links = BeautifulSoup(search_results, "html.parser").find_all(
             href=ALPHA_DECAY_HREF_PATTERN
@@ -62,7 +159,7 @@ class Client:
             for link in links:
                 path = link.attrs.get("href")
                 decay_page = self.http.get(
-                    URL_BASE + path, headers=REQUEST_HEADERS
+                    self.url_base + path, headers=REQUEST_HEADERS
                 ).text
                 decay_file = BeautifulSoup(decay_page, "html.parser").find("pre")
 
@@ -95,10 +192,7 @@ class Client:
         return f"{DECAY_DATA_DIR}/{self.element.symbol}{self.isotope}.dat"
 
     def setup_http(self):
-        session = Session()
-        session.mount("https://", HTTPAdapter(max_retries=Retry(total=3)))
-
-        return session
+        return create_session(pool_size=1)
 
 
 """
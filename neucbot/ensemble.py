@@ -0,0 +1,373 @@
+"""
+Uncertainty ensembles evaluated in a single pass over the isotope data.
+
+An ensemble is a set of realizations of the same run, each with its own
+scale factors on:
+
+  - the stopping power of each element of the material
+  - the cross section and neutron spectrum of each isotope
+  - the intensity of each alpha in the alpha list
+
+The scale factors are drawn from normal distributions with mean 1 and the
+relative standard deviations given in a JSON spec (negative draws are
+clipped to 0):
+
+  {
+    "realizations": 200,
+    "seed": 1,
+    "stopping_powers": {"C": 0.04, "H": 0.04},
+    "cross_sections": {"C13": 0.1, "O": 0.2},
+    "intensities": 0.01,
+    "percentiles": [5, 16, 50, 84, 95]
+  }
+
+Cross section keys are isotope names or element symbols, the latter
+covering every isotope of the element. Anything not listed is not perturbed.
+
+The isotope data is read once, into engine.YieldTensors. Every realization
+then only changes the weights of the (alpha step, isotope) contributions,
+so all of them are computed as a few array contractions, batch_size
+realizations at a time. Each step's alpha intensity is the sum of the
+intensities of the alphas above it (see AlphaList.condensed_steps), so
+perturbed alphas are summed again for every realization.
+"""
+
+import json
+import numpy
+
+from neucbot import engine
+from neucbot import utils
+
+DEFAULT_REALIZATIONS = 100
+DEFAULT_PERCENTILES = [5, 16, 50, 84, 95]
+
+# Number of realizations whose (step x isotope) weights are held in memory
+# at once
+DEFAULT_BATCH_SIZE = 64
+
+SPEC_KEYS = {
+    "realizations",
+    "seed",
+    "stopping_powers",
+    "cross_sections",
+    "intensities",
+    "percentiles",
+}
+
+
+class EnsembleSpec:
+    def __init__(self, spec):
+        unknown_keys = set(spec) - SPEC_KEYS
+        if unknown_keys:
+            raise RuntimeError(
+                f"Unknown ensemble spec keys: {', '.join(sorted(unknown_keys))}"
+            )
+
+        self.realizations = int(spec.get("realizations", DEFAULT_REALIZATIONS))
+        self.seed = spec.get("seed")
+        self.stopping_powers = {
+            symbol.capitalize(): float(sigma)
+            for symbol, sigma in spec.get("stopping_powers", {}).items()
+        }
+        self.cross_sections = {
+            name.capitalize(): float(sigma)
+            for name, sigma in spec.get("cross_sections", {}).items()
+        }
+        self.intensities = float(spec.get("intensities", 0))
+        self.percentiles = [
+            float(percentile)
+            for percentile in spec.get("percentiles", DEFAULT_PERCENTILES)
+        ]
+
+    @classmethod
+    def from_file(cls, file_path):
+        with open(file_path) as file:
+            return cls(json.load(file))
+
+    def validate(self):
+        if self.realizations < 1:
+            raise RuntimeError("An ensemble needs at least one realization")
+
+        sigmas = [self.intensities]
+        sigmas += list(self.stopping_powers.values())
+        sigmas += list(self.cross_sections.values())
+
+        if any(sigma < 0 for sigma in sigmas):
+            raise RuntimeError("Ensemble uncertainties must not be negative")
+
+        if any(not 0 <= percentile <= 100 for percentile in self.percentiles):
+            raise RuntimeError("Ensemble percentiles must be between 0 and 100")
+
+    # Draws the scale factors of every realization. Returns arrays of shape
+    # (realizations, elements), (realizations, isotopes) and (realizations,
+    # alphas), in the order of the given element symbols, isotope names and
+    # number of alphas.
+    def sample(self, element_symbols, isotope_names, n_alphas):
+        isotope_elements = [name.rstrip("0123456789") for name in isotope_names]
+
+        for symbol in self.stopping_powers:
+            if symbol not in element_symbols:
+                raise RuntimeError(f"Element {symbol} is not in the material")
+
+        for name in self.cross_sections:
+            if name not in isotope_names and name not in isotope_elements:
+                raise RuntimeError(f"Isotope or element {name} is not in the material")
+
+        stopping_power_sigmas = [
+            self.stopping_powers.get(symbol, 0) for symbol in element_symbols
+        ]
+        cross_section_sigmas = [
+            self.cross_sections.get(name, self.cross_sections.get(element, 0))
+            for name, element in zip(isotope_names, isotope_elements)
+        ]
+
+        rng = numpy.random.default_rng(self.seed)
+        shape = (self.realizations,)
+
+        def draw(sigmas):
+            sigmas = numpy.asarray(sigmas, dtype=float)
+            scales = 1.0 + sigmas * rng.standard_normal(shape + sigmas.shape)
+
+            return numpy.clip(scales, 0, None)
+
+        return (
+            draw(stopping_power_sigmas),
+            draw(cross_section_sigmas),
+            draw([self.intensities] * n_alphas),
+        )
+
+
+class Ensemble:
+    # tensors holds the isotope data of the unperturbed run (see
+    # engine.YieldTensors), element_stopping_powers the stopping power of each
+    # element at every step weighted by its fraction of the material, with
+    # shape (elements, steps), and alpha_intensities and alpha_indices the
+    # sorted alphas and step indices from AlphaList.condensed_steps
+    def __init__(
+        self, tensors, element_stopping_powers, alpha_intensities, alpha_indices
+    ):
+        self.tensors = tensors
+        self.element_stopping_powers = element_stopping_powers
+        self.alpha_intensities = numpy.asarray(alpha_intensities, dtype=float)
+        self.alpha_indices = numpy.asarray(alpha_indices, dtype=int)
+
+    @classmethod
+    def build(
+        cls,
+        alpha_list,
+        material_composition,
+        step_size,
+        run_talys=False,
+        force_recalculation=False,
+        progress=True,
+    ):
+        sorted_alphas, energies, alpha_indices = alpha_list.condensed_steps(step_size)
+        alpha_intensities = [alpha[1] for alpha in sorted_alphas]
+
+        cumulative_intensities = numpy.cumsum(alpha_intensities)
+        condensed_alphas = [
+            [energy, cumulative_intensities[alpha_index]]
+            for energy, alpha_index in zip(energies, alpha_indices)
+        ]
+
+        tensors = engine.YieldTensors.build(
+            condensed_alphas,
+            material_composition,
+            step_size,
+            run_talys,
+            force_recalculation,
+            progress,
+        )
+
+        fractions = numpy.array(list(material_composition.fractions.values()))
+        element_stopping_powers = (
+            material_composition.element_stopping_power_table(tensors.energies)
+            * fractions[:, None]
+        )
+
+        return cls(tensors, element_stopping_powers, alpha_intensities, alpha_indices)
+
+    # Returns the total yield, the yield of each isotope and the spectrum of
+    # every realization, with shapes (realizations,), (realizations, isotopes)
+    # and (realizations, bins)
+    def evaluate(
+        self,
+        stopping_power_scales,
+        cross_section_scales,
+        intensity_scales,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        tensors = self.tensors
+        n_steps, n_isotopes, n_bins = tensors.spectra.shape
+        n_realizations = len(stopping_power_scales)
+
+        spectra = tensors.spectra.reshape((n_steps * n_isotopes, n_bins))
+        isotope_totals = numpy.zeros((n_realizations, n_isotopes))
+        spectra_totals = numpy.zeros((n_realizations, n_bins))
+
+        for start in range(0, n_realizations, batch_size):
+            batch = slice(start, start + batch_size)
+
+            intensities = numpy.cumsum(
+                self.alpha_intensities * intensity_scales[batch], axis=1
+            )[:, self.alpha_indices]
+            stopping_powers = (
+                stopping_power_scales[batch] @ self.element_stopping_powers
+            )
+
+            # (realization, step, isotope) weights of the contributions
+            step_terms = (intensities / 100.0) * tensors.deltas / stopping_powers
+            weights = (
+                step_terms[:, :, None]
+                * (tensors.mat_terms * cross_section_scales[batch])[:, None, :]
+            )
+
+            isotope_totals[batch] = numpy.einsum(
+                "rsi,si->ri", weights, tensors.cross_sections
+            )
+            spectra_totals[batch] = weights.reshape((len(weights), -1)) @ spectra
+
+        return isotope_totals.sum(axis=1), isotope_totals, spectra_totals
+
+
+# Mean, standard deviation and percentiles of values over the realizations
+# (the first axis)
+def summarize(values, percentiles):
+    values = numpy.asarray(values, dtype=float)
+    std = values.std(axis=0, ddof=1) if len(values) > 1 else numpy.zeros_like(values[0])
+
+    return {
+        "mean": values.mean(axis=0),
+        "std": std,
+        "percentiles": {
+            percentile: numpy.percentile(values, percentile, axis=0)
+            for percentile in percentiles
+        },
+    }
+
+
+# Converts one entry of a summary of arrays to floats
+def summary_entry(summary, index=None):
+    def pick(array):
+        return float(array if index is None else array[index])
+
+    return {
+        "mean": pick(summary["mean"]),
+        "std": pick(summary["std"]),
+        "percentiles": {
+            percentile: pick(value)
+            for percentile, value in summary["percentiles"].items()
+        },
+    }
+
+
+# Runs an ensemble. Returns the nominal (unperturbed) result dict as computed
+# by the runners, with summaries of the realizations added under "ensemble".
+def run(
+    alpha_list,
+    material_composition,
+    spec,
+    step_size,
+    run_talys=False,
+    force_recalculation=False,
+    progress=True,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    spec.validate()
+
+    ensemble = Ensemble.build(
+        alpha_list,
+        material_composition,
+        step_size,
+        run_talys,
+        force_recalculation,
+        progress,
+    )
+    tensors = ensemble.tensors
+
+    scales = spec.sample(
+        list(material_composition.fractions),
+        tensors.names,
+        len(ensemble.alpha_intensities),
+    )
+    totals, isotope_totals, spectra_totals = ensemble.evaluate(*scales, batch_size)
+
+    # Isotopes listed twice in a composition are reported together, as in
+    # the runners' results
+    names = list(dict.fromkeys(tensors.names))
+    name_totals = numpy.zeros((len(totals), len(names)))
+    for column, name in enumerate(tensors.names):
+        name_totals[:, names.index(name)] += isotope_totals[:, column]
+
+    total_summary = summarize(totals, spec.percentiles)
+    name_summary = summarize(name_totals, spec.percentiles)
+    spectra_summary = summarize(spectra_totals, spec.percentiles)
+
+    results = tensors.contract()
+    results["ensemble"] = {
+        "realizations": len(totals),
+        "total_cross_section": summary_entry(total_summary),
+        "cross_sections": {
+            name: summary_entry(name_summary, column)
+            for column, name in enumerate(names)
+        },
+        "spectra_totals": {
+            int(e): summary_entry(spectra_summary, column)
+            for column, e in enumerate(tensors.bins)
+        },
+    }
+
+    return results
+
+
+def print_summary(results, output_file):
+    summary = results["ensemble"]
+    total = summary["total_cross_section"]
+
+    def percentile_columns(entry):
+        return " ".join(
+            utils.format_float(value) for value in entry["percentiles"].values()
+        )
+
+    percentile_names = " ".join(
+        f"p{percentile:g}" for percentile in total["percentiles"]
+    )
+
+    print("", file=output_file)
+    print(f"# Ensemble of {summary['realizations']} realizations", file=output_file)
+    print(
+        "# Total neutron yield = ",
+        utils.format_float(results["total_cross_section"]),
+        " n/decay (nominal)",
+        file=output_file,
+    )
+    print(f"# mean std {percentile_names}", file=output_file)
+    print(
+        utils.format_float(total["mean"]),
+        utils.format_float(total["std"]),
+        percentile_columns(total),
+        file=output_file,
+    )
+
+    for name in sorted(summary["cross_sections"]):
+        entry = summary["cross_sections"][name]
+        print(
+            "\t",
+            name,
+            utils.format_float(entry["mean"]),
+            utils.format_float(entry["std"]),
+            percentile_columns(entry),
+            file=output_file,
+        )
+
+    print(f"# Spectrum: energy mean std {percentile_names}", file=output_file)
+
+    for e in sorted(summary["spectra_totals"]):
+        entry = summary["spectra_totals"][e]
+        print(
+            e,
+            utils.format_float(entry["mean"]),
+            utils.format_float(entry["std"]),
+            percentile_columns(entry),
+            file=output_file,
+        )
@@ -0,0 +1,90 @@
+# Generated from elements.json by neucbot.elements.write_isotope_table.
+# Do not edit by hand, run `python -m neucbot.elements` instead.
+
+# fmt: off
+ISOTOPES = {
+    "H": {"1": {"z": "1", "abundance": "99.985"}, "2": {"z": "1", "abundance": "0.015"}},
+    "He": {"3": {"z": "2", "abundance": "0.000137"}, "4": {"z": "2", "abundance": "99.999863"}},
+    "Li": {"6": {"z": "3", "abundance": "7.5"}, "7": {"z": "3", "abundance": "92.5"}},
+    "Be": {"9": {"z": "4", "abundance": "100"}},
+    "B": {"10": {"z": "5", "abundance": "19.9"}, "11": {"z": "5", "abundance": "80.1"}},
+    "C": {"12": {"z": "6", "abundance": "98.90"}, "13": {"z": "6", "abundance": "1.10"}},
+    "N": {"14": {"z": "7", "abundance": "99.634"}, "15": {"z": "7", "abundance": "0.366"}},
+    "O": {"16": {"z": "8", "abundance": "99.762"}, "17": {"z": "8", "abundance": "0.038"}, "18": {"z": "8", "abundance": "0.200"}},
+    "F": {"19": {"z": "9", "abundance": "100"}},
+    "Ne": {"20": {"z": "10", "abundance": "90.48"}, "21": {"z": "10", "abundance": "0.27"}, "22": {"z": "10", "abundance": "9.25"}},
+    "Na": {"23": {"z": "11", "abundance": "100"}},
+    "Mg": {"24": {"z": "12", "abundance": "78.99"}, "25": {"z": "12", "abundance": "10.00"}, "26": {"z": "12", "abundance": "11.01"}},
+    "Al": {"27": {"z": "13", "abundance": "100"}},
+    "Si": {"28": {"z": "14", "abundance": "92.23"}, "29": {"z": "14", "abundance": "4.67"}, "30": {"z": "14", "abundance": "3.10"}},
+    "P": {"31": {"z": "15", "abundance": "100"}},
+    "S": {"32": {"z": "16", "abundance": "95.02"}, "33": {"z": "16", "abundance": "0.75"}, "34": {"z": "16", "abundance": "4.21"}, "36": {"z": "16", "abundance": "0.02"}},
+    "Cl": {"35": {"z": "17", "abundance": "75.77"}, "37": {"z": "17", "abundance": "24.23"}},
+    "Ar": {"36": {"z": "18", "abundance": "0.337"}, "38": {"z": "18", "abundance": "0.063"}, "40": {"z": "18", "abundance": "99.600"}},
+    "K": {"39": {"z": "19", "abundance": "93.2581"}, "40": {"z": "19", "abundance": "0.0117"}, "41": {"z": "19", "abundance": "6.7302"}},
+    "Ca": {"40": {"z": "20", "abundance": "96.941"}, "42": {"z": "20", "abundance": "0.647"}, "43": {"z": "20", "abundance": "0.135"}, "44": {"z": "20", "abundance": "2.086"}, "46": {"z": "20", "abundance": "0.004"}, "48": {"z": "20", "abundance": "0.187"}},
+    "Sc": {"45": {"z": "21", "abundance": "100"}},
+    "Ti": {"46": {"z": "22", "abundance": "8.0"}, "47": {"z": "22", "abundance": "7.3"}, "48": {"z": "22", "abundance": "73.8"}, "49": {"z": "22", "abundance": "5.5"}, "50": {"z": "22", "abundance": "5.4"}},
+    "V": {"50": {"z": "23", "abundance": "0.250"}, "51": {"z": "23", "abundance": "99.750"}},
+    "Cr": {"50": {"z": "24", "abundance": "4.345"}, "52": {"z": "24", "abundance": "83.789"}, "53": {"z": "24", "abundance": "9.501"}, "54": {"z": "24", "abundance": "2.365"}},
+    "Fe": {"54": {"z": "26", "abundance": "5.8"}, "56": {"z": "26", "abundance": "91.72"}, "57": {"z": "26", "abundance": "2.2"}, "58": {"z": "26", "abundance": "0.28"}},
+    "Mn": {"55": {"z": "25", "abundance": "100"}},
+    "Ni": {"58": {"z": "28", "abundance": "68.077"}, "60": {"z": "28", "abundance": "26.223"}, "61": {"z": "28", "abundance": "1.140"}, "62": {"z": "28", "abundance": "3.634"}, "64": {"z": "28", "abundance": "0.926"}},
+    "Co": {"59": {"z": "27", "abundance": "100"}},
+    "Cu": {"63": {"z": "29", "abundance": "69.17"}, "65": {"z": "29", "abundance": "30.83"}},
+    "Zn": {"64": {"z": "30", "abundance": "48.6"}, "66": {"z": "30", "abundance": "27.9"}, "67": {"z": "30", "abundance": "4.1"}, "68": {"z": "30", "abundance": "18.8"}, "70": {"z": "30", "abundance": "0.6"}},
+    "Ga": {"69": {"z": "31", "abundance": "60.108"}, "71": {"z": "31", "abundance": "39.892"}},
+    "Ge": {"70": {"z": "32", "abundance": "21.23"}, "72": {"z": "32", "abundance": "27.66"}, "73": {"z": "32", "abundance": "7.73"}, "74": {"z": "32", "abundance": "35.94"}, "76": {"z": "32", "abundance": "7.44"}},
+    "Se": {"74": {"z": "34", "abundance": "0.89"}, "76": {"z": "34", "abundance": "9.36"}, "77": {"z": "34", "abundance": "7.63"}, "78": {"z": "34", "abundance": "23.78"}, "80": {"z": "34", "abundance": "49.61"}, "82": {"z": "34", "abundance": "8.73"}},
+    "As": {"75": {"z": "33", "abundance": "100"}},
+    "Kr": {"78": {"z": "36", "abundance": "0.35"}, "80": {"z": "36", "abundance": "2.25"}, "82": {"z": "36", "abundance": "11.6"}, "83": {"z": "36", "abundance": "11.5"}, "84": {"z": "36", "abundance": "57.0"}, "86": {"z": "36", "abundance": "17.3"}},
+    "Br": {"79": {"z": "35", "abundance": "50.69"}, "81": {"z": "35", "abundance": "49.31"}},
+    "Sr": {"84": {"z": "38", "abundance": "0.56"}, "86": {"z": "38", "abundance": "9.86"}, "87": {"z": "38", "abundance": "7.00"}, "88": {"z": "38", "abundance": "82.58"}},
+    "Rb": {"85": {"z": "37", "abundance": "72.165"}, "87": {"z": "37", "abundance": "27.835"}},
+    "Y": {"89": {"z": "39", "abundance": "100"}},
+    "Zr": {"90": {"z": "40", "abundance": "51.45"}, "91": {"z": "40", "abundance": "11.22"}, "92": {"z": "40", "abundance": "17.15"}, "94": {"z": "40", "abundance": "17.38"}, "96": {"z": "40", "abundance": "2.80"}},
+    "Mo": {"92": {"z": "42", "abundance": "14.84"}, "94": {"z": "42", "abundance": "9.25"}, "95": {"z": "42", "abundance": "15.92"}, "96": {"z": "42", "abundance": "16.68"}, "97": {"z": "42", "abundance": "9.55"}, "98": {"z": "42", "abundance": "24.13"}, "100": {"z": "42", "abundance": "9.63"}},
+    "Nb": {"93": {"z": "41", "abundance": "100"}},
+    "Ru": {"96": {"z": "44", "abundance": "5.52"}, "98": {"z": "44", "abundance": "1.88"}, "99": {"z": "44", "abundance": "12.7"}, "100": {"z": "44", "abundance": "12.6"}, "101": {"z": "44", "abundance": "17.0"}, "102": {"z": "44", "abundance": "31.6"}, "104": {"z": "44", "abundance": "18.7"}},
+    "Pd": {"102": {"z": "46", "abundance": "1.02"}, "104": {"z": "46", "abundance": "11.14"}, "105": {"z": "46", "abundance": "22.33"}, "106": {"z": "46", "abundance": "27.33"}, "108": {"z": "46", "abundance": "26.46"}, "110": {"z": "46", "abundance": "11.72"}},
+    "Rh": {"103": {"z": "45", "abundance": "100"}},
+    "Cd": {"106": {"z": "48", "abundance": "1.25"}, "108": {"z": "48", "abundance": "0.89"}, "110": {"z": "48", "abundance": "12.49"}, "111": {"z": "48", "abundance": "12.80"}, "112": {"z": "48", "abundance": "24.13"}, "113": {"z": "48", "abundance": "12.22"}, "114": {"z": "48", "abundance": "28.73"}, "116": {"z": "48", "abundance": "7.49"}},
+    "Ag": {"107": {"z": "47", "abundance": "51.839"}, "109": {"z": "47", "abundance": "48.161"}},
+    "Sn": {"112": {"z": "50", "abundance": "0.97"}, "114": {"z": "50", "abundance": "0.65"}, "115": {"z": "50", "abundance": "0.34"}, "116": {"z": "50", "abundance": "14.53"}, "117": {"z": "50", "abundance": "7.68"}, "118": {"z": "50", "abundance": "24.23"}, "119": {"z": "50", "abundance": "8.59"}, "120": {"z": "50", "abundance": "32.59"}, "122": {"z": "50", "abundance": "4.63"}, "124": {"z": "50", "abundance": "5.79"}},
+    "In": {"113": {"z": "49", "abundance": "4.3"}, "115": {"z": "49", "abundance": "95.7"}},
+    "Te": {"120": {"z": "52", "abundance": "0.096"}, "122": {"z": "52", "abundance": "2.603"}, "123": {"z": "52", "abundance": "0.908"}, "124": {"z": "52", "abundance": "4.816"}, "125": {"z": "52", "abundance": "7.139"}, "126": {"z": "52", "abundance": "18.95"}, "128": {"z": "52", "abundance": "31.69"}, "130": {"z": "52", "abundance": "33.80"}},
+    "Sb": {"121": {"z": "51", "abundance": "57.36"}, "123": {"z": "51", "abundance": "42.64"}},
+    "Xe": {"124": {"z": "54", "abundance": "0.10"}, "126": {"z": "54", "abundance": "0.09"}, "128": {"z": "54", "abundance": "1.91"}, "129": {"z": "54", "abundance": "26.4"}, "130": {"z": "54", "abundance": "4.1"}, "131": {"z": "54", "abundance": "21.2"}, "132": {"z": "54", "abundance": "26.9"}, "134": {"z": "54", "abundance": "10.4"}, "136": {"z": "54", "abundance": "8.9"}},
+    "I": {"127": {"z": "53", "abundance": "100"}},
+    "Ba": {"130": {"z": "56", "abundance": "0.106"}, "132": {"z": "56", "abundance": "0.101"}, "134": {"z": "56", "abundance": "2.417"}, "135": {"z": "56", "abundance": "6.592"}, "136": {"z": "56", "abundance": "7.854"}, "137": {"z": "56", "abundance": "11.23"}, "138": {"z": "56", "abundance": "71.70"}},
+    "Cs": {"133": {"z": "55", "abundance": "100"}},
+    "Ce": {"136": {"z": "58", "abundance": "0.19"}, "138": {"z": "58", "abundance": "0.25"}, "140": {"z": "58", "abundance": "88.48"}, "142": {"z": "58", "abundance": "11.08"}},
+    "La": {"138": {"z": "57", "abundance": "0.0902"}, "139": {"z": "57", "abundance": "99.9098"}},
+    "Pr": {"141": {"z": "59", "abundance": "100"}},
+    "Nd": {"142": {"z": "60", "abundance": "27.13"}, "143": {"z": "60", "abundance": "12.18"}, "144": {"z": "60", "abundance": "23.80"}, "145": {"z": "60", "abundance": "8.30"}, "146": {"z": "60", "abundance": "17.19"}, "148": {"z": "60", "abundance": "5.76"}, "150": {"z": "60", "abundance": "5.64"}},
+    "Sm": {"144": {"z": "62", "abundance": "3.1"}, "147": {"z": "62", "abundance": "15.0"}, "148": {"z": "62", "abundance": "11.3"}, "149": {"z": "62", "abundance": "13.8"}, "150": {"z": "62", "abundance": "7.4"}, "152": {"z": "62", "abundance": "26.7"}, "154": {"z": "62", "abundance": "22.7"}},
+    "Eu": {"151": {"z": "63", "abundance": "47.8"}, "153": {"z": "63", "abundance": "52.2"}},
+    "Gd": {"152": {"z": "64", "abundance": "0.20"}, "154": {"z": "64", "abundance": "2.18"}, "155": {"z": "64", "abundance": "14.80"}, "156": {"z": "64", "abundance": "20.47"}, "157": {"z": "64", "abundance": "15.65"}, "158": {"z": "64", "abundance": "24.84"}, "160": {"z": "64", "abundance": "21.86"}},
+    "Dy": {"156": {"z": "66", "abundance": "0.06"}, "158": {"z": "66", "abundance": "0.10"}, "160": {"z": "66", "abundance": "2.34"}, "161": {"z": "66", "abundance": "18.9"}, "162": {"z": "66", "abundance": "25.5"}, "163": {"z": "66", "abundance": "24.9"}, "164": {"z": "66", "abundance": "28.2"}},
+    "Tb": {"159": {"z": "65", "abundance": "100"}},
+    "Er": {"162": {"z": "68", "abundance": "0.14"}, "164": {"z": "68", "abundance": "1.61"}, "166": {"z": "68", "abundance": "33.6"}, "167": {"z": "68", "abundance": "22.95"}, "168": {"z": "68", "abundance": "26.8"}, "170": {"z": "68", "abundance": "14.9"}},
+    "Ho": {"165": {"z": "67", "abundance": "100"}},
+    "Yb": {"168": {"z": "70", "abundance": "0.13"}, "170": {"z": "70", "abundance": "3.05"}, "171": {"z": "70", "abundance": "14.3"}, "172": {"z": "70", "abundance": "21.9"}, "173": {"z": "70", "abundance": "16.12"}, "174": {"z": "70", "abundance": "31.8"}, "176": {"z": "70", "abundance": "12.7"}},
+    "Tm": {"169": {"z": "69", "abundance": "100"}},
+    "Hf": {"174": {"z": "72", "abundance": "0.162"}, "176": {"z": "72", "abundance": "5.206"}, "177": {"z": "72", "abundance": "18.606"}, "178": {"z": "72", "abundance": "27.297"}, "179": {"z": "72", "abundance": "13.629"}, "180": {"z": "72", "abundance": "35.100"}},
+    "Lu": {"175": {"z": "71", "abundance": "97.41"}, "176": {"z": "71", "abundance": "2.59"}},
+    "Ta": {"180": {"z": "73", "abundance": "0.012"}, "181": {"z": "73", "abundance": "99.988"}},
+    "W": {"180": {"z": "74", "abundance": "0.13"}, "182": {"z": "74", "abundance": "26.3"}, "183": {"z": "74", "abundance": "14.3"}, "184": {"z": "74", "abundance": "30.67"}, "186": {"z": "74", "abundance": "28.6"}},
+    "Os": {"184": {"z": "76", "abundance": "0.02"}, "186": {"z": "76", "abundance": "1.58"}, "187": {"z": "76", "abundance": "1.6"}, "188": {"z": "76", "abundance": "13.3"}, "189": {"z": "76", "abundance": "16.1"}, "190": {"z": "76", "abundance": "26.4"}, "192": {"z": "76", "abundance": "41.0"}},
+    "Re": {"185": {"z": "75", "abundance": "37.40"}, "187": {"z": "75", "abundance": "62.60"}},
+    "Pt": {"190": {"z": "78", "abundance": "0.01"}, "192": {"z": "78", "abundance": "0.79"}, "194": {"z": "78", "abundance": "32.9"}, "195": {"z": "78", "abundance": "33.8"}, "196": {"z": "78", "abundance": "25.3"}, "198": {"z": "78", "abundance": "7.2"}},
+    "Ir": {"191": {"z": "77", "abundance": "37.3"}, "193": {"z": "77", "abundance": "62.7"}},
+    "Hg": {"196": {"z": "80", "abundance": "0.15"}, "198": {"z": "80", "abundance": "9.97"}, "199": {"z": "80", "abundance": "16.87"}, "200": {"z": "80", "abundance": "23.10"}, "201": {"z": "80", "abundance": "13.18"}, "202": {"z": "80", "abundance": "29.86"}, "204": {"z": "80", "abundance": "6.87"}},
+    "Au": {"197": {"z": "79", "abundance": "100"}},
+    "Tl": {"203": {"z": "81", "abundance": "29.524"}, "205": {"z": "81", "abundance": "70.476"}},
+    "Pb": {"204": {"z": "82", "abundance": "1.4"}, "206": {"z": "82", "abundance": "24.1"}, "207": {"z": "82", "abundance": "22.1"}, "208": {"z": "82", "abundance": "52.4"}},
+    "Bi": {"209": {"z": "83", "abundance": "100"}},
+    "Th": {"232": {"z": "90", "abundance": "100"}},
+    "U": {"234": {"z": "92", "abundance": "0.0055"}, "235": {"z": "92", "abundance": "0.7200"}, "238": {"z": "92", "abundance": "99.2745"}},
+}
+# fmt: on
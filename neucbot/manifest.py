@@ -0,0 +1,206 @@
+"""
+Per-isotope index of the alpha energies with TALYS data.
+
+Looking up whether the TALYS output and neutron spectrum of an alpha energy
+exist costs a stat of each file, on every alpha step of every run. Instead,
+each isotope keeps a manifest (Data/Isotopes/<El>/<Iso>/manifest.json) of
+the energies, in units of 0.01 MeV, whose files are present and not empty:
+
+  {
+    "format_version": 1,
+    "directories": {"TalysOut": <mtime in ns>, "NSpectra": <mtime in ns>},
+    "outputs": [105, 676, ...],
+    "spectra": [105, 676, ...]
+  }
+
+Loading a manifest stats the two directories, and only lists the files of a
+directory again if its modification time differs from the one recorded.
+Manifests are rewritten whenever a directory had to be listed again, and
+only for isotopes with any data, as well as after every TALYS run, whose
+files a directory's modification time does not account for if they were
+rewritten in place.
+"""
+
+import json
+import os
+import threading
+import time
+
+from neucbot import datastore
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Directories modified this recently may still be modified again within the
+# same timestamp, which some file systems (e.g. NFS) only keep to the second.
+# Their modification time is not recorded, so that they are always listed
+# again on the next load.
+RACY_WINDOW_NS = 2 * 10**9
+
+
+# Returns the energy keys of the non-empty files in directory whose names
+# match pattern
+def scan(directory, pattern):
+    energies = set()
+
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return energies
+
+    for entry in entries:
+        if (match := pattern.match(entry.name)) and entry.stat().st_size > 0:
+            energies.add(datastore.energy_key(float(match.group("energy"))))
+
+    return energies
+
+
+def valid_file(file_path):
+    try:
+        return os.stat(file_path).st_size > 0
+    except FileNotFoundError:
+        return False
+
+
+# Formats sorted energy keys as ranges of consecutive steps, e.g.
+# "0.01-0.12, 4.50 MeV"
+def format_ranges(energy_keys):
+    ranges = []
+
+    for key in energy_keys:
+        if ranges and key == ranges[-1][1] + 1:
+            ranges[-1][1] = key
+        else:
+            ranges.append([key, key])
+
+    return (
+        ", ".join(
+            (
+                f"{start / 100:.2f}"
+                if start == stop
+                else f"{start / 100:.2f}-{stop / 100:.2f}"
+            )
+            for start, stop in ranges
+        )
+        + " MeV"
+    )
+
+
+class EnergyManifest:
+    def __init__(self, talys_runner, outputs=(), spectra=()):
+        self.talys_runner = talys_runner
+        self.outputs = set(outputs)
+        self.spectra = set(spectra)
+        self.directory_mtimes = {}
+
+    @classmethod
+    def load(cls, talys_runner):
+        manifest = cls(talys_runner)
+        manifest.refresh()
+
+        return manifest
+
+    def file_path(self):
+        return os.path.join(self.talys_runner.base_path, MANIFEST_FILE)
+
+    # Reads the manifest file, then lists the files of any directory that
+    # changed since it was written
+    def refresh(self):
+        try:
+            with open(self.file_path()) as file:
+                data = json.load(file)
+
+            if data["format_version"] == FORMAT_VERSION:
+                self.directory_mtimes = data["directories"]
+                self.outputs = set(data["outputs"])
+                self.spectra = set(data["spectra"])
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        changed = False
+
+        for name, directory, pattern, energies in [
+            (
+                "TalysOut",
+                self.talys_runner.output_dir,
+                datastore.OUTPUT_FILE_PATTERN,
+                self.outputs,
+            ),
+            (
+                "NSpectra",
+                self.talys_runner.spectra_dir,
+                datastore.SPECTRA_FILE_PATTERN,
+                self.spectra,
+            ),
+        ]:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if mtime is not None and mtime == self.directory_mtimes.get(name):
+                continue
+
+            energies.clear()
+            energies.update(scan(directory, pattern))
+
+            if mtime is not None and time.time_ns() - mtime < RACY_WINDOW_NS:
+                mtime = None
+
+            self.directory_mtimes[name] = mtime
+            changed = True
+
+        if changed and (self.outputs or self.spectra):
+            self.save()
+
+    def save(self):
+        data = {
+            "format_version": FORMAT_VERSION,
+            "directories": self.directory_mtimes,
+            "outputs": sorted(self.outputs),
+            "spectra": sorted(self.spectra),
+        }
+
+        # Written to a file of its own first, since other processes, or other
+        # threads of the server, may be updating the same manifest
+        tmp_file_path = f"{self.file_path()}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file_path, "w") as file:
+                json.dump(data, file)
+
+            os.replace(tmp_file_path, self.file_path())
+        except OSError:
+            # The manifest only saves work, so read-only data is fine
+            pass
+
+    def has_output(self, rounded_alpha_energy):
+        return datastore.energy_key(rounded_alpha_energy) in self.outputs
+
+    def has_spectrum(self, rounded_alpha_energy):
+        return datastore.energy_key(rounded_alpha_energy) in self.spectra
+
+    # Records the files of the given energies after TALYS has (re)written
+    # them, and saves the manifest. Files rewritten in place leave their
+    # directory's modification time unchanged, so other processes would not
+    # notice them otherwise.
+    def update(self, rounded_alpha_energies):
+        for rounded_alpha_energy in rounded_alpha_energies:
+            key = datastore.energy_key(rounded_alpha_energy)
+
+            for energies, file_path in [
+                (self.outputs, self.talys_runner.output_file(rounded_alpha_energy)),
+                (self.spectra, self.talys_runner.spectra_file(rounded_alpha_energy)),
+            ]:
+                if valid_file(file_path):
+                    energies.add(key)
+                else:
+                    energies.discard(key)
+
+        self.save()
+
+    # Energy keys among the given truncated alpha energies that lack either
+    # a TALYS output or a neutron spectrum
+    def gaps(self, rounded_alpha_energies):
+        keys = {datastore.energy_key(energy) for energy in rounded_alpha_energies}
+
+        return sorted(keys - (self.outputs & self.spectra))
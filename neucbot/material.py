@@ -1,10 +1,13 @@
 import os
 import re
-import subprocess
 
-from bisect import bisect
+import numpy
 
+from neucbot import cache
+from neucbot import datastore
+from neucbot import download
 from neucbot import elements
+from neucbot import manifest
 from neucbot import talys
 from neucbot import utils
 
@@ -12,6 +15,21 @@ N_A = 6.0221409e23
 MeV_to_keV = 1.0e3
 mb_to_cm2 = 1.0e-27
 
+# Stopping power lists loaded in this process, keyed by element symbol
+STOPPING_POWER_LISTS = {}
+
+STOPPING_POWER_DIR = "./Data/StoppingPowers"
+
+# Every table in STOPPING_POWER_DIR compiled into one store (see
+# neucbot.datastore). It is kept next to the directory rather than in it,
+# where writing it would make the directory newer than the bundle.
+STOPPING_POWER_BUNDLE = "./Data/stopping_powers.npy"
+
+# Alpha grids whose mixture stopping powers each Composition keeps. Runs use
+# one grid, adaptive refinement and long-lived compositions (e.g. in the
+# server) a few more.
+STOPPING_POWER_TABLES = 4
+
 NEUTRON_CROSS_SECTION_PATTERN = re.compile(
     r"2. Binary non-elastic cross sections .non-exclusive.\n\n\s+gamma.*\n\s+neutron = (?P<cross_section>\d\.\d{5}E[\+\-]\d{2})"
 )
@@ -24,6 +42,11 @@ class Isotope:
         self.mass_number = int(mass_number)
         self.fraction = float(fraction)
         self.talys_runner = talys.Runner(self.element.symbol, self.mass_number)
+        self._data_path = os.path.abspath(self.talys_runner.base_path)
+        self._data_store = None
+        self._data_store_loaded = False
+        self._energy_manifest = None
+        self._rebinned_stores = {}
 
     def material_term(self):
         return (N_A * self.fraction) / self.mass_number
@@ -31,20 +54,115 @@ class Isotope:
     def name(self):
         return f"{self.element.symbol}{self.mass_number}"
 
+    # The compiled data store (see neucbot.datastore) is opened at most once
+    # per isotope. Returns None if no up-to-date store exists.
+    def data_store(self):
+        if not self._data_store_loaded:
+            self._data_store = datastore.IsotopeDataStore.load(self.talys_runner)
+            self._data_store_loaded = True
+
+        return self._data_store
+
+    # Rebinned spectra stores are opened at most once per isotope and binning
+    def rebinned_store(self, step, min_bin, max_bin):
+        binning = (step, min_bin, max_bin)
+
+        if binning not in self._rebinned_stores:
+            self._rebinned_stores[binning] = datastore.RebinnedSpectraStore.load(
+                self.talys_runner, *binning
+            )
+
+        return self._rebinned_stores[binning]
+
+    def compile_data(
+        self,
+        dtype="float64",
+        step=utils.HISTO_DELTA_BIN,
+        min_bin=utils.HISTO_MIN_BIN,
+        max_bin=utils.HISTO_MAX_BIN,
+    ):
+        self._data_store = datastore.IsotopeDataStore.compile(self, dtype)
+        self._data_store_loaded = True
+        self._rebinned_stores[(step, min_bin, max_bin)] = (
+            datastore.RebinnedSpectraStore.compile(self, step, min_bin, max_bin, dtype)
+        )
+
+    # The index of energies with TALYS data (see neucbot.manifest), through
+    # which every lookup checks for files instead of stat-ing them
+    def energy_manifest(self):
+        if self._energy_manifest is None:
+            self._energy_manifest = manifest.EnergyManifest.load(self.talys_runner)
+
+        return self._energy_manifest
+
+    # Key into cache.ISOTOPE_DATA for parsed data of the given kind. Isotopes
+    # read from different data directories never share entries.
+    def cache_key(self, kind, rounded_alpha_energy):
+        return (kind, self._data_path, rounded_alpha_energy)
+
+    def run_talys(self, rounded_alpha_energy):
+        self.talys_runner.run(rounded_alpha_energy)
+        self.reset_talys_data([rounded_alpha_energy])
+
+    # Forgets cached data for energies whose TALYS outputs have been
+    # rewritten, and re-checks the compiled data store on next use
+    def reset_talys_data(self, rounded_alpha_energies):
+        self._data_store_loaded = False
+        self._rebinned_stores = {}
+
+        if self._energy_manifest is not None:
+            self._energy_manifest.update(rounded_alpha_energies)
+
+        for rounded_alpha_energy in rounded_alpha_energies:
+            for kind in ["cross_section", "differential_n_spec"]:
+                cache.ISOTOPE_DATA.invalidate(
+                    self.cache_key(kind, rounded_alpha_energy)
+                )
+
+    # Truncated alpha energies (as used for TALYS file names) for which TALYS
+    # has to be run, either because no spectra file exists yet or because
+    # every output is being recalculated
+    def missing_talys_energies(self, alpha_energies, force_recalculation=False):
+        rounded_alpha_energies = sorted(
+            {int(100 * alpha_energy) / 100.0 for alpha_energy in alpha_energies}
+        )
+
+        return [
+            rounded_alpha_energy
+            for rounded_alpha_energy in rounded_alpha_energies
+            if force_recalculation
+            or not self.energy_manifest().has_spectrum(rounded_alpha_energy)
+        ]
+
     def differential_n_spec(
         self, alpha_energy, run_talys=False, force_recalculation=False
     ):
         rounded_alpha_energy = int(100 * alpha_energy) / 100.0
+        key = self.cache_key("differential_n_spec", rounded_alpha_energy)
 
         if force_recalculation:
-            self.talys_runner.run(rounded_alpha_energy)
-
-        spectra_file_path = self.talys_runner.spectra_file(rounded_alpha_energy)
-        if not os.path.exists(spectra_file_path):
+            self.run_talys(rounded_alpha_energy)
+
+            # Recalculated TALYS outputs supersede anything compiled earlier
+            self._data_store = None
+            self._data_store_loaded = True
+        elif (spectrum := cache.ISOTOPE_DATA.get(key)) is not None:
+            return spectrum
+        elif store := self.data_store():
+            spectrum = store.differential_n_spec(rounded_alpha_energy)
+
+            if spectrum is not None:
+                cache.ISOTOPE_DATA.put(key, spectrum)
+                return spectrum
+
+        energy_manifest = self.energy_manifest()
+        if not energy_manifest.has_spectrum(rounded_alpha_energy):
             if run_talys:
                 attempts = 0
-                while attempts < 3 and not os.path.exists(spectra_file_path):
-                    self.talys_runner.run(rounded_alpha_energy)
+                while attempts < 3 and not energy_manifest.has_spectrum(
+                    rounded_alpha_energy
+                ):
+                    self.run_talys(rounded_alpha_energy)
                     attempts += 1
 
                 # If all three attempts to run TALYS failed, exit early
@@ -53,11 +171,37 @@ class Isotope:
             else:
                 return utils.Histogram()
 
-        # This should be impossible to reach because the TALYS runner creates
-        # all of these directories on instantiation. TODO: verify then remove
-        if not os.path.exists(self.talys_runner.output_dir):
-            return utils.Histogram()
+        spectrum = self.read_spectra_file(
+            self.talys_runner.spectra_file(rounded_alpha_energy)
+        )
+        cache.ISOTOPE_DATA.put(key, spectrum)
+
+        return spectrum
+
+    # Same as differential_n_spec(...).rebin(step, min_bin, max_bin), but read
+    # from the precomputed rebinned spectra when they have been compiled
+    def rebinned_n_spec(
+        self,
+        alpha_energy,
+        run_talys=False,
+        force_recalculation=False,
+        step=utils.HISTO_DELTA_BIN,
+        min_bin=utils.HISTO_MIN_BIN,
+        max_bin=utils.HISTO_MAX_BIN,
+    ):
+        if not force_recalculation and (
+            store := self.rebinned_store(step, min_bin, max_bin)
+        ):
+            spectrum = store.rebinned_n_spec(int(100 * alpha_energy) / 100.0)
+
+            if spectrum is not None:
+                return spectrum
 
+        return self.differential_n_spec(
+            alpha_energy, run_talys, force_recalculation
+        ).rebin(step, min_bin, max_bin)
+
+    def read_spectra_file(self, spectra_file_path):
         spectra_file = open(spectra_file_path)
         spectra = {}
 
@@ -76,12 +220,30 @@ class Isotope:
 
     def cross_section(self, alpha_energy):
         rounded_alpha_energy = int(100 * alpha_energy) / 100.0
+        key = self.cache_key("cross_section", rounded_alpha_energy)
+
+        if (cross_section := cache.ISOTOPE_DATA.get(key)) is not None:
+            return cross_section
+
+        if store := self.data_store():
+            cross_section = store.cross_section(rounded_alpha_energy)
 
-        output_file_path = self.talys_runner.output_file(rounded_alpha_energy)
+            if cross_section is not None:
+                cache.ISOTOPE_DATA.put(key, cross_section)
+                return cross_section
 
-        if not os.path.exists(output_file_path):
+        # Missing outputs are not cached, since TALYS may still produce them
+        if not self.energy_manifest().has_output(rounded_alpha_energy):
             return 0
 
+        cross_section = self.read_output_file(
+            self.talys_runner.output_file(rounded_alpha_energy)
+        )
+        cache.ISOTOPE_DATA.put(key, cross_section)
+
+        return cross_section
+
+    def read_output_file(self, output_file_path):
         with open(output_file_path, "r") as output_file:
             file_text = output_file.read()
 
@@ -92,6 +254,17 @@ class Isotope:
         else:
             return 0
 
+    # Changes whenever any TALYS output, spectrum or compiled store of this
+    # isotope is added, removed or rewritten
+    def data_fingerprint(self):
+        return datastore.fingerprint(
+            [
+                self.talys_runner.base_path,
+                self.talys_runner.output_dir,
+                self.talys_runner.spectra_dir,
+            ]
+        )
+
     def talys_spectra_dir(self):
         return self.talys_runner.talys_spectra_dir()
 
@@ -103,10 +276,45 @@ class StoppingPowerList:
     def __init__(self, element_symbol):
         self.element_symbol = element_symbol
         self.stopping_powers = {}
+        self.energies = numpy.array([])
+        self.values = numpy.array([])
+
+    # Stopping power tables never change, so every Composition in the process
+    # shares one loaded list per element
+    @classmethod
+    def for_element(cls, element_symbol):
+        if element_symbol not in STOPPING_POWER_LISTS:
+            stop_power_list = cls(element_symbol)
+            if not stop_power_list.load_bundle():
+                stop_power_list.load_file()
+
+            STOPPING_POWER_LISTS[element_symbol] = stop_power_list
+
+        return STOPPING_POWER_LISTS[element_symbol]
+
+    def file_path(self):
+        return os.path.join(STOPPING_POWER_DIR, f"{self.element_symbol.lower()}.dat")
+
+    # Takes the table from the compiled bundle without parsing anything. The
+    # energies and values are read-only views of the memory-mapped bundle,
+    # whose pages every process reading it shares, and stopping_powers stays
+    # empty. Returns False if there is no up-to-date bundle or it has no
+    # table for this element.
+    def load_bundle(self):
+        bundle = datastore.StoppingPowerBundle.load(
+            STOPPING_POWER_BUNDLE, STOPPING_POWER_DIR
+        )
+        table = bundle.table(self.element_symbol) if bundle else None
+
+        if table is None:
+            return False
+
+        self.energies, self.values = table
+
+        return True
 
     def load_file(self):
-        file_path = f"./Data/StoppingPowers/{self.element_symbol.lower()}.dat"
-        file = open(file_path)
+        file = open(self.file_path())
 
         for data in [
             line.split() for line in file.readlines() if not line.startswith("#")
@@ -120,28 +328,16 @@ class StoppingPowerList:
 
             self.stopping_powers[energy] = stopping_power
 
-    # Use binary search to find energy in log(N) time
-    def for_alpha(self, alpha_energy):
-        energy_intervals = list(self.stopping_powers.keys())
-        min_energy = energy_intervals[0]
-        max_energy = energy_intervals[-1]
-
-        if alpha_energy < min_energy:
-            return self.stopping_powers[min_energy]
-        elif alpha_energy > max_energy:
-            return self.stopping_powers[max_energy]
-
-        range_end = bisect(energy_intervals, alpha_energy)
-        range_start = range_end - 1
+        file.close()
 
-        energy_start = energy_intervals[range_start]
-        energy_end = energy_intervals[range_end]
-        energy_diff = (alpha_energy - energy_start) / (energy_end - energy_start)
+        self.energies = numpy.array(sorted(self.stopping_powers))
+        self.values = numpy.array([self.stopping_powers[e] for e in self.energies])
 
-        stop_power_start = self.stopping_powers[energy_start]
-        stop_power_end = self.stopping_powers[energy_end]
-
-        return (stop_power_end - stop_power_start) * energy_diff + stop_power_start
+    # Linearly interpolates the stopping power at alpha_energy, which may be a
+    # single energy or an array of energies. Energies outside of the table are
+    # clamped to its first or last entry.
+    def for_alpha(self, alpha_energy):
+        return numpy.interp(alpha_energy, self.energies, self.values)
 
 
 class Composition:
@@ -185,9 +381,14 @@ class Composition:
     def __init__(self):
         self.materials = []
         self.fractions = {}
+        # For each entry added, the index in self.materials of each of its
+        # isotopes and that isotope's fraction per unit fraction of the entry
+        self.components = []
         self.stopping_powers = {}
+        self._stopping_power_tables = cache.LRUCache(max_entries=STOPPING_POWER_TABLES)
 
     def normalize(self):
+        self._stopping_power_tables.clear()
         norm = 0
 
         for material in self.materials:
@@ -205,10 +406,7 @@ class Composition:
         # Populates stopping powers from ./Data/StoppingPowers once so that
         # they don't need to be populated for every energy step
         for element in self.fractions:
-            stop_power_list = StoppingPowerList(element)
-            stop_power_list.load_file()
-
-            self.stopping_powers[element] = stop_power_list
+            self.stopping_powers[element] = StoppingPowerList.for_element(element)
 
     def empty(self):
         return len(self.materials) == 0
@@ -218,10 +416,15 @@ class Composition:
         mass_number = int(material_element["mass_number"])
         fraction = float(material_element["fraction"])
 
+        component = []
+
         # If a single mass number isn't specified, use all isotopes
         # along with their natural abundances
         if mass_number == 0:
             for isotope in element.isotopes():
+                component.append(
+                    (len(self.materials), element.abundance(isotope) / 100.0)
+                )
                 self.materials.append(
                     Isotope(
                         element,
@@ -233,6 +436,7 @@ class Composition:
         # Otherwise, if a single mass number is provided,
         # use the fraction provided
         else:
+            component.append((len(self.materials), 1 / 100.0))
             self.materials.append(
                 Isotope(
                     element,
@@ -241,7 +445,9 @@ class Composition:
                 )
             )
 
-    # Expects an alpha energy in units of MeV
+        self.components.append(component)
+
+    # Expects an alpha energy (or array of alpha energies) in units of MeV
     def stopping_power(self, e_alpha):
         total_stopping_power = 0
 
@@ -252,16 +458,76 @@ class Composition:
 
         return total_stopping_power
 
-    def download_data(self, version):
+    # Mixture stopping power (Bragg additivity) for every energy of an alpha
+    # grid, computed once per grid so that runs never interpolate per element
+    # inside their step loops
+    def stopping_power_table(self, energies):
+        energies = numpy.asarray(energies, dtype=float)
+        key = (len(energies), energies.tobytes())
+        table = self._stopping_power_tables.get(key)
+
+        if table is None:
+            table = numpy.zeros(len(energies)) + self.stopping_power(energies)
+            self._stopping_power_tables.put(key, table)
+
+        return table
+
+    # Stopping power of each element of the material, in the order of
+    # self.fractions and not weighted by its fraction, for every energy of an
+    # alpha grid. Returns an array of shape (elements, energies).
+    def element_stopping_power_table(self, energies):
+        energies = numpy.asarray(energies, dtype=float)
+
+        return numpy.array(
+            [
+                numpy.zeros(len(energies))
+                + self.stopping_powers[element].for_alpha(energies)
+                for element in self.fractions
+            ]
+        ).reshape((len(self.fractions), len(energies)))
+
+    def compile_data(self, dtype="float64"):
         for material in self.materials:
+            print(f"Compiling {dtype} data store for {material.name()}")
+            material.compile_data(dtype)
+
+        print(f"Compiling {dtype} stopping power bundle")
+        compile_stopping_powers(dtype)
+
+    # Downloads the datasets of every element with an isotope missing data,
+    # once per element and several elements at once (see neucbot.download).
+    # Elements that fail to download are reported and skipped, as with the
+    # download scripts, so the run goes on without their data.
+    def download_data(self, version, source=download.DEFAULT_SOURCE):
+        symbols = [
+            material.element.symbol
+            for material in self.materials
             if not (
                 os.listdir(material.talys_output_dir())
                 and os.listdir(material.talys_spectra_dir())
-            ):
-                print(
-                    f"Downloading (datset {version}) data for {material.element.symbol}"
-                )
-                bashcmd = (
-                    f"./Scripts/download_element_{version}.sh {material.element.symbol}"
-                )
-                process = subprocess.call(bashcmd, shell=True)
+            )
+        ]
+        symbols = list(dict.fromkeys(symbols))
+
+        if symbols:
+            print(f"Downloading (dataset {version}) data for {', '.join(symbols)}")
+            try:
+                download.download_elements(symbols, version, source)
+            except RuntimeError as error:
+                print(f"{error}, continuing without it")
+
+
+# Parses every table in STOPPING_POWER_DIR once and packs them into the bundle
+# read by StoppingPowerList.for_element
+def compile_stopping_powers(dtype="float64"):
+    stopping_power_lists = []
+
+    for file_name in sorted(os.listdir(STOPPING_POWER_DIR)):
+        if file_name.endswith(".dat"):
+            stop_power_list = StoppingPowerList(file_name[: -len(".dat")])
+            stop_power_list.load_file()
+            stopping_power_lists.append(stop_power_list)
+
+    return datastore.StoppingPowerBundle.compile(
+        stopping_power_lists, STOPPING_POWER_BUNDLE, dtype
+    )
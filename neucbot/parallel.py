@@ -0,0 +1,157 @@
+"""
+Splitting a run's (alpha step, isotope) contributions across processes.
+
+Every contribution NeucbotRunner.compute adds up is independent of the
+others, so the steps and isotopes can be cut into shards:
+
+  - "energy" shards hold contiguous ranges of alpha steps, for all isotopes
+  - "isotope" shards hold all alpha steps, for a group of isotopes
+
+Each worker process reads the isotopes' data itself and returns its shard's
+per-isotope cross sections and the neutron energies and values of its
+spectrum as arrays. Partial results are always added up in shard order, not
+in the order workers finish, so the same inputs give the same results on
+every run. They match the serial loop to rounding, since only the order of
+the additions differs.
+"""
+
+import os
+import numpy
+
+from neucbot import elements
+from neucbot import material
+from neucbot import talys
+
+
+# Splits range(count) into at most n_shards contiguous (start, stop) ranges
+# whose lengths differ by at most one
+def contiguous_ranges(count, n_shards):
+    n_shards = max(min(n_shards, count), 1)
+    bounds = [count * index // n_shards for index in range(n_shards + 1)]
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# Returns a list of (step_range, isotope_indices) shards
+def make_shards(n_steps, n_isotopes, n_shards, shard_by="energy"):
+    if shard_by == "energy":
+        return [
+            (step_range, list(range(n_isotopes)))
+            for step_range in contiguous_ranges(n_steps, n_shards)
+        ]
+    elif shard_by == "isotope":
+        return [
+            ((0, n_steps), list(range(start, stop)))
+            for start, stop in contiguous_ranges(n_isotopes, n_shards)
+        ]
+    else:
+        raise RuntimeError(f"Unknown shard kind {shard_by}")
+
+
+# Runs in a worker process. isotopes holds (symbol, mass_number, fraction)
+# for each isotope of the shard, and alphas and stopping_powers the shard's
+# condensed alpha steps and the material's stopping power at each of them.
+# Returns (cross_sections, bins, values).
+def compute_shard(isotopes_dir, isotopes, alphas, stopping_powers, step_size):
+    # Workers may not share the parent's working directory
+    talys.ISOTOPES_DIR = isotopes_dir
+
+    materials = [
+        material.Isotope(elements.Element(symbol), mass_number, fraction)
+        for symbol, mass_number, fraction in isotopes
+    ]
+    cross_sections = {}
+    spec_totals = {}
+
+    for (energy, intensity), stopping_power in zip(alphas, stopping_powers):
+        for isotope in materials:
+            mat_term = isotope.material_term()
+            mat_name = isotope.name()
+
+            spec = isotope.rebinned_n_spec(energy)
+
+            delta_ea = energy if step_size > energy else step_size
+            prefactors = (intensity / 100.0) * mat_term * delta_ea / stopping_power
+            xsect = prefactors * isotope.cross_section(energy)
+
+            cross_sections[mat_name] = cross_sections.get(mat_name, 0) + xsect
+
+            for e, value in spec.items():
+                spec_totals[e] = spec_totals.get(e, 0) + prefactors * value
+
+    bins = numpy.array(sorted(spec_totals), dtype=int)
+    values = numpy.array([spec_totals[e] for e in bins.tolist()], dtype=float)
+
+    return cross_sections, bins, values
+
+
+# Computes the same result dict as NeucbotRunner.compute with n_workers
+# processes, for data already on disk
+def compute(
+    condensed_alphas,
+    material_composition,
+    step_size,
+    n_workers,
+    shard_by="energy",
+    progress=True,
+):
+    from concurrent.futures import ProcessPoolExecutor
+    from tqdm import tqdm
+
+    materials = material_composition.materials
+    stopping_powers = material_composition.stopping_power_table(
+        [energy for energy, _ in condensed_alphas]
+    ).tolist()
+    alphas = [
+        [float(energy), float(intensity)] for energy, intensity in condensed_alphas
+    ]
+    isotopes = [
+        (isotope.element.symbol, isotope.mass_number, isotope.fraction)
+        for isotope in materials
+    ]
+    shards = make_shards(len(alphas), len(materials), n_workers, shard_by)
+
+    isotopes_dir = os.path.abspath(talys.ISOTOPES_DIR)
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(
+                compute_shard,
+                isotopes_dir,
+                [isotopes[index] for index in isotope_indices],
+                alphas[start:stop],
+                stopping_powers[start:stop],
+                step_size,
+            )
+            for (start, stop), isotope_indices in shards
+        ]
+
+        # Waiting on the futures in shard order keeps the reduction below
+        # independent of which worker finishes first
+        partials = [
+            future.result()
+            for future in tqdm(futures, disable=not progress, unit="shard")
+        ]
+
+    isotope_cross_sections = {}
+    spec_totals = {}
+
+    for shard_cross_sections, bins, values in partials:
+        for name, xsect in shard_cross_sections.items():
+            isotope_cross_sections[name] = isotope_cross_sections.get(name, 0) + xsect
+
+        for e, value in zip(bins.tolist(), values.tolist()):
+            spec_totals[e] = spec_totals.get(e, 0) + value
+
+    # Isotopes with the same name (listed twice in a composition) are summed
+    # into one entry, as in the serial loop
+    cross_sections = {
+        isotope.name(): isotope_cross_sections.get(isotope.name(), 0)
+        for isotope in materials
+    }
+
+    return {
+        "total_cross_section": sum(cross_sections.values()),
+        "cross_sections": cross_sections,
+        "spectra_totals": spec_totals,
+    }
@@ -0,0 +1,289 @@
+"""
+Profiling of NeuCBOT runs.
+
+A Profiler wraps the functions on NeuCBOT's hot paths while it is active and
+records, for each of them and for each phase of a run:
+
+  - the number of calls
+  - the total wall time, including anything called from inside it
+  - the self time, excluding the time spent in other profiled functions and
+    phases, so that e.g. the self time of the "compute" phase is the time
+    spent accumulating results in the runner itself
+
+It also counts the data files read (alpha lists, materials, stopping power
+tables, TALYS outputs and spectra, manifests, responses and cached results)
+and the bytes they hold, the compiled stores memory-mapped and their sizes,
+the hits and misses of the isotope data cache, and any counters added with
+count(). Only the pages of a mapped store that a run touches are read, so
+its size is an upper bound of the bytes read from it.
+
+  with profiling.Profiler() as profiler:
+      runner.run(alpha_list, material_composition)
+
+  profiler.write("profile.json")
+
+Phases are marked in the code with profiling.phase(name), which does nothing
+unless a Profiler is active. Work done in other processes (TALYS jobs and
+the workers of --engine parallel) is only timed as a whole.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import numpy
+
+from neucbot import alpha
+from neucbot import cache
+from neucbot import datastore
+from neucbot import manifest
+from neucbot import material
+from neucbot import parallel
+from neucbot import response
+from neucbot import result_cache
+from neucbot import talys
+from neucbot import utils
+
+# (owner, function name, file path getter) for every profiled function. The
+# getter returns the path of the data file the function parses, if any.
+TARGETS = [
+    (alpha.AlphaList, "load", lambda alpha_list: alpha_list.file_path),
+    (material.Composition, "from_file", lambda cls, file_path: file_path),
+    (material.Composition, "stopping_power", None),
+    (material.Composition, "stopping_power_table", None),
+    (
+        material.StoppingPowerList,
+        "load_file",
+        lambda stopping_power_list: stopping_power_list.file_path(),
+    ),
+    (material.Isotope, "cross_section", None),
+    (material.Isotope, "read_output_file", lambda isotope, file_path: file_path),
+    (material.Isotope, "differential_n_spec", None),
+    (material.Isotope, "read_spectra_file", lambda isotope, file_path: file_path),
+    (material.Isotope, "rebinned_n_spec", None),
+    (utils.Histogram, "rebin", None),
+    (datastore, "load", None),
+    (
+        manifest.EnergyManifest,
+        "refresh",
+        lambda energy_manifest: energy_manifest.file_path(),
+    ),
+    (response.Response, "load", lambda cls, file_path: file_path),
+    (result_cache, "load", result_cache.result_file),
+    (talys.Runner, "run", None),
+    (talys, "run_parallel", None),
+    (parallel, "compute", None),
+]
+
+# Compiled store classes. Stores are created from the array they are
+# memory-mapped from, or from an array in memory when they have just been
+# compiled, which is not counted.
+MAPPED_TARGETS = [
+    datastore.IsotopeDataStore,
+    datastore.RebinnedSpectraStore,
+    datastore.StoppingPowerBundle,
+]
+
+# The active Profiler, if any
+ACTIVE = None
+
+
+class Stat:
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "self_time": self.self_time,
+        }
+
+
+class Profiler:
+    def __init__(self):
+        self.phases = {}
+        self.functions = {}
+        self.counters = {}
+        self.files_opened = 0
+        self.bytes_read = 0
+        self.files_mapped = 0
+        self.bytes_mapped = 0
+        self.wall_time = 0.0
+        self.originals = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        global ACTIVE
+
+        if ACTIVE is not None:
+            raise RuntimeError("Another profiler is already active")
+
+        self.cache_stats = cache.ISOTOPE_DATA.stats()
+        self.install()
+        self.started = time.perf_counter()
+        ACTIVE = self
+
+    def stop(self):
+        global ACTIVE
+
+        self.wall_time += time.perf_counter() - self.started
+        self.uninstall()
+        self.cache_stats = self.cache_deltas(self.cache_stats)
+        ACTIVE = None
+
+    # Replaces every target with a timed wrapper, keeping the original so
+    # that uninstall can put it back
+    def install(self):
+        for owner, name, file_path_of in TARGETS:
+            original = vars(owner)[name]
+            if isinstance(owner, type):
+                label = f"{owner.__module__.split('.')[-1]}.{owner.__name__}.{name}"
+            else:
+                label = f"{owner.__name__.split('.')[-1]}.{name}"
+
+            if isinstance(original, classmethod):
+                wrapper = classmethod(self.wrap(original.__func__, label, file_path_of))
+            else:
+                wrapper = self.wrap(original, label, file_path_of)
+
+            self.originals.append((owner, name, original))
+            setattr(owner, name, wrapper)
+
+        for store_class in MAPPED_TARGETS:
+            original = vars(store_class)["__init__"]
+
+            self.originals.append((store_class, "__init__", original))
+            setattr(store_class, "__init__", self.wrap_mapped(original))
+
+    def uninstall(self):
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+
+        self.originals = []
+
+    def wrap(self, function, label, file_path_of):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if file_path_of:
+                self.record_file(file_path_of(*args, **kwargs))
+
+            with self.timer(self.functions, label):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def wrap_mapped(self, function):
+        @functools.wraps(function)
+        def wrapper(store, data):
+            if isinstance(data, numpy.memmap):
+                self.record_mapped(data)
+
+            return function(store, data)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def timer(self, stats, label):
+        stack = self.local.__dict__.setdefault("stack", [])
+        frame = [0.0]  # time spent in profiled calls made from this one
+        stack.append(frame)
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+
+            if stack:
+                stack[-1][0] += elapsed
+
+            with self.lock:
+                stat = stats.setdefault(label, Stat())
+                stat.calls += 1
+                stat.total_time += elapsed
+                stat.self_time += elapsed - frame[0]
+
+    def record_file(self, file_path):
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return
+
+        with self.lock:
+            self.files_opened += 1
+            self.bytes_read += size
+
+    def record_mapped(self, data):
+        with self.lock:
+            self.files_mapped += 1
+            self.bytes_mapped += os.path.getsize(data.filename)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def cache_deltas(self, before):
+        after = cache.ISOTOPE_DATA.stats()
+        hits = after["hits"] - before["hits"]
+        misses = after["misses"] - before["misses"]
+
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": after["evictions"] - before["evictions"],
+            "entries": after["entries"],
+            "bytes": after["bytes"],
+        }
+
+    def report(self):
+        return {
+            "wall_time": self.wall_time,
+            "phases": {label: stat.to_dict() for label, stat in self.phases.items()},
+            "functions": {
+                label: stat.to_dict()
+                for label, stat in sorted(
+                    self.functions.items(), key=lambda item: -item[1].total_time
+                )
+            },
+            "io": {
+                "files_opened": self.files_opened,
+                "bytes_read": self.bytes_read,
+                "files_mapped": self.files_mapped,
+                "bytes_mapped": self.bytes_mapped,
+            },
+            "caches": {"isotope_data": self.cache_stats},
+            "counters": dict(self.counters),
+        }
+
+    def write(self, file_path):
+        with open(file_path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+            file.write("\n")
+
+
+# Times a phase of a run when a Profiler is active
+def phase(name):
+    if ACTIVE is None:
+        return contextlib.nullcontext()
+
+    return ACTIVE.timer(ACTIVE.phases, name)
+
+
+def count(name, n=1):
+    if ACTIVE is not None:
+        ACTIVE.count(name, n)
@@ -0,0 +1,201 @@
+"""
+Thick-target response of a material composition.
+
+Each alpha step of NeucbotRunner.compute adds
+
+  (intensity / 100) * dE / S(E) * mat_term * sigma(E)
+
+for every isotope, where only the first factors depend on the alpha list. A
+response holds the rest, mat_term * sigma and the sum over isotopes of
+mat_term * rebinned spectrum, at every alpha energy NeuCBOT reads TALYS data
+for (0.01 MeV apart), so that evaluating any alpha list reduces to summing
+the alpha list's weights per grid energy and taking dot products with it.
+
+Responses are saved in RESPONSES_DIR/<key>.npz, where the key is a hash of
+the isotopes and their material terms, the output binning, the energy grid
+and a fingerprint of every file in the isotopes' data directories, so that a
+response is rebuilt whenever the composition or the underlying data change.
+"""
+
+import hashlib
+import json
+import os
+import numpy
+
+from neucbot import cache
+from neucbot import engine
+from neucbot import utils
+
+RESPONSES_DIR = "./Data/Responses"
+FORMAT_VERSION = 1
+
+# Responses cover at least alpha energies up to GRID_MAX_ENERGY (in MeV), and
+# are extended when an alpha list goes higher
+GRID_MAX_ENERGY = 10.0
+
+# Budget for the responses kept in memory, each holding a few dense (grid,
+# isotopes) and (grid, bins) arrays
+RESPONSES_MAX_BYTES = 256 * 1024 * 1024
+
+# Responses loaded or built in this process, keyed like the files
+RESPONSES = cache.LRUCache(RESPONSES_MAX_BYTES)
+
+
+# Index of the grid energy whose TALYS data NeuCBOT reads for alpha_energy,
+# truncated to 0.01 MeV as in Isotope.cross_section
+def grid_index(alpha_energy):
+    return numpy.trunc(100 * numpy.asarray(alpha_energy, dtype=float)).astype(int)
+
+
+def response_key(
+    material_composition,
+    max_index,
+    step=utils.HISTO_DELTA_BIN,
+    min_bin=utils.HISTO_MIN_BIN,
+    max_bin=utils.HISTO_MAX_BIN,
+):
+    isotopes = sorted(
+        [material.name(), repr(material.material_term())]
+        for material in material_composition.materials
+    )
+    data = sorted(
+        [material.name(), material.data_fingerprint()]
+        for material in material_composition.materials
+    )
+    inputs = {
+        "format": FORMAT_VERSION,
+        "isotopes": isotopes,
+        "data": data,
+        "binning": [step, min_bin, max_bin],
+        "max_index": max_index,
+    }
+
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+class Response:
+    # Row j of cross_sections, spectra and present holds the response at the
+    # alpha energy j / 100 MeV:
+    #   - cross_sections has shape (grid, isotopes), holding mat_term * sigma
+    #   - spectra has shape (grid, bins), holding the sum over isotopes of
+    #     mat_term * rebinned spectrum, with bins in keV
+    #   - present has the same shape as spectra, and marks the bins any
+    #     isotope's rebinned spectrum has an entry for
+    def __init__(self, names, cross_sections, bins, spectra, present):
+        self.names = names
+        self.cross_sections = cross_sections
+        self.bins = bins
+        self.spectra = spectra
+        self.present = present
+
+    def nbytes(self):
+        return (
+            self.cross_sections.nbytes
+            + self.bins.nbytes
+            + self.spectra.nbytes
+            + self.present.nbytes
+        )
+
+    @classmethod
+    def build(cls, material_composition, max_index, progress=True):
+        # Energies halfway between grid points truncate to the grid point in
+        # every TALYS data lookup
+        grid_alphas = [[(index + 0.5) / 100, 100.0] for index in range(max_index + 1)]
+
+        tensors = engine.YieldTensors.build(
+            grid_alphas, material_composition, 0.01, progress=progress
+        )
+
+        return cls(
+            [material.name() for material in material_composition.materials],
+            tensors.cross_sections * tensors.mat_terms,
+            tensors.bins,
+            numpy.einsum("sib,i->sb", tensors.spectra, tensors.mat_terms),
+            tensors.present.any(axis=1),
+        )
+
+    # Loads the response of material_composition covering energies up to
+    # max_energy (in MeV) from RESPONSES_DIR, or builds and saves it
+    @classmethod
+    def load_or_build(cls, material_composition, max_energy=0, progress=True):
+        max_index = int(grid_index(max(max_energy, GRID_MAX_ENERGY)))
+        key = response_key(material_composition, max_index)
+
+        response = RESPONSES.get(key)
+
+        if response is None:
+            file_path = os.path.join(RESPONSES_DIR, f"{key}.npz")
+
+            if os.path.exists(file_path):
+                response = cls.load(file_path)
+            else:
+                response = cls.build(material_composition, max_index, progress)
+                response.save(file_path)
+
+            RESPONSES.put(key, response)
+
+        return response
+
+    @classmethod
+    def load(cls, file_path):
+        with numpy.load(file_path) as data:
+            return cls(
+                data["names"].tolist(),
+                data["cross_sections"],
+                data["bins"],
+                data["spectra"],
+                data["present"],
+            )
+
+    # Writes to a temporary file first so that readers never see a partially
+    # written response
+    def save(self, file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_file_path = f"{file_path}.tmp"
+
+        with open(tmp_file_path, "wb") as file:
+            numpy.savez(
+                file,
+                names=numpy.array(self.names, dtype=str),
+                cross_sections=self.cross_sections,
+                bins=self.bins,
+                spectra=self.spectra,
+                present=self.present,
+            )
+
+        os.replace(tmp_file_path, file_path)
+
+    # Returns the same result dict as NeucbotRunner.compute for a condensed
+    # alpha list, given the material's stopping power at each alpha energy
+    def evaluate(self, condensed_alphas, stopping_powers, step_size):
+        energies = numpy.array([energy for energy, _ in condensed_alphas], dtype=float)
+        intensities = numpy.array(
+            [intensity for _, intensity in condensed_alphas], dtype=float
+        )
+        deltas = numpy.where(step_size > energies, energies, step_size)
+
+        # Total weight of the alpha list at each grid energy
+        weights = numpy.bincount(
+            grid_index(energies),
+            weights=(intensities / 100.0) * deltas / stopping_powers,
+            minlength=len(self.spectra),
+        )
+        visited = numpy.bincount(grid_index(energies), minlength=len(self.spectra)) > 0
+
+        isotope_cross_sections = weights @ self.cross_sections
+        spectra_totals = weights @ self.spectra
+        present = self.present[visited].any(axis=0)
+
+        cross_sections = {}
+        for name, xsect in zip(self.names, isotope_cross_sections):
+            cross_sections[name] = cross_sections.get(name, 0) + float(xsect)
+
+        return {
+            "total_cross_section": float(isotope_cross_sections.sum()),
+            "cross_sections": cross_sections,
+            "spectra_totals": {
+                int(e): float(value)
+                for e, value, is_present in zip(self.bins, spectra_totals, present)
+                if is_present
+            },
+        }
@@ -0,0 +1,93 @@
+"""
+On-disk cache of complete results.
+
+Results of NeucbotRunner.compute are saved as JSON in RESULTS_DIR/<key>.json,
+where the key is a hash of everything the result depends on:
+
+  - the condensed alpha list and step size
+  - the normalized element fractions, and each isotope's material term
+  - the output histogram binning
+  - whether TALYS may be run for missing reactions
+  - a fingerprint of every file in the isotopes' data directories, and of
+    the stopping power table of every element
+
+Any change to the inputs or data gives a new key, so stale results are never
+returned. Old result files are never read again once their data changes, and
+can be deleted at any time.
+"""
+
+import hashlib
+import json
+import os
+
+from neucbot import utils
+
+RESULTS_DIR = "./Data/Results"
+FORMAT_VERSION = 1
+
+
+def result_key(condensed_alphas, material_composition, step_size, run_talys=False):
+    stopping_power_files = []
+    for element, stopping_powers in sorted(
+        material_composition.stopping_powers.items()
+    ):
+        stat = os.stat(stopping_powers.file_path())
+        stopping_power_files.append([element, stat.st_size, stat.st_mtime_ns])
+
+    inputs = {
+        "format": FORMAT_VERSION,
+        "alphas": [
+            [float(energy), float(intensity)] for energy, intensity in condensed_alphas
+        ],
+        "step_size": step_size,
+        "fractions": sorted(
+            [element, repr(fraction)]
+            for element, fraction in material_composition.fractions.items()
+        ),
+        "isotopes": [
+            [material.name(), repr(material.material_term())]
+            for material in material_composition.materials
+        ],
+        "binning": [utils.HISTO_DELTA_BIN, utils.HISTO_MIN_BIN, utils.HISTO_MAX_BIN],
+        "run_talys": bool(run_talys),
+        "isotope_data": [
+            [material.name(), material.data_fingerprint()]
+            for material in material_composition.materials
+        ],
+        "stopping_powers": stopping_power_files,
+    }
+
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+def result_file(key):
+    return os.path.join(RESULTS_DIR, f"{key}.json")
+
+
+# Returns the stored result dict for key, or None if there is none
+def load(key):
+    try:
+        with open(result_file(key)) as file:
+            results = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    results["spectra_totals"] = {
+        int(e): value for e, value in results["spectra_totals"].items()
+    }
+
+    return results
+
+
+# Writes to a temporary file first so that readers never see a partially
+# written result
+def save(key, results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    file_path = result_file(key)
+    tmp_file_path = f"{file_path}.tmp"
+
+    with open(tmp_file_path, "w") as file:
+        json.dump(results, file)
+
+    os.replace(tmp_file_path, file_path)
@@ -1,6 +1,16 @@
-from tqdm import tqdm
+from neucbot import adaptive
 from neucbot import alpha
+from neucbot import chain
+from neucbot import checkpoint
 from neucbot import config
+from neucbot import engine
+from neucbot import ensemble
+from neucbot import manifest
+from neucbot import parallel
+from neucbot import profiling
+from neucbot import response
+from neucbot import result_cache
+from neucbot import sweep
 from neucbot import talys
 from neucbot import utils
 
@@ -12,25 +22,197 @@ class NeucbotRunner:
         self.config = cfg
 
     def run(self, alpha_list, material_composition, step_size=ALPHA_STEP):
+        with profiling.phase("condense"):
+            condensed_alphas = alpha_list.condense(step_size)
+
+        report = None
+
+        if self.config.adaptive_tolerance is not None:
+            with profiling.phase("adaptive_stepping"):
+                condensed_alphas, report = adaptive.AdaptiveStepper(
+                    material_composition, self.config.adaptive_tolerance, step_size
+                ).refine(condensed_alphas)
+            self.log(adaptive.format_report(report))
+
+        if not self.config.quiet:
+            self.report_coverage(condensed_alphas, material_composition)
+
+        with profiling.phase("compute"):
+            results = self.cached_compute(
+                condensed_alphas, material_composition, step_size
+            )
+
+        if report is not None:
+            results["adaptive"] = report
+
+        if not self.config.quiet:
+            with profiling.phase("print_outputs"):
+                self.print_outputs(
+                    results["total_cross_section"],
+                    results["cross_sections"],
+                    results["spectra_totals"],
+                )
+
+        return results
+
+    # Evaluates every realization of an uncertainty ensemble (see
+    # neucbot.ensemble) in one pass over the isotope data, and prints their
+    # summary instead of the spectrum
+    def run_ensemble(
+        self, alpha_list, material_composition, spec, step_size=ALPHA_STEP
+    ):
+        with profiling.phase("ensemble"):
+            results = ensemble.run(
+                alpha_list,
+                material_composition,
+                spec,
+                step_size,
+                self.config.talys,
+                self.config.force_recalculation,
+                progress=not self.config.quiet,
+            )
+
+        if not self.config.quiet:
+            with profiling.phase("print_outputs"):
+                ensemble.print_summary(results, self.config.output)
+
+        return results
+
+    # Evaluates the alpha list for every composition of a sweep (see
+    # neucbot.sweep), reading the isotope data once, and prints a table of
+    # the yields of each point instead of the spectrum
+    def run_sweep(
+        self, alpha_list, material_composition, fraction_vectors, step_size=ALPHA_STEP
+    ):
+        with profiling.phase("condense"):
+            condensed_alphas = alpha_list.condense(step_size)
+
+        if not self.config.quiet:
+            self.report_coverage(condensed_alphas, material_composition)
+
+        with profiling.phase("sweep"):
+            results = sweep.run(
+                condensed_alphas,
+                material_composition,
+                fraction_vectors,
+                step_size,
+                self.config.talys,
+                self.config.force_recalculation,
+                progress=not self.config.quiet,
+            )
+
+        if not self.config.quiet:
+            with profiling.phase("print_outputs"):
+                sweep.print_table(results, self.config.output)
+
+        return results
+
+    # Computes the yields of each member of a decay chain apart (see
+    # neucbot.chain), and prints them along with the yields of every point of
+    # activity ratios instead of the spectrum
+    def run_chain(
+        self, chain_alpha_list, material_composition, ratio_points, step_size=ALPHA_STEP
+    ):
+        with profiling.phase("chain"):
+            member_yields, results = chain.run(
+                chain_alpha_list,
+                material_composition,
+                ratio_points,
+                step_size,
+                self.config.talys,
+                self.config.force_recalculation,
+                progress=not self.config.quiet,
+            )
+
+        if not self.config.quiet:
+            with profiling.phase("print_outputs"):
+                chain.print_tables(member_yields, results, self.config.output)
+
+        return member_yields, results
+
+    # Same as compute, but first looks for a stored result of the same inputs
+    # and data in the result cache (see neucbot.result_cache) when enabled
+    def cached_compute(
+        self, condensed_alphas, material_composition, step_size=ALPHA_STEP
+    ):
+        if not self.config.cache_results:
+            return self.compute(condensed_alphas, material_composition, step_size)
+
+        # Recalculations and streams need the steps to actually run
+        if not (self.config.force_recalculation or self.config.stream):
+            key = result_cache.result_key(
+                condensed_alphas, material_composition, step_size, self.config.talys
+            )
+
+            if (results := result_cache.load(key)) is not None:
+                profiling.count("result_cache.hits")
+                self.log(f"Using cached results from {result_cache.result_file(key)}")
+                return results
+
+            profiling.count("result_cache.misses")
+
+        results = self.compute(condensed_alphas, material_composition, step_size)
+
+        # TALYS may have added data during the run, which changes the key
+        key = result_cache.result_key(
+            condensed_alphas, material_composition, step_size, self.config.talys
+        )
+        result_cache.save(key, results)
+
+        return results
+
+    # Computes the yields for an already condensed alpha list, without
+    # printing any output
+    def compute(self, condensed_alphas, material_composition, step_size=ALPHA_STEP):
         run_talys = self.config.talys
-        force_recalc = self.config.force_recalculation
-        print("Running alphas:")
+        force_recalc = self.prepare_talys(condensed_alphas, material_composition)
+        self.log("Running alphas:")
 
         spec_totals = {}
         cross_sections = {}
         total_cross_section = 0
+        start = 0
+
+        checkpoint_file = None
+        if self.config.checkpoint:
+            checkpoint_file = checkpoint.Checkpoint(
+                self.config.checkpoint,
+                checkpoint.input_key(condensed_alphas, material_composition, step_size),
+                len(condensed_alphas),
+            )
+
+            if self.config.resume and (state := checkpoint_file.load()):
+                start, total_cross_section, cross_sections, spec_totals = state
+                self.log(f"Resuming from step {start} of {len(condensed_alphas)}")
 
-        for [energy, intensity] in tqdm(alpha_list.condense(step_size)):
-            stopping_power = material_composition.stopping_power(energy)
+        stream = None
+        if self.config.stream:
+            stream = checkpoint.Stream(self.config.stream, start)
+
+        stopping_powers = material_composition.stopping_power_table(
+            [energy for energy, _ in condensed_alphas]
+        ).tolist()
+
+        # Imported here to keep start up fast for runs that never get here
+        from tqdm import tqdm
+
+        for step in tqdm(
+            range(start, len(condensed_alphas)),
+            total=len(condensed_alphas),
+            initial=start,
+            disable=self.config.quiet,
+        ):
+            energy, intensity = condensed_alphas[step]
+            stopping_power = stopping_powers[step]
+            step_cross_sections = {}
+            step_spectrum = {}
 
             for material in material_composition.materials:
                 mat_term = material.material_term()
                 mat_name = material.name()
 
                 # Get alpha n spectrum for this alpha and this target
-                spec = material.differential_n_spec(
-                    energy, run_talys, force_recalc
-                ).rebin()
+                spec = material.rebinned_n_spec(energy, run_talys, force_recalc)
 
                 # Add this spectrum to the total spectrum
                 delta_ea = energy if step_size > energy else step_size
@@ -40,10 +222,33 @@ class NeucbotRunner:
 
                 cross_sections[mat_name] = cross_sections.get(mat_name, 0) + xsect
 
-                for e in spec.keys():
-                    spec_totals[e] = spec_totals.get(e, 0) + prefactors * spec.get(e)
+                for e, value in spec.items():
+                    spec_totals[e] = spec_totals.get(e, 0) + prefactors * value
+
+                if stream:
+                    step_cross_sections[mat_name] = (
+                        step_cross_sections.get(mat_name, 0) + xsect
+                    )
+
+                    for e, value in spec.items():
+                        step_spectrum[e] = step_spectrum.get(e, 0) + prefactors * value
 
-        self.print_outputs(total_cross_section, cross_sections, spec_totals)
+            if stream:
+                stream.write(
+                    step, energy, intensity, step_cross_sections, step_spectrum
+                )
+
+            completed_steps = step + 1
+            if checkpoint_file and (
+                completed_steps % self.config.checkpoint_interval == 0
+                or completed_steps == len(condensed_alphas)
+            ):
+                checkpoint_file.save(
+                    completed_steps, total_cross_section, cross_sections, spec_totals
+                )
+
+        if stream:
+            stream.close()
 
         return {
             "total_cross_section": total_cross_section,
@@ -51,6 +256,72 @@ class NeucbotRunner:
             "spectra_totals": spec_totals,
         }
 
+    # Lists the alpha energies of the run that an isotope has no TALYS data
+    # for, before any time is spent on the run
+    def report_coverage(self, condensed_alphas, material_composition):
+        energies = {int(100 * energy) / 100.0 for energy, _ in condensed_alphas}
+
+        for material in material_composition.materials:
+            if gaps := material.energy_manifest().gaps(energies):
+                self.log(
+                    f"{material.name()} has no TALYS data for {len(gaps)} of "
+                    f"{len(energies)} alpha energies: {manifest.format_ranges(gaps)}"
+                )
+
+    def log(self, message):
+        if not self.config.quiet:
+            print(message)
+
+    # When running TALYS with several jobs, fills in every missing (isotope,
+    # energy) pair concurrently before the main loop. Returns whether the main
+    # loop still has to force recalculation of TALYS outputs.
+    def prepare_talys(self, condensed_alphas, material_composition):
+        force_recalc = self.config.force_recalculation
+
+        if not self.config.talys or self.config.jobs < 2:
+            return force_recalc
+
+        energies = [energy for energy, _ in condensed_alphas]
+        missing_energies = [
+            material.missing_talys_energies(energies, force_recalc)
+            for material in material_composition.materials
+        ]
+        jobs = {
+            (material.element.symbol, material.mass_number, rounded_energy)
+            for material, rounded_energies in zip(
+                material_composition.materials, missing_energies
+            )
+            for rounded_energy in rounded_energies
+        }
+
+        self.log(
+            f"Running TALYS for {len(jobs)} energies with {self.config.jobs} jobs:"
+        )
+        failed_jobs = talys.run_parallel(
+            sorted(jobs), self.config.jobs, self.config.quiet
+        )
+
+        # TALYS ran in other processes, so drop anything this process has
+        # already read for the recalculated energies
+        for material, rounded_energies in zip(
+            material_composition.materials, missing_energies
+        ):
+            material.reset_talys_data(rounded_energies)
+
+        # Failed jobs may have left older outputs in place, which the main
+        # loop would not recalculate, so they are run again here, serially
+        if failed_jobs:
+            self.log(f"Running {len(failed_jobs)} failed TALYS jobs serially:")
+
+            isotopes = {
+                (material.element.symbol, material.mass_number): material
+                for material in material_composition.materials
+            }
+            for element, mass_number, rounded_energy in failed_jobs:
+                isotopes[(element, mass_number)].run_talys(rounded_energy)
+
+        return False
+
     def print_outputs(self, total_cross_section, cross_sections, spectra_totals):
         output_file = self.config.output
 
@@ -71,3 +342,111 @@ class NeucbotRunner:
 
         for e in sorted(spectra_totals):
             print(e, utils.format_float(spectra_totals[e]), file=output_file)
+
+
+class VectorizedNeucbotRunner(NeucbotRunner):
+    # Computes the same sums as NeucbotRunner.compute, but gathers every cross
+    # section and rebinned spectrum into (step x isotope [x bin]) arrays first,
+    # so that the accumulation over steps and isotopes is a few array
+    # contractions instead of nested dict updates
+    def compute(self, condensed_alphas, material_composition, step_size=ALPHA_STEP):
+        # Checkpoints and streams need the sums after every step, which only
+        # the step-by-step loop produces
+        if self.config.checkpoint or self.config.stream:
+            return super().compute(condensed_alphas, material_composition, step_size)
+
+        force_recalc = self.prepare_talys(condensed_alphas, material_composition)
+        self.log("Running alphas:")
+
+        tensors = engine.YieldTensors.build(
+            condensed_alphas,
+            material_composition,
+            step_size,
+            self.config.talys,
+            force_recalc,
+            progress=not self.config.quiet,
+        )
+
+        return tensors.contract()
+
+
+class ResponseNeucbotRunner(NeucbotRunner):
+    # Evaluates the alpha list against the material's precomputed response
+    # (see neucbot.response), which is built once per composition and data
+    # set, covering every alpha energy TALYS data is read for
+    def compute(self, condensed_alphas, material_composition, step_size=ALPHA_STEP):
+        force_recalc = self.prepare_talys(condensed_alphas, material_composition)
+
+        # Checkpoints and streams need the sums after every step, and TALYS
+        # runs for single energies happen inside the step-by-step loop
+        if (
+            self.config.checkpoint
+            or self.config.stream
+            or force_recalc
+            or (self.config.talys and self.config.jobs < 2)
+        ):
+            return super().compute(condensed_alphas, material_composition, step_size)
+
+        energies = [energy for energy, _ in condensed_alphas]
+
+        self.log("Loading material response:")
+        material_response = response.Response.load_or_build(
+            material_composition,
+            max(energies),
+            progress=not self.config.quiet,
+        )
+
+        results = material_response.evaluate(
+            condensed_alphas,
+            material_composition.stopping_power_table(energies),
+            step_size,
+        )
+
+        # List isotopes in the order of the composition, which may differ
+        # from the order of a response shared with an equivalent composition
+        results["cross_sections"] = {
+            material.name(): results["cross_sections"][material.name()]
+            for material in material_composition.materials
+        }
+
+        return results
+
+
+class ParallelNeucbotRunner(NeucbotRunner):
+    # Splits the steps and isotopes into shards computed by a pool of
+    # config.jobs processes (see neucbot.parallel)
+    def compute(self, condensed_alphas, material_composition, step_size=ALPHA_STEP):
+        # Checkpoints and streams need the sums after every step, and TALYS
+        # runs already use the jobs through prepare_talys
+        if (
+            self.config.checkpoint
+            or self.config.stream
+            or self.config.talys
+            or self.config.jobs < 2
+        ):
+            return super().compute(condensed_alphas, material_composition, step_size)
+
+        self.log(
+            f"Running alphas with {self.config.jobs} jobs, sharded by {self.config.shard_by}:"
+        )
+
+        return parallel.compute(
+            condensed_alphas,
+            material_composition,
+            step_size,
+            self.config.jobs,
+            self.config.shard_by,
+            progress=not self.config.quiet,
+        )
+
+
+ENGINES = {
+    "loop": NeucbotRunner,
+    "vectorized": VectorizedNeucbotRunner,
+    "response": ResponseNeucbotRunner,
+    "parallel": ParallelNeucbotRunner,
+}
+
+
+def create_runner(cfg):
+    return ENGINES.get(cfg.engine, NeucbotRunner)(cfg)
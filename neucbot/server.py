@@ -0,0 +1,185 @@
+"""
+Local HTTP service for running NeuCBOT without starting a new process per
+calculation.
+
+  POST /run      computes (alpha,n) yields for one alpha list and composition
+  GET  /health   reports worker and cache statistics
+
+A /run request body has the form:
+
+  {
+    "alpha_list": {"element": "Bi", "isotope": 212, "alphas": {"6.05078": 69.91, ...}},
+    "composition": {"elements": [{"element": "C", "mass_number": 0, "fraction": 33}, ...]},
+    "step_size": 0.01,
+    "engine": "loop"
+  }
+
+where alpha_list and composition are passed to AlphaList.from_json and
+Composition.from_json, and step_size and engine are optional. The response
+holds the dict returned by NeucbotRunner.run, with neutron energies in
+spectra_totals as string keys, since JSON object keys are always strings.
+
+Isotope data (cache.ISOTOPE_DATA and compiled stores), stopping power tables,
+compositions and condensed alpha lists stay in memory between requests.
+Nothing is printed to stdout.
+"""
+
+import json
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from neucbot import cache
+from neucbot import config
+from neucbot import runner
+from neucbot.alpha import AlphaList
+from neucbot.material import Composition
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8011
+DEFAULT_STEP_SIZE = 0.01
+
+# Budget for compositions and condensed alpha lists kept between requests.
+# A Composition's size can't be estimated (its isotopes and stopping powers
+# are shared with the process-wide caches), so both are bounded by count.
+MEMO_MAX_BYTES = 64 * 1024 * 1024
+MEMO_MAX_ENTRIES = 128
+
+
+class RequestError(RuntimeError):
+    pass
+
+
+class NeucbotService:
+    def __init__(self, workers=1, engine="loop"):
+        self.engine = engine
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.workers = workers
+        self.compositions = cache.LRUCache(MEMO_MAX_BYTES, MEMO_MAX_ENTRIES)
+        self.condensed_alphas = cache.LRUCache(MEMO_MAX_BYTES, MEMO_MAX_ENTRIES)
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    # JSON requests describing the same composition or alpha list map to the
+    # same key regardless of key order
+    def memo_key(self, request_json):
+        return json.dumps(request_json, sort_keys=True)
+
+    def composition(self, composition_json):
+        key = self.memo_key(composition_json)
+        composition = self.compositions.get(key)
+
+        if composition is None:
+            composition = Composition.from_json(composition_json)
+            self.compositions.put(key, composition)
+
+        return composition
+
+    def condense(self, alpha_list_json, step_size):
+        key = (self.memo_key(alpha_list_json), step_size)
+        condensed_alphas = self.condensed_alphas.get(key)
+
+        if condensed_alphas is None:
+            condensed_alphas = AlphaList.from_json(alpha_list_json).condense(step_size)
+            self.condensed_alphas.put(key, condensed_alphas)
+
+        return condensed_alphas
+
+    def parse(self, request_json):
+        try:
+            step_size = float(request_json.get("step_size", DEFAULT_STEP_SIZE))
+            engine = request_json.get("engine", self.engine)
+
+            if step_size <= 0:
+                raise RequestError("step_size must be positive")
+            if engine not in runner.ENGINES:
+                raise RequestError(f"Unknown engine {engine}")
+
+            composition = self.composition(request_json["composition"])
+            condensed_alphas = self.condense(request_json["alpha_list"], step_size)
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+            raise RequestError(f"Invalid request: {error!r}")
+
+        return condensed_alphas, composition, step_size, engine
+
+    def compute(self, condensed_alphas, composition, step_size, engine):
+        cfg = config.Config({"engine": engine, "quiet": True})
+
+        return runner.create_runner(cfg).compute(
+            condensed_alphas, composition, step_size
+        )
+
+    # Runs one request on the worker pool and waits for its result
+    def run(self, request_json):
+        with self.lock:
+            self.requests += 1
+
+        try:
+            return self.pool.submit(self.compute, *self.parse(request_json)).result()
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            raise
+
+    def health(self):
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "requests": self.requests,
+            "errors": self.errors,
+            "isotope_data": cache.ISOTOPE_DATA.stats(),
+            "compositions": self.compositions.stats(),
+            "condensed_alphas": self.condensed_alphas.stats(),
+        }
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/health":
+            self.respond(200, self.server.service.health())
+        else:
+            self.respond(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/run":
+            self.respond(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request_json = json.loads(self.rfile.read(length))
+            self.respond(200, self.server.service.run(request_json))
+        except (RequestError, json.JSONDecodeError) as error:
+            self.respond(400, {"error": str(error)})
+        except Exception as error:
+            self.respond(500, {"error": str(error)})
+
+    def respond(self, status, body):
+        content = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    # Access logs would otherwise be written to stderr for every request
+    def log_message(self, format, *args):
+        pass
+
+
+class NeucbotServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), RequestHandler)
+        self.service = service
+
+    def server_close(self):
+        super().server_close()
+        self.service.shutdown()
@@ -0,0 +1,178 @@
+"""
+Composition sweeps: the same alpha list evaluated for many variations of a
+material's composition.
+
+A sweep file holds one point per line, each a list of fractions with one
+fraction per entry (line) of the material composition file, in the same
+units and order. Lines starting with a # are skipped. For a material of
+carbon, oxygen and hydrogen, scanning the hydrogen content:
+
+  # c  o   h
+  50   25  25
+  50   25  20
+  50   25  15
+
+Only the isotope fractions change between points, and with them each
+isotope's material term and the mixture stopping power. The cross sections
+and neutron spectra of every (alpha step, isotope) pair are read once, into
+engine.YieldTensors, and every point only recombines them with its own
+weights. Results match independent runs of each composition to rounding.
+"""
+
+import copy
+import numpy
+
+from neucbot import engine
+from neucbot import material
+from neucbot import utils
+
+
+def read_fractions(file_path):
+    fraction_vectors = []
+
+    with open(file_path) as file:
+        for line in file.readlines():
+            if line.startswith("#") or not line.split():
+                continue
+
+            fraction_vectors.append([float(fraction) for fraction in line.split()])
+
+    return fraction_vectors
+
+
+def check_fractions(fractions, n_components):
+    if len(fractions) != n_components:
+        raise RuntimeError(
+            f"Sweep points need {n_components} fractions, got {len(fractions)}"
+        )
+
+    if any(fraction < 0 for fraction in fractions):
+        raise RuntimeError("Sweep fractions must not be negative")
+
+    if sum(fractions) <= 0:
+        raise RuntimeError("Sweep points need a nonzero fraction")
+
+
+class Sweep:
+    def __init__(self, tensors, material_composition):
+        materials = material_composition.materials
+        symbols = list(material_composition.fractions)
+
+        self.tensors = tensors
+        self.mass_numbers = numpy.array(
+            [isotope.mass_number for isotope in materials], dtype=float
+        )
+
+        # Isotope fractions per unit fraction of each entry, and the element
+        # of each isotope, with shapes (entries, isotopes) and (isotopes,
+        # elements)
+        self.component_weights = numpy.zeros(
+            (len(material_composition.components), len(materials))
+        )
+        for row, component in enumerate(material_composition.components):
+            for index, weight in component:
+                self.component_weights[row, index] = weight
+
+        self.isotope_elements = numpy.zeros((len(materials), len(symbols)))
+        for index, isotope in enumerate(materials):
+            self.isotope_elements[index, symbols.index(isotope.element.symbol)] = 1
+
+        self.element_stopping_powers = (
+            material_composition.element_stopping_power_table(tensors.energies)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        condensed_alphas,
+        material_composition,
+        step_size,
+        run_talys=False,
+        force_recalculation=False,
+        progress=True,
+    ):
+        tensors = engine.YieldTensors.build(
+            condensed_alphas,
+            material_composition,
+            step_size,
+            run_talys,
+            force_recalculation,
+            progress,
+        )
+
+        return cls(tensors, material_composition)
+
+    # Normalized isotope fractions for the given entry fractions, as
+    # Composition.normalize computes them
+    def isotope_fractions(self, fractions):
+        check_fractions(fractions, len(self.component_weights))
+
+        weights = self.component_weights
+        isotope_fractions = numpy.asarray(fractions, dtype=float) @ weights
+
+        return isotope_fractions / isotope_fractions.sum()
+
+    # The tensors of the material with the given entry fractions. Only the
+    # material terms and stopping powers differ from the swept composition.
+    def point(self, fractions):
+        isotope_fractions = self.isotope_fractions(fractions)
+        element_fractions = isotope_fractions @ self.isotope_elements
+
+        tensors = copy.copy(self.tensors)
+        tensors.mat_terms = (material.N_A * isotope_fractions) / self.mass_numbers
+        tensors.stopping_powers = element_fractions @ self.element_stopping_powers
+
+        return tensors
+
+    def evaluate(self, fractions):
+        results = self.point(fractions).contract()
+        results["fractions"] = [float(fraction) for fraction in fractions]
+
+        return results
+
+
+# Runs a sweep over the given fraction vectors. Returns one result dict per
+# point, as computed by the runners, with the fractions of the point added.
+def run(
+    condensed_alphas,
+    material_composition,
+    fraction_vectors,
+    step_size,
+    run_talys=False,
+    force_recalculation=False,
+    progress=True,
+):
+    # Checked before any isotope data is read
+    for fractions in fraction_vectors:
+        check_fractions(fractions, len(material_composition.components))
+
+    sweep = Sweep.build(
+        condensed_alphas,
+        material_composition,
+        step_size,
+        run_talys,
+        force_recalculation,
+        progress,
+    )
+
+    return [sweep.evaluate(fractions) for fractions in fraction_vectors]
+
+
+# Prints one line per point: its fractions, total neutron yield and the yield
+# of each isotope
+def print_table(results, output_file):
+    names = list(results[0]["cross_sections"]) if results else []
+
+    print("", file=output_file)
+    print(f"# Composition sweep of {len(results)} points", file=output_file)
+    print(f"# fractions total {' '.join(names)} (n/decay)", file=output_file)
+
+    for point in results:
+        print(
+            " ".join(f"{fraction:g}" for fraction in point["fractions"]),
+            utils.format_float(point["total_cross_section"]),
+            " ".join(
+                utils.format_float(point["cross_sections"][name]) for name in names
+            ),
+            file=output_file,
+        )
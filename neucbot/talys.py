@@ -1,6 +1,8 @@
 import glob
 import os
+import shutil
 import subprocess
+import tempfile
 
 from string import Template
 
@@ -26,12 +28,13 @@ elwidth 0.2
 
 
 class Runner:
-    def __init__(self, element, mass_number):
+    def __init__(self, element, mass_number, isotopes_dir=None):
         iso = element + str(mass_number)
-        base_path = os.path.join(ISOTOPES_DIR, element, iso)
+        base_path = os.path.join(isotopes_dir or ISOTOPES_DIR, element, iso)
 
         self.element = element
         self.mass_number = mass_number
+        self.base_path = base_path
         self.input_dir = os.path.join(base_path, "TalysInputs")
         self.output_dir = os.path.join(base_path, "TalysOut")
         self.spectra_dir = os.path.join(base_path, "NSpectra")
@@ -41,21 +44,15 @@ class Runner:
         os.makedirs(self.spectra_dir, exist_ok=True)
 
     def run(self, alpha_energy):
-        input_file_path = self.input_file(alpha_energy)
+        input_file_path = self.write_input_file(alpha_energy)
         output_file_path = self.output_file(alpha_energy)
 
-        # Write talys input file
-        input_file = open(input_file_path, "w")
-        input_file.write(
-            command_template.substitute(
-                element=self.element,
-                mass_number=self.mass_number,
-                alpha_energy=alpha_energy,
-            )
-        )
-        input_file.close()
-
-        talys_command = f"talys < {input_file_path} > {output_file_path}"
+        # TALYS writes to a file outside TalysOut/, moved there with
+        # os.replace once complete, so that a failed run never leaves a
+        # partial output behind and every new output changes the directory's
+        # modification time (see neucbot.manifest)
+        partial_output_path = self.partial_file(f"outputE{alpha_energy}")
+        talys_command = f"talys < {input_file_path} > {partial_output_path}"
 
         # Run talys command to generate files
         result = subprocess.call(talys_command, shell=True)
@@ -64,8 +61,13 @@ class Runner:
         if result == 0:
             print(f"Successfully ran command: {talys_command}")
         else:
+            if os.path.exists(partial_output_path):
+                os.remove(partial_output_path)
+
             raise RuntimeError(f"Failed TALYS command: {talys_command}")
 
+        os.replace(partial_output_path, output_file_path)
+
         # Move TALYS files to expected output
         generated_nspec_files = glob.glob(".*nspec.*")
         nspec_file_path = self.spectra_file(alpha_energy)
@@ -73,10 +75,70 @@ class Runner:
         if generated_nspec_files and len(generated_nspec_files) == 1:
             os.replace(generated_nspec_files[0], nspec_file_path)
         else:
-            nspec_file = open(nspec_file_path, "w")
+            partial_nspec_path = self.partial_file(os.path.basename(nspec_file_path))
+            nspec_file = open(partial_nspec_path, "w")
             nspec_file.write("EMPTY")
             nspec_file.close()
 
+            os.replace(partial_nspec_path, nspec_file_path)
+
+    # Path next to the TALYS data directories for a file still being written
+    def partial_file(self, file_name):
+        return os.path.join(self.base_path, f".{file_name}.part")
+
+    # Runs TALYS inside a private scratch directory so that concurrent runs
+    # never pick up each other's spectra files. Outputs are moved into
+    # TalysOut/ and NSpectra/ with os.replace, so readers only ever see
+    # complete files.
+    def run_in_scratch_dir(self, alpha_energy):
+        input_file_path = os.path.abspath(self.write_input_file(alpha_energy))
+        scratch_dir = tempfile.mkdtemp(
+            prefix=f"TalysScratch{alpha_energy}-", dir=self.base_path
+        )
+
+        try:
+            scratch_output_path = os.path.join(scratch_dir, "output")
+            talys_command = f"talys < {input_file_path} > {scratch_output_path}"
+
+            result = subprocess.call(talys_command, shell=True, cwd=scratch_dir)
+
+            if result != 0:
+                raise RuntimeError(f"Failed TALYS command: {talys_command}")
+
+            # Only this run writes to the scratch directory, so any spectra
+            # file found in it belongs to this alpha energy
+            generated_nspec_files = glob.glob(
+                os.path.join(scratch_dir, "*nspec*")
+            ) + glob.glob(os.path.join(scratch_dir, ".*nspec*"))
+
+            if len(generated_nspec_files) == 1:
+                scratch_nspec_path = generated_nspec_files[0]
+            else:
+                scratch_nspec_path = os.path.join(scratch_dir, "EMPTY")
+                nspec_file = open(scratch_nspec_path, "w")
+                nspec_file.write("EMPTY")
+                nspec_file.close()
+
+            os.replace(scratch_output_path, self.output_file(alpha_energy))
+            os.replace(scratch_nspec_path, self.spectra_file(alpha_energy))
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    def write_input_file(self, alpha_energy):
+        input_file_path = self.input_file(alpha_energy)
+
+        input_file = open(input_file_path, "w")
+        input_file.write(
+            command_template.substitute(
+                element=self.element,
+                mass_number=self.mass_number,
+                alpha_energy=alpha_energy,
+            )
+        )
+        input_file.close()
+
+        return input_file_path
+
     def talys_output_dir(self):
         return self.output_dir
 
@@ -93,3 +155,44 @@ class Runner:
         return os.path.join(
             self.spectra_dir, "nspec{0:0>7.3f}.tot".format(alpha_energy)
         )
+
+    def compiled_file(self):
+        return os.path.join(self.base_path, "compiled.npy")
+
+    def rebinned_file(self, step, min_bin, max_bin):
+        return os.path.join(self.base_path, f"rebinned_{step}_{min_bin}_{max_bin}.npy")
+
+
+def run_job(isotopes_dir, element, mass_number, alpha_energy):
+    Runner(element, mass_number, isotopes_dir).run_in_scratch_dir(alpha_energy)
+
+
+# Runs TALYS for many (element, mass_number, alpha_energy) jobs at once, each
+# in its own scratch directory. Returns the jobs that failed for any reason,
+# including workers that died, so that callers can fall back to running them
+# serially.
+def run_parallel(jobs, max_workers, quiet=False):
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    failed_jobs = []
+
+    # Workers may not share this process' working directory
+    isotopes_dir = os.path.abspath(ISOTOPES_DIR)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_job, isotopes_dir, *job): job for job in jobs}
+
+        for future in as_completed(futures):
+            job = futures[future]
+
+            try:
+                future.result()
+                message = f"Successfully ran TALYS for {job[0]}{job[1]} at {job[2]} MeV"
+            except Exception as error:
+                message = f"TALYS failed for {job[0]}{job[1]} at {job[2]} MeV: {error}"
+                failed_jobs.append(job)
+
+            if not quiet:
+                print(message)
+
+    return sorted(failed_jobs)
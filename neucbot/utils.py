@@ -1,3 +1,4 @@
+import sys
 import numpy
 
 HISTO_MIN_BIN = 0  # keV
@@ -17,62 +18,89 @@ def round_half_up(number):
 
 
 class Histogram:
-    # Expects histo as a dict
+    # Expects histo as a dict of bin energy => value. Internally the histogram
+    # is kept as two arrays, sorted by bin energy: the lower bin edges and the
+    # values of each bin
     def __init__(self, histo={}):
-        self.histo = histo
+        bins = sorted(histo)
+
+        self.bins = numpy.array(bins)
+        self.values = numpy.array([histo[e] for e in bins], dtype=float)
+
+    # Expects bins sorted in increasing order, without duplicates
+    @classmethod
+    def from_arrays(cls, bins, values):
+        histogram = cls()
+        histogram.bins = numpy.asarray(bins)
+        histogram.values = numpy.asarray(values, dtype=float)
+
+        return histogram
 
     def to_dict(self):
-        return self.histo
+        return dict(self.items())
 
     def keys(self):
-        return list(self.histo.keys())
+        return self.bins.tolist()
+
+    def items(self):
+        return zip(self.bins.tolist(), self.values.tolist())
 
     def get(self, key):
-        return self.histo[key]
+        index = numpy.searchsorted(self.bins, key)
 
+        if index < len(self.bins) and self.bins[index] == key:
+            return float(self.values[index])
+        else:
+            raise KeyError(key)
+
+    # Approximate memory footprint, used to budget caches of histograms
+    def nbytes(self):
+        return sys.getsizeof(self) + self.bins.nbytes + self.values.nbytes
+
+    # The first bin is weighted by its own lower edge, and every following bin
+    # by the spacing of the first two bins. This assumes evenly spaced bins,
+    # as produced by rebin().
     def integrate(self):
-        integral = 0
-        sorted_keys = sorted(self.histo)
+        if len(self.bins) == 0:
+            return 0
 
-        for i in sorted_keys:
-            # Get the bin width
-            if index := sorted_keys.index(i) > 0:
-                delta = sorted_keys[index] - sorted_keys[index - 1]
-            else:
-                delta = sorted_keys[0]
+        widths = numpy.full(
+            len(self.bins), 0 if len(self.bins) < 2 else self.bins[1] - self.bins[0]
+        )
+        widths[0] = self.bins[0]
 
-            integral += self.histo[i] * delta
-        return integral
+        return float(numpy.dot(self.values, widths))
 
     def rebin(self, step=HISTO_DELTA_BIN, min_bin=HISTO_MIN_BIN, max_bin=HISTO_MAX_BIN):
+        if len(self.bins) == 0:
+            return Histogram()
+
         bin_count = (max_bin - min_bin) / step
-        rebinned = {}
-        norms = {}
-        sorted_histo = sorted(self.histo)
-
-        for i in sorted_histo:
-            index = sorted_histo.index(i)
-            # Get the spacing between points
-            delta = sorted_histo[0]
-            if index > 0:
-                delta = sorted_histo[index] - sorted_histo[index - 1]
-
-            # If the x value is too low, put it in the underflow bin (-1)
-            if i < min_bin:
-                new_bin = -1
-            # ...or the overflow bin if too high
-            elif i > max_bin:
-                new_bin = int(bin_count + 10 * step)
-            # Otherwise, calculate the new bin
-            else:
-                new_bin = int(min_bin + int((i - min_bin) / step) * step)
-
-            rebinned[new_bin] = rebinned.get(new_bin, 0) + self.histo[i] * delta
-            norms[new_bin] = norms.get(new_bin, 0) + delta
+
+        # Get the spacing between points, taking the first point's spacing
+        # from 0
+        deltas = numpy.diff(self.bins, prepend=0)
+
+        # Values that are too low go in the underflow bin (-1), values that
+        # are too high go in the overflow bin, and everything else goes in the
+        # bin containing it
+        new_bins = numpy.where(
+            self.bins < min_bin,
+            -1,
+            numpy.where(
+                self.bins > max_bin,
+                int(bin_count + 10 * step),
+                numpy.trunc(min_bin + numpy.floor((self.bins - min_bin) / step) * step),
+            ),
+        ).astype(int)
+
+        rebinned, indices = numpy.unique(new_bins, return_inverse=True)
+        totals = numpy.bincount(
+            indices, weights=self.values * deltas, minlength=len(rebinned)
+        )
+        norms = numpy.bincount(indices, weights=deltas, minlength=len(rebinned))
 
         # Renormalize the new histogram
-        for i in rebinned:
-            if norms[i] > 0:
-                rebinned[i] /= norms[i]
+        values = numpy.divide(totals, norms, out=totals, where=norms > 0)
 
-        return Histogram(rebinned)
+        return Histogram.from_arrays(rebinned, values)
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+from argparse import ArgumentParser
+
+from neucbot import batch
+from neucbot import cache
+from neucbot import download
+from neucbot import runner
+
+
+def main():
+    parser = ArgumentParser(
+        prog="runBatch",
+        description="Runs NeuCBOT for every (material, alpha list or chain, step size, output) job listed in a manifest file, loading shared data only once.",
+    )
+
+    parser.add_argument("manifest", help="Batch manifest file name")
+    parser.add_argument(
+        "-t", "--talys", type=bool, help="Run TALYS for reactions not found in ./Data"
+    )
+    parser.add_argument(
+        "-d",
+        "--download",
+        choices=["v1", "v2"],
+        help="Download isotopic data for isotopes missing from database (options: %(choices)s)",
+    )
+    parser.add_argument(
+        "--download-source",
+        default=download.DEFAULT_SOURCE,
+        help="URL, file:// URL or local directory to download isotopic data from (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes used to run TALYS for missing reactions, and by --engine parallel",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        help="Memory budget for parsed isotopic data kept in memory (in MB)",
+    )
+    parser.add_argument(
+        "--cache-results",
+        action="store_true",
+        help="Reuse results of earlier runs with the same inputs and data, stored in ./Data/Results",
+    )
+    parser.add_argument(
+        "--adaptive-tolerance",
+        type=float,
+        help="Merge alpha steps where the integrand is flat, keeping the estimated relative error of the total yield below this tolerance",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["energy", "isotope"],
+        default="energy",
+        help="With --engine parallel, split the work between jobs by contiguous alpha energy ranges or by isotope (options: %(choices)s)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=list(runner.ENGINES),
+        default="loop",
+        help="Yield computation engine (options: %(choices)s)",
+    )
+
+    args = vars(parser.parse_args())
+
+    if args["cache_size"] is not None:
+        cache.ISOTOPE_DATA.resize(int(args["cache_size"] * 1024 * 1024))
+
+    jobs = batch.Manifest.from_file(args.pop("manifest"))
+    batch.BatchRunner(args).run(jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+from argparse import ArgumentParser
+
+from neucbot import cache
+from neucbot import runner
+from neucbot import server
+
+
+def main():
+    parser = ArgumentParser(
+        prog="runServer",
+        description="Runs NeuCBOT as a local HTTP service that keeps isotopic data, stopping powers and condensed alpha lists in memory between requests.",
+    )
+
+    parser.add_argument(
+        "--host",
+        default=server.DEFAULT_HOST,
+        help="Address to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=server.DEFAULT_PORT,
+        help="Port to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of calculations run at the same time",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        help="Memory budget for parsed isotopic data kept in memory (in MB)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=list(runner.ENGINES),
+        default="loop",
+        help="Default yield computation engine (options: %(choices)s)",
+    )
+
+    args = parser.parse_args()
+
+    if args.cache_size is not None:
+        cache.ISOTOPE_DATA.resize(int(args.cache_size * 1024 * 1024))
+
+    service = server.NeucbotService(args.workers, args.engine)
+    httpd = server.NeucbotServer(service, args.host, args.port)
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import pytest
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from neucbot import adaptive, alpha, config, material, runner, talys, utils
+
+
+# Cross sections with a threshold and a wavy plateau, read on the same 0.01
+# MeV grid as TALYS data
+def cross_section(alpha_energy):
+    return synthetic.cross_section("C", 13, int(100 * alpha_energy) / 100.0) * 1e-27
+
+
+def rebinned_n_spec(alpha_energy, run_talys=False, force_recalc=False):
+    return utils.Histogram({1000: alpha_energy})
+
+
+def load_inputs(alpha_list_path="AlphaLists/Bi212Alphas.dat"):
+    alpha_list = alpha.AlphaList.from_filepath(alpha_list_path)
+    alpha_list.load_or_fetch()
+    comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+    return alpha_list.condense(0.01), comp
+
+
+def compute(condensed_alphas, comp):
+    return runner.NeucbotRunner(config.Config({"quiet": True})).compute(
+        condensed_alphas, comp, 0.01
+    )
+
+
+@patch.object(material.Isotope, "rebinned_n_spec", side_effect=rebinned_n_spec)
+@patch.object(material.Isotope, "cross_section", side_effect=cross_section)
+class TestAdaptiveStepper(TestCase):
+    def test_initial_intervals(self, *mocks):
+        stepper = adaptive.AdaptiveStepper(None, 0.01, 0.01)
+        intensities = [5, 5, 5, 7, 7] + [9] * 40
+
+        self.assertEqual(
+            stepper.initial_intervals(intensities),
+            [(0, 3), (3, 5), (5, 37), (37, 45)],
+        )
+
+    def test_zero_tolerance_matches_uniform_grid(self, *mocks):
+        condensed_alphas, comp = load_inputs()
+        adaptive_alphas, report = adaptive.AdaptiveStepper(comp, 0, 0.01).refine(
+            condensed_alphas
+        )
+
+        self.assertEqual(adaptive_alphas, condensed_alphas)
+        self.assertEqual(report["uniform_steps"], len(condensed_alphas))
+        self.assertEqual(report["adaptive_steps"], len(condensed_alphas))
+        self.assertEqual(report["estimated_error"], 0)
+
+        self.assertEqual(
+            compute(adaptive_alphas, comp), compute(condensed_alphas, comp)
+        )
+
+    def test_total_yield_within_tolerance(self, *mocks):
+        condensed_alphas, comp = load_inputs("AlphaLists/Po212Alphas.dat")
+        uniform = compute(condensed_alphas, comp)["total_cross_section"]
+
+        for tolerance in [1e-2, 1e-3]:
+            adaptive_alphas, report = adaptive.AdaptiveStepper(
+                comp, tolerance, 0.01
+            ).refine(condensed_alphas)
+            refined = compute(adaptive_alphas, comp)["total_cross_section"]
+
+            self.assertLess(report["adaptive_steps"], len(condensed_alphas) / 2)
+            self.assertLessEqual(report["estimated_relative_error"], tolerance)
+            self.assertLess(abs(refined - uniform), tolerance * uniform)
+
+    @patch.object(material.Composition, "stopping_power", return_value=100)
+    def test_flat_integrand_keeps_initial_intervals(self, mocked_stop_power, *mocks):
+        condensed_alphas, comp = load_inputs()
+        stepper = adaptive.AdaptiveStepper(comp, 1e-6, 0.01)
+        mocks[0].side_effect = lambda alpha_energy: 1e-27
+        intensities = [intensity for _, intensity in condensed_alphas]
+
+        adaptive_alphas, report = stepper.refine(condensed_alphas)
+
+        self.assertEqual(
+            len(adaptive_alphas), len(stepper.initial_intervals(intensities))
+        )
+        self.assertEqual(report["estimated_error"], pytest.approx(0, abs=1e-20))
+        self.assertEqual(
+            compute(adaptive_alphas, comp)["total_cross_section"],
+            pytest.approx(compute(condensed_alphas, comp)["total_cross_section"]),
+        )
+
+
+class TestAdaptiveGappedData(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.isotopes_dir = tempfile.mkdtemp()
+        synthetic.generate(
+            cls.isotopes_dir,
+            [("C", 12), ("O", 16), ("H", 1)],
+            synthetic.energy_grid(9.0),
+            gap_every=7,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.isotopes_dir)
+
+    def test_total_yield_within_tolerance(self):
+        with patch.object(talys, "ISOTOPES_DIR", self.isotopes_dir):
+            condensed_alphas, comp = load_inputs("AlphaLists/Po212Alphas.dat")
+            uniform = compute(condensed_alphas, comp)["total_cross_section"]
+
+            for tolerance in [1e-3, 1e-4]:
+                adaptive_alphas, report = adaptive.AdaptiveStepper(
+                    comp, tolerance, 0.01
+                ).refine(condensed_alphas)
+                refined = compute(adaptive_alphas, comp)["total_cross_section"]
+
+                self.assertLess(report["adaptive_steps"], len(condensed_alphas))
+                self.assertLessEqual(report["estimated_relative_error"], tolerance)
+                self.assertLessEqual(abs(refined - uniform), tolerance * uniform)
+
+
+class TestAdaptiveRun(TestCase):
+    @patch.object(material.Isotope, "rebinned_n_spec", side_effect=rebinned_n_spec)
+    @patch.object(material.Isotope, "cross_section", side_effect=cross_section)
+    def test_run_reports_adaptive_steps(self, *mocks):
+        alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+        alpha_list.load_or_fetch()
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+        cfg = config.Config({"quiet": True, "adaptive_tolerance": 1e-3})
+
+        results = runner.NeucbotRunner(cfg).run(alpha_list, comp)
+
+        self.assertEqual(results["adaptive"]["uniform_steps"], 610)
+        self.assertLess(results["adaptive"]["adaptive_steps"], 610)
+        self.assertEqual(
+            results["adaptive"]["spectrum_evaluations_saved"],
+            610 - results["adaptive"]["adaptive_steps"],
+        )
+        self.assertIn(
+            "neutron spectrum evaluations saved, cross sections looked up at all 610 steps",
+            adaptive.format_report(results["adaptive"]),
+        )
+
+    def test_validate(self):
+        with self.assertRaisesRegex(RuntimeError, r"must not be negative"):
+            config.Config({"adaptive_tolerance": -1}).validate()
+
+        with self.assertRaisesRegex(RuntimeError, r"cannot be combined"):
+            config.Config({"adaptive_tolerance": 1e-3, "talys": True}).validate()
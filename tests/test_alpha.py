@@ -288,6 +288,28 @@ class TestChainAlphaList(TestCase):
             ],
         )
 
+    @patch("neucbot.ensdf.fetch_all")
+    def test_load_or_fetch_prefetches_missing_members(self, mocked_fetch_all):
+        def missing_po(file_path):
+            return "Po" not in file_path
+
+        chain_list = ChainAlphaList.from_filepath("Chains/Th232Chain.dat")
+
+        with patch("os.path.isfile", side_effect=missing_po):
+            with self.assertRaises(RuntimeError):
+                chain_list.load_or_fetch()
+
+        # All missing members are fetched together, before any is loaded
+        mocked_fetch_all.assert_called_once_with(
+            [("Po", "216"), ("Po", "212")], concurrency=4
+        )
+
+    @patch("neucbot.ensdf.fetch_all")
+    def test_load_or_fetch_skips_prefetch_when_complete(self, mocked_fetch_all):
+        ChainAlphaList.from_filepath("Chains/Th232Chain.dat").load_or_fetch()
+
+        mocked_fetch_all.assert_not_called()
+
     def test_condense(self):
         pass
         chain_list = ChainAlphaList.from_filepath("Chains/Th232Chain.dat")
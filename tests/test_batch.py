@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from neucbot import batch, material, runner, utils
+
+
+class TestManifest(TestCase):
+    def test_from_file(self):
+        jobs = batch.Manifest.from_file("./tests/test_batch/manifest.txt")
+
+        assert [
+            (job.material_path, job.alpha_path, job.step_size, job.output)
+            for job in jobs
+        ] == [
+            (
+                "./tests/test_material/WithIsotopes.dat",
+                "AlphaLists/Bi212Alphas.dat",
+                0.01,
+                "with-isotopes-bi212.txt",
+            ),
+            (
+                "./tests/test_material/WithIsotopes.dat",
+                "Chains/Th232Chain.dat",
+                0.05,
+                "with-isotopes-th232.txt",
+            ),
+            (
+                "./tests/test_material/CarbonOnly.dat",
+                "AlphaLists/Bi212Alphas.dat",
+                0.01,
+                "carbon-only-bi212.txt",
+            ),
+        ]
+
+    def test_from_file_invalid_line(self):
+        tmp_dir = tempfile.mkdtemp()
+        manifest_path = os.path.join(tmp_dir, "manifest.txt")
+
+        with open(manifest_path, "w") as file:
+            file.write("Materials/Acrylic.dat Chains/Th232Chain.dat\n")
+
+        try:
+            with self.assertRaisesRegex(RuntimeError, r"Invalid batch manifest line 1"):
+                batch.Manifest.from_file(manifest_path)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+class TestBatchRunner(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.jobs = [
+            batch.Job(
+                job.material_path,
+                job.alpha_path,
+                job.step_size,
+                os.path.join(self.tmp_dir, job.output),
+            )
+            for job in batch.Manifest.from_file("./tests/test_batch/manifest.txt")
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    @patch.object(material.Isotope, "cross_section", return_value=1e-27)
+    @patch.object(
+        material.Isotope,
+        "rebinned_n_spec",
+        return_value=utils.Histogram({1000: 1}),
+    )
+    def test_run(self, mocked_rebinned_n_spec, mocked_cross_sect):
+        batch_runner = batch.BatchRunner({})
+
+        with patch.object(
+            material.Composition,
+            "from_file",
+            wraps=material.Composition.from_file,
+        ) as mocked_from_file:
+            results = batch_runner.run(self.jobs)
+
+        # Each material is only loaded once
+        assert mocked_from_file.call_count == 2
+        assert len(batch_runner.alpha_lists) == 2
+
+        assert len(results) == 3
+        assert results[0]["cross_sections"].keys() == {"C12", "H1", "O16"}
+        assert results[2]["cross_sections"].keys() == {"C12"}
+
+        for job, result in zip(self.jobs, results):
+            with open(job.output) as output_file:
+                assert (
+                    f"# Total neutron yield =  "
+                    f"{utils.format_float(result['total_cross_section'])}"
+                ) in output_file.read()
+
+    @patch.object(runner.NeucbotRunner, "run")
+    def test_run_shares_data_between_jobs(self, mocked_run):
+        batch.BatchRunner({}).run(self.jobs)
+
+        first_call, second_call, third_call = mocked_run.call_args_list
+
+        # Jobs with the same material share one Composition, and jobs with the
+        # same alpha list share one AlphaList
+        assert first_call.args[1] is second_call.args[1]
+        assert first_call.args[0] is third_call.args[0]
+        assert second_call.args[2] == 0.05
+
+        # Stopping power tables are shared across materials
+        assert (
+            first_call.args[1].stopping_powers["C"]
+            is third_call.args[1].stopping_powers["C"]
+        )
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import run, synthetic
+from neucbot import cache, elements, material, talys
+
+
+class TestSynthetic(TestCase):
+    def setUp(self):
+        cache.ISOTOPE_DATA.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_energy_grid(self):
+        assert synthetic.energy_grid(0.05) == [0.01, 0.02, 0.03, 0.04, 0.05]
+        assert synthetic.energy_grid(1.0, 0.25) == [0.25, 0.5, 0.75, 1.0]
+
+    def test_generate(self):
+        energies = synthetic.energy_grid(2.0, 0.5)
+
+        n_files = synthetic.generate(self.tmp_dir, [("C", 13)], energies, gap_every=4)
+
+        assert n_files == 6
+
+        with patch("neucbot.talys.ISOTOPES_DIR", self.tmp_dir):
+            isotope = material.Isotope(elements.Element("C"), 13, 1.0)
+
+        # Below threshold: no cross section and an EMPTY spectrum
+        assert isotope.cross_section(0.5) == 0
+        assert isotope.differential_n_spec(0.5).bins.size == 0
+
+        # Left out as a gap
+        assert not os.path.exists(isotope.talys_runner.output_file(2.0))
+
+        spectrum = synthetic.spectrum("C", 13, 1.5)
+        assert isotope.cross_section(1.5) == pytest.approx(
+            synthetic.cross_section("C", 13, 1.5) * 1e-27, rel=1e-5
+        )
+        assert isotope.differential_n_spec(1.5).bins.size == len(spectrum)
+
+    def test_fake_talys(self):
+        environ = {
+            "PATH": run.FAKE_TALYS_DIR + os.pathsep + os.environ["PATH"],
+        }
+
+        with patch.dict(os.environ, environ):
+            runner = talys.Runner("C", 13, self.tmp_dir)
+            runner.run_in_scratch_dir(3.5)
+
+        with open(runner.output_file(3.5)) as file:
+            assert file.read() == synthetic.output_text("C", 13, 3.5)
+
+        with open(runner.spectra_file(3.5)) as file:
+            assert file.read() == synthetic.spectrum_text("C", 13, 3.5)
+
+
+class TestCompare(TestCase):
+    def test_compare(self):
+        results = {
+            "small": {
+                "run_cold": {"seconds": 2.0, "peak_bytes": 0},
+                "run_warm": {"seconds": 1.0, "peak_bytes": 0},
+                "compile_data": {"seconds": 1.0, "peak_bytes": 0},
+            }
+        }
+        baseline = {
+            "small": {
+                "run_cold": {"seconds": 1.0, "peak_bytes": 0},
+                "run_warm": {"seconds": 0.9, "peak_bytes": 0},
+            }
+        }
+
+        rows = run.compare(results, baseline, tolerance=1.5)
+
+        assert [(stage, regression) for _, stage, _, _, regression in rows] == [
+            ("run_cold", True),
+            ("run_warm", False),
+            ("compile_data", False),
+        ]
+
+
+class TestRunBenchmarks(TestCase):
+    def test_writes_only_to_temporary_directory(self):
+        paths = (talys.ISOTOPES_DIR, material.STOPPING_POWER_BUNDLE)
+        written = []
+
+        def compile_composition(symbols, condensed_alphas, repeat):
+            comp = material.Composition.from_json(run.composition_json(symbols))
+            with patch("sys.stdout"):
+                comp.compile_data()
+
+            written.append((talys.ISOTOPES_DIR, material.STOPPING_POWER_BUNDLE))
+            assert os.path.exists(material.STOPPING_POWER_BUNDLE)
+
+            return {}
+
+        with patch.object(run, "benchmark_common", return_value={}), patch.object(
+            run, "benchmark_talys", return_value={}
+        ), patch.object(run, "benchmark_startup", return_value={}), patch.object(
+            run, "benchmark_composition", side_effect=compile_composition
+        ), patch(
+            "sys.stderr"
+        ):
+            run.run_benchmarks(["small"], 1, 0.5)
+
+        ((isotopes_dir, bundle),) = written
+        assert os.path.dirname(bundle) == isotopes_dir
+        assert not os.path.exists(isotopes_dir)
+
+        assert (talys.ISOTOPES_DIR, material.STOPPING_POWER_BUNDLE) == paths
+        assert material.STOPPING_POWER_LISTS == {}
@@ -0,0 +1,121 @@
+import pytest
+
+from unittest import TestCase
+
+from neucbot import cache, utils
+
+
+class Sized:
+    def __init__(self, size):
+        self.size = size
+
+    def nbytes(self):
+        return self.size
+
+
+class TestLRUCache(TestCase):
+    def setUp(self):
+        self.cache = cache.LRUCache(max_bytes=100)
+
+    def test_get_and_put(self):
+        value = Sized(10)
+        self.cache.put("a", value)
+
+        assert self.cache.get("a") is value
+        assert self.cache.get("b") is None
+        assert self.cache.get("b", 0) == 0
+        assert self.cache.bytes == 10
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", Sized(40))
+        self.cache.put("b", Sized(40))
+
+        # Touch "a" so that "b" is the least recently used entry
+        self.cache.get("a")
+        self.cache.put("c", Sized(40))
+
+        assert "a" in self.cache
+        assert "b" not in self.cache
+        assert "c" in self.cache
+        assert self.cache.bytes == 80
+        assert self.cache.evictions == 1
+
+    def test_put_replaces_existing_entry(self):
+        self.cache.put("a", Sized(40))
+        self.cache.put("a", Sized(30))
+
+        assert len(self.cache) == 1
+        assert self.cache.bytes == 30
+
+    def test_does_not_cache_values_larger_than_budget(self):
+        self.cache.put("a", Sized(101))
+
+        assert "a" not in self.cache
+        assert self.cache.bytes == 0
+
+    def test_invalidate(self):
+        self.cache.put("a", Sized(40))
+        self.cache.invalidate("a")
+        self.cache.invalidate("missing")
+
+        assert "a" not in self.cache
+        assert self.cache.bytes == 0
+
+    def test_resize(self):
+        self.cache.put("a", Sized(40))
+        self.cache.put("b", Sized(40))
+        self.cache.resize(50)
+
+        assert "a" not in self.cache
+        assert "b" in self.cache
+        assert self.cache.max_bytes == 50
+
+    def test_max_entries(self):
+        entries_cache = cache.LRUCache(max_bytes=100, max_entries=2)
+        entries_cache.put("a", Sized(1))
+        entries_cache.put("b", Sized(1))
+        entries_cache.get("a")
+        entries_cache.put("c", Sized(1))
+
+        assert "a" in entries_cache
+        assert "b" not in entries_cache
+        assert "c" in entries_cache
+        assert entries_cache.stats()["evictions"] == 1
+        assert entries_cache.bytes == 2
+
+    def test_stats(self):
+        self.cache.put("a", Sized(40))
+        self.cache.get("a")
+        self.cache.get("a")
+        self.cache.get("b")
+
+        assert self.cache.stats() == {
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": pytest.approx(2 / 3),
+            "evictions": 0,
+            "entries": 1,
+            "bytes": 40,
+            "max_bytes": 100,
+            "max_entries": None,
+        }
+
+    def test_clear(self):
+        self.cache.put("a", Sized(40))
+        self.cache.get("a")
+        self.cache.clear()
+
+        assert len(self.cache) == 0
+        assert self.cache.stats()["hits"] == 0
+        assert self.cache.bytes == 0
+
+
+class TestSizeof(TestCase):
+    def test_histogram(self):
+        histogram = utils.Histogram({100: 1.0, 200: 2.0})
+
+        assert cache.sizeof(histogram) == histogram.nbytes()
+        assert histogram.nbytes() > 0
+
+    def test_float(self):
+        assert cache.sizeof(1.0) == 24
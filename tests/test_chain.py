@@ -0,0 +1,155 @@
+import io
+import os
+import pytest
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from neucbot import alpha, chain, config, material, runner, talys
+
+MEMBERS = [
+    ("Po", "212", [[2.95, 50.0]]),
+    ("Bi", "212", [[2.6, 30.0], [1.8, 20.0]]),
+    ("Rn", "220", [[2.6, 10.0], [2.234, 5.0]]),
+]
+
+
+# Builds a decay chain from the given members, scaling the intensities of
+# each member's alphas by its ratio
+def make_chain(ratios=None):
+    ratios = ratios or {}
+    chain_list = alpha.ChainAlphaList("Th", "232")
+
+    for element, isotope, alphas in MEMBERS:
+        alpha_list = alpha.AlphaList(element, isotope)
+        alpha_list.set_alphas([list(alpha) for alpha in alphas])
+        alpha_list.scale_by(ratios.get(f"{element}{isotope}", 1.0))
+
+        chain_list._alpha_lists.append(alpha_list)
+        chain_list.alphas += alpha_list.alphas
+
+    return chain_list
+
+
+class TestCondenseMembers(TestCase):
+    def test_member_intensities_add_up(self):
+        chain_list = make_chain()
+        condensed_alphas, member_intensities = chain_list.condense_members(0.01)
+
+        assert condensed_alphas == chain_list.condense(0.01)
+        assert list(member_intensities) == ["Po212", "Bi212", "Rn220"]
+
+        for step, (_, intensity) in enumerate(condensed_alphas):
+            assert sum(
+                intensities[step] for intensities in member_intensities.values()
+            ) == pytest.approx(intensity, rel=1e-12)
+
+        # Only Po212 has alphas above 2.6 MeV
+        assert member_intensities["Po212"][0] == 50.0
+        assert member_intensities["Bi212"][0] == 0.0
+        assert member_intensities["Rn220"][-1] == pytest.approx(15.0)
+
+
+class TestMemberYields(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.isotopes_dir = tempfile.mkdtemp()
+        synthetic.generate(
+            cls.isotopes_dir,
+            [("C", 12), ("O", 16), ("H", 1)],
+            synthetic.energy_grid(3.0),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.isotopes_dir)
+
+    def setUp(self):
+        self.isotopes_dir_patch = patch.object(talys, "ISOTOPES_DIR", self.isotopes_dir)
+        self.isotopes_dir_patch.start()
+
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+
+    def tearDown(self):
+        self.isotopes_dir_patch.stop()
+
+    def compute(self, chain_list):
+        cfg = config.Config({"quiet": True})
+
+        return runner.create_runner(cfg).compute(chain_list.condense(0.01), self.comp)
+
+    def assert_results_match(self, results, expected):
+        assert results["total_cross_section"] == pytest.approx(
+            expected["total_cross_section"], rel=1e-12
+        )
+        for name, xsect in expected["cross_sections"].items():
+            assert results["cross_sections"][name] == pytest.approx(xsect, rel=1e-12)
+        for e, value in results["spectra_totals"].items():
+            assert value == pytest.approx(
+                expected["spectra_totals"].get(e, 0), rel=1e-12, abs=1e-30
+            )
+
+    def test_ratios_match_rescaled_chains(self):
+        ratio_points = [{}, {"Rn220": 3.0}, {"Bi212": 0.0, "Rn220": 0.5}]
+        member_yields, results = chain.run(
+            make_chain(), self.comp, ratio_points, 0.01, progress=False
+        )
+
+        assert list(member_yields.member_results) == ["Po212", "Bi212", "Rn220"]
+
+        for ratios, point in zip(ratio_points, results):
+            self.assert_results_match(point, self.compute(make_chain(ratios)))
+
+        assert results[1]["ratios"] == {"Po212": 1.0, "Bi212": 1.0, "Rn220": 3.0}
+
+    def test_invalid_ratios(self):
+        with self.assertRaisesRegex(RuntimeError, r"Ra226 is not a member"):
+            chain.run(make_chain(), self.comp, [{"Ra226": 2.0}], 0.01)
+
+        with self.assertRaisesRegex(RuntimeError, r"must not be negative"):
+            chain.run(make_chain(), self.comp, [{"Bi212": -1.0}], 0.01)
+
+        alpha_list = alpha.AlphaList("Bi", "212")
+        alpha_list.set_alphas([[2.6, 30.0]])
+
+        with self.assertRaisesRegex(RuntimeError, r"need a decay chain"):
+            chain.run(alpha_list, self.comp, [{}], 0.01)
+
+    def test_read_ratios_and_print_tables(self):
+        tmp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(tmp_dir, "ratios.txt")
+        with open(file_path, "w") as file:
+            file.write("# Rn220 excess\nRn220 Bi212\n1 1\n\n4 1\n")
+
+        ratio_points = chain.read_ratios(file_path)
+
+        with open(file_path, "a") as file:
+            file.write("4\n")
+        with self.assertRaisesRegex(RuntimeError, r"need 2 ratios, got 1"):
+            chain.read_ratios(file_path)
+
+        shutil.rmtree(tmp_dir)
+
+        assert ratio_points == [
+            {"Rn220": 1.0, "Bi212": 1.0},
+            {"Rn220": 4.0, "Bi212": 1.0},
+        ]
+
+        member_yields, results = chain.run(
+            make_chain(), self.comp, ratio_points, 0.01, progress=False
+        )
+        output = io.StringIO()
+        chain.print_tables(member_yields, results, output)
+        lines = output.getvalue().splitlines()
+
+        assert lines[1] == "# Decay chain members at secular equilibrium"
+        assert lines[2] == "# member total C12 O16 H1 (n/decay)"
+        assert [line.split()[0] for line in lines[3:6]] == ["Po212", "Bi212", "Rn220"]
+        assert lines[7] == "# Activity ratio sweep of 2 points"
+        assert lines[8] == "# Po212 Bi212 Rn220 total C12 O16 H1 (n/decay)"
+        assert lines[10].startswith("1 1 4 ")
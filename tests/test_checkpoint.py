@@ -0,0 +1,207 @@
+import json
+import os
+import shutil
+import tempfile
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from neucbot import alpha, checkpoint, config, material, runner, utils
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "checkpoint.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_and_load(self):
+        ckpt = checkpoint.Checkpoint(self.file_path, "key", 10)
+
+        assert ckpt.load() is None
+
+        ckpt.save(4, 0.1 + 0.2, {"C13": 1 / 3}, {1000: 2 / 3, 1100: 1e-300})
+
+        assert ckpt.load() == (
+            4,
+            0.1 + 0.2,
+            {"C13": 1 / 3},
+            {1000: 2 / 3, 1100: 1e-300},
+        )
+        assert not os.path.exists(f"{self.file_path}.tmp")
+
+    def test_load_different_inputs(self):
+        checkpoint.Checkpoint(self.file_path, "key", 10).save(4, 0, {}, {})
+
+        with self.assertRaisesRegex(RuntimeError, r"different alpha list"):
+            checkpoint.Checkpoint(self.file_path, "other key", 10).load()
+
+    def test_input_key(self):
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+        alphas = [[6.09, 27.12], [6.08, 27.12]]
+
+        key = checkpoint.input_key(alphas, comp, 0.01)
+
+        assert key == checkpoint.input_key([list(a) for a in alphas], comp, 0.01)
+        assert key != checkpoint.input_key(alphas, comp, 0.02)
+        assert key != checkpoint.input_key(alphas[:1], comp, 0.01)
+
+    def test_stream_resume(self):
+        file_path = os.path.join(self.tmp_dir, "stream.jsonl")
+
+        stream = checkpoint.Stream(file_path)
+        for step in range(5):
+            stream.write(step, 6.0 - step / 100, 10.0, {"C13": step}, {1000: step})
+        stream.close()
+
+        # Steps 3 and 4 were streamed after the last checkpoint was saved
+        stream = checkpoint.Stream(file_path, completed_steps=3)
+        stream.write(3, 5.97, 10.0, {"C13": 3}, {1000: 3})
+        stream.close()
+
+        with open(file_path) as file:
+            lines = [json.loads(line) for line in file.readlines()]
+
+        assert [line["step"] for line in lines] == [0, 1, 2, 3]
+        assert lines[1] == {
+            "step": 1,
+            "alpha_energy": 5.99,
+            "intensity": 10.0,
+            "cross_sections": {"C13": 1},
+            "spectrum": {"1000": 1},
+        }
+
+    def test_stream_resume_keeps_lines_until_replaced(self):
+        file_path = os.path.join(self.tmp_dir, "stream.jsonl")
+
+        stream = checkpoint.Stream(file_path)
+        for step in range(5):
+            stream.write(step, 6.0 - step / 100, 10.0, {"C13": step}, {1000: step})
+        stream.close()
+
+        with open(file_path) as file:
+            streamed = file.read()
+
+        # Killed before the kept lines replace the stream
+        with patch("os.replace", side_effect=Interrupted):
+            with self.assertRaises(Interrupted):
+                checkpoint.Stream(file_path, completed_steps=3)
+
+        with open(file_path) as file:
+            assert file.read() == streamed
+
+        stream = checkpoint.Stream(file_path, completed_steps=3)
+        stream.close()
+
+        with open(file_path) as file:
+            assert [json.loads(line)["step"] for line in file] == [0, 1, 2]
+
+
+class Interrupted(Exception):
+    pass
+
+
+@patch.object(material.Composition, "stopping_power", return_value=100)
+class TestRunnerCheckpoints(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.args = {
+            "quiet": True,
+            "checkpoint": os.path.join(self.tmp_dir, "checkpoint.json"),
+            "checkpoint_interval": 7,
+            "stream": os.path.join(self.tmp_dir, "stream.jsonl"),
+        }
+
+        alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+        alpha_list.load_or_fetch()
+
+        self.condensed_alphas = alpha_list.condense(0.01)
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    # Cross sections and spectra that vary with the alpha energy, so that
+    # resuming from the wrong step would change the results
+    def cross_section(self, alpha_energy):
+        return alpha_energy * 1e-27
+
+    def rebinned_n_spec(self, alpha_energy, run_talys=False, force_recalc=False):
+        return utils.Histogram({1000: alpha_energy, int(1000 * alpha_energy): 1})
+
+    def compute(self, args, fail_at_call=None):
+        calls = []
+
+        def cross_section(alpha_energy):
+            calls.append(alpha_energy)
+            if len(calls) == fail_at_call:
+                raise Interrupted()
+
+            return self.cross_section(alpha_energy)
+
+        with patch.object(
+            material.Isotope, "cross_section", side_effect=cross_section
+        ), patch.object(
+            material.Isotope, "rebinned_n_spec", side_effect=self.rebinned_n_spec
+        ):
+            return runner.NeucbotRunner(config.Config(args)).compute(
+                self.condensed_alphas, self.comp
+            )
+
+    def test_resume(self, mocked_stop_power):
+        expected = self.compute({"quiet": True})
+
+        # 3 isotopes per step, so this fails halfway through step 100, after
+        # the checkpoint for the first 98 steps
+        with self.assertRaises(Interrupted):
+            self.compute(self.args, fail_at_call=301)
+
+        ckpt = checkpoint.Checkpoint(
+            self.args["checkpoint"],
+            checkpoint.input_key(self.condensed_alphas, self.comp, 0.01),
+            len(self.condensed_alphas),
+        )
+        assert ckpt.load()[0] == 98
+
+        results = self.compute({**self.args, "resume": True})
+
+        assert results == expected
+
+        with open(self.args["stream"]) as file:
+            lines = [json.loads(line) for line in file.readlines()]
+
+        assert [line["step"] for line in lines] == list(
+            range(len(self.condensed_alphas))
+        )
+        assert sum(
+            sum(line["cross_sections"].values()) for line in lines
+        ) == pytest.approx(expected["total_cross_section"])
+
+    def test_without_resume_starts_over(self, mocked_stop_power):
+        with self.assertRaises(Interrupted):
+            self.compute(self.args, fail_at_call=301)
+
+        with patch.object(runner.NeucbotRunner, "log") as mocked_log:
+            self.compute(self.args)
+
+        assert not any("Resuming" in str(c) for c in mocked_log.call_args_list)
+
+    def test_vectorized_runner_uses_loop(self, mocked_stop_power):
+        expected = self.compute({"quiet": True})
+
+        with patch.object(
+            material.Isotope, "cross_section", side_effect=self.cross_section
+        ), patch.object(
+            material.Isotope, "rebinned_n_spec", side_effect=self.rebinned_n_spec
+        ):
+            results = runner.VectorizedNeucbotRunner(config.Config(self.args)).compute(
+                self.condensed_alphas, self.comp
+            )
+
+        assert results == expected
+        assert os.path.exists(self.args["checkpoint"])
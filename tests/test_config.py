@@ -23,3 +23,59 @@ class TestConfig(TestCase):
         with self.assertRaisesRegex(RuntimeError, r"talys command is not available"):
             config.Config({"talys": True}).validate()
             mock_which.assert_has_calls([call("talys")])
+
+    def test_validate_resume_without_checkpoint(self):
+        with self.assertRaisesRegex(RuntimeError, r"requires a checkpoint file"):
+            config.Config({"resume": True}).validate()
+
+    def test_validate_checkpoint_interval(self):
+        with self.assertRaisesRegex(RuntimeError, r"at least one alpha step"):
+            config.Config(
+                {"checkpoint": "run.json", "checkpoint_interval": -1}
+            ).validate()
+
+    def test_validate_ensemble_with_adaptive_stepping(self):
+        with self.assertRaisesRegex(RuntimeError, r"cannot be combined with adaptive"):
+            config.Config(
+                {"ensemble": "spec.json", "adaptive_tolerance": 0.01}
+            ).validate()
+
+    def test_validate_sweep_combinations(self):
+        with self.assertRaisesRegex(RuntimeError, r"cannot be combined with adaptive"):
+            config.Config({"sweep": "sweep.txt", "adaptive_tolerance": 0.01}).validate()
+
+        with self.assertRaisesRegex(RuntimeError, r"cannot be combined with ensembles"):
+            config.Config({"sweep": "sweep.txt", "ensemble": "spec.json"}).validate()
+
+    def test_validate_activity_ratio_combinations(self):
+        with self.assertRaisesRegex(
+            RuntimeError, r"Activity ratios cannot be combined"
+        ):
+            config.Config(
+                {
+                    "activity_ratios": "ratios.txt",
+                    "chain_list": "chain.txt",
+                    "sweep": "sweep.txt",
+                }
+            ).validate()
+
+        with self.assertRaisesRegex(RuntimeError, r"require a decay chain file"):
+            config.Config(
+                {"activity_ratios": "ratios.txt", "alpha_list": "alphas.txt"}
+            ).validate()
+
+        config.Config(
+            {"activity_ratios": "ratios.txt", "chain_list": "chain.txt"}
+        ).validate()
+
+    def test_validate_checkpoint_and_stream_combinations(self):
+        for option in ("checkpoint", "stream"):
+            for args in (
+                {"activity_ratios": "ratios.txt", "chain_list": "chain.txt"},
+                {"ensemble": "spec.json"},
+                {"sweep": "sweep.txt"},
+            ):
+                with self.assertRaisesRegex(
+                    RuntimeError, r"Checkpoints and streams cannot be combined"
+                ):
+                    config.Config({option: "out.json", **args}).validate()
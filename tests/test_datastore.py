@@ -0,0 +1,305 @@
+import os
+import shutil
+import tempfile
+import numpy
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from neucbot import cache, datastore, elements, material
+
+
+class TestIsotopeDataStore(TestCase):
+    def setUp(self):
+        cache.ISOTOPE_DATA.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+
+        with patch("neucbot.talys.ISOTOPES_DIR", self.tmp_dir):
+            self.isotope = material.Isotope(elements.Element("C"), 13, 1.0)
+
+        runner = self.isotope.talys_runner
+        for energy in ["1.05", "6.76", "6.77"]:
+            shutil.copy(
+                f"./tests/test_material/TalysOut/outputE{energy}",
+                runner.output_file(float(energy)),
+            )
+        shutil.copy("./tests/test_material/C13Nspec.txt", runner.spectra_file(1.05))
+        with open(runner.spectra_file(6.76), "w") as file:
+            file.write("EMPTY")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_energy_key(self):
+        assert datastore.energy_key(0.29) == 29
+        assert datastore.energy_key(int(100 * 6.790000000000042) / 100.0) == 679
+
+    def test_load_without_compiled_file(self):
+        assert datastore.IsotopeDataStore.load(self.isotope.talys_runner) is None
+        assert self.isotope.data_store() is None
+
+    def test_compile_and_load(self):
+        self.isotope.compile_data()
+        store = datastore.IsotopeDataStore.load(self.isotope.talys_runner)
+
+        assert store.index == {105: 0, 676: 1, 677: 2}
+        assert store.cross_section(1.05) == 1.51335e-28
+        assert store.cross_section(6.77) == 3.38704e-25
+        assert store.cross_section(2.00) is None
+
+        runner = self.isotope.talys_runner
+        assert (
+            store.differential_n_spec(1.05).to_dict()
+            == self.isotope.read_spectra_file(runner.spectra_file(1.05)).to_dict()
+        )
+        assert store.differential_n_spec(6.76).to_dict() == {}
+        assert store.differential_n_spec(6.77) is None
+
+    def test_load_shares_open_stores(self):
+        self.isotope.compile_data()
+
+        with patch.object(
+            datastore.numpy, "load", wraps=datastore.numpy.load
+        ) as mocked_load:
+            first = datastore.IsotopeDataStore.load(self.isotope.talys_runner)
+            second = datastore.IsotopeDataStore.load(self.isotope.talys_runner)
+
+        assert first is second
+        assert mocked_load.call_count <= 1
+
+    def test_recompiled_store_replaces_open_store(self):
+        runner = self.isotope.talys_runner
+        self.isotope.compile_data()
+        first = datastore.IsotopeDataStore.load(runner)
+
+        self.isotope.compile_data()
+        compiled_mtime = os.stat(runner.compiled_file()).st_mtime_ns
+        os.utime(runner.compiled_file(), ns=(compiled_mtime + 1000,) * 2)
+        second = datastore.IsotopeDataStore.load(runner)
+
+        assert second is not first
+
+        # Only the store mapped last is kept open
+        key = ("IsotopeDataStore", os.path.abspath(runner.compiled_file()))
+        assert datastore.OPEN_STORES[key] == (compiled_mtime + 1000, second)
+
+        # A stale store is dropped as well
+        os.utime(runner.output_dir, ns=(compiled_mtime + 2000,) * 2)
+
+        assert datastore.IsotopeDataStore.load(runner) is None
+        assert key not in datastore.OPEN_STORES
+
+    def test_isotope_reads_from_store(self):
+        runner = self.isotope.talys_runner
+        expected_spectrum = self.isotope.differential_n_spec(1.05).to_dict()
+
+        self.isotope.compile_data()
+
+        with patch("builtins.open") as mocked_open:
+            assert self.isotope.cross_section(1.0500001) == 1.51335e-28
+            assert self.isotope.differential_n_spec(1.05).to_dict() == (
+                expected_spectrum
+            )
+            mocked_open.assert_not_called()
+
+    def test_compile_float32(self):
+        self.isotope.compile_data("float32")
+        store = datastore.IsotopeDataStore.load(self.isotope.talys_runner)
+
+        assert store.cross_section(6.76) == pytest.approx(3.37965e-25, rel=1e-6)
+        assert store.differential_n_spec(1.05).to_dict() == {
+            100: pytest.approx(4.11934e-33, rel=1e-6),
+            200: pytest.approx(4.64183e-33, rel=1e-6),
+            300: pytest.approx(5.20858e-33, rel=1e-6),
+            400: pytest.approx(5.81992e-33, rel=1e-6),
+            500: pytest.approx(6.47565e-33, rel=1e-6),
+        }
+
+    def test_stale_store_is_ignored(self):
+        self.isotope.compile_data()
+        runner = self.isotope.talys_runner
+
+        compiled_mtime = os.stat(runner.compiled_file()).st_mtime_ns
+        os.utime(runner.spectra_dir, ns=(compiled_mtime + 1000, compiled_mtime + 1000))
+
+        assert datastore.IsotopeDataStore.load(runner) is None
+
+    def test_store_of_file_rewritten_in_place_is_ignored(self):
+        self.isotope.compile_data()
+        runner = self.isotope.talys_runner
+        compiled_mtime = os.stat(runner.compiled_file()).st_mtime_ns
+
+        # Rewriting a file in place leaves its directory's time unchanged
+        with open(runner.output_file(6.77), "a") as file:
+            file.write("\n")
+        os.utime(runner.output_file(6.77), ns=(compiled_mtime + 1000,) * 2)
+        os.utime(runner.output_dir, ns=(compiled_mtime - 1000,) * 2)
+
+        assert datastore.IsotopeDataStore.load(runner) is None
+
+
+class TestRebinnedSpectraStore(TestCase):
+    def setUp(self):
+        cache.ISOTOPE_DATA.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+
+        with patch("neucbot.talys.ISOTOPES_DIR", self.tmp_dir):
+            self.isotope = material.Isotope(elements.Element("C"), 13, 1.0)
+
+        runner = self.isotope.talys_runner
+        shutil.copy("./tests/test_material/C13Nspec.txt", runner.spectra_file(1.05))
+        with open(runner.spectra_file(6.76), "w") as file:
+            file.write("EMPTY")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_without_compiled_file(self):
+        assert datastore.RebinnedSpectraStore.load(self.isotope.talys_runner) is None
+
+    def test_compile_and_load(self):
+        expected = self.isotope.differential_n_spec(1.05).rebin().to_dict()
+
+        datastore.RebinnedSpectraStore.compile(self.isotope)
+        store = datastore.RebinnedSpectraStore.load(self.isotope.talys_runner)
+
+        assert os.path.basename(
+            self.isotope.talys_runner.rebinned_file(100, 0, 20000)
+        ) == ("rebinned_100_0_20000.npy")
+        assert store.index == {105: 0, 676: 1}
+        assert store.rebinned_n_spec(1.05).to_dict() == expected
+        assert store.rebinned_n_spec(6.76).to_dict() == {}
+        assert store.rebinned_n_spec(6.77) is None
+
+    def test_compile_custom_binning(self):
+        expected = self.isotope.differential_n_spec(1.05).rebin(200, 0, 400).to_dict()
+
+        datastore.RebinnedSpectraStore.compile(self.isotope, 200, 0, 400)
+
+        assert datastore.RebinnedSpectraStore.load(self.isotope.talys_runner) is None
+
+        store = datastore.RebinnedSpectraStore.load(
+            self.isotope.talys_runner, 200, 0, 400
+        )
+        assert store.rebinned_n_spec(1.05).to_dict() == expected
+
+    def test_isotope_reads_rebinned_spectra(self):
+        expected = self.isotope.rebinned_n_spec(1.05).to_dict()
+
+        self.isotope.compile_data()
+        cache.ISOTOPE_DATA.clear()
+
+        with patch.object(
+            material.Isotope, "differential_n_spec"
+        ) as mocked_diff_n_spec:
+            assert self.isotope.rebinned_n_spec(1.05).to_dict() == expected
+            mocked_diff_n_spec.assert_not_called()
+
+            # Energies without spectra still fall back to the TALYS files
+            self.isotope.rebinned_n_spec(2.00)
+            mocked_diff_n_spec.assert_called_once_with(2.00, False, False)
+
+
+class TestStoppingPowerBundle(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.stopping_power_dir = os.path.join(self.tmp_dir, "StoppingPowers")
+        os.mkdir(self.stopping_power_dir)
+
+        for symbol in ["c", "h", "o"]:
+            shutil.copy(f"./Data/StoppingPowers/{symbol}.dat", self.stopping_power_dir)
+
+        self.patches = [
+            patch.object(material, "STOPPING_POWER_DIR", self.stopping_power_dir),
+            patch.object(
+                material,
+                "STOPPING_POWER_BUNDLE",
+                os.path.join(self.tmp_dir, "stopping_powers.npy"),
+            ),
+            patch.dict(material.STOPPING_POWER_LISTS, clear=True),
+        ]
+        for mock in self.patches:
+            mock.start()
+
+    def tearDown(self):
+        for mock in reversed(self.patches):
+            mock.stop()
+
+        shutil.rmtree(self.tmp_dir)
+
+    def load(self):
+        return datastore.StoppingPowerBundle.load(
+            material.STOPPING_POWER_BUNDLE, material.STOPPING_POWER_DIR
+        )
+
+    def test_element_code(self):
+        assert datastore.element_code("C") == datastore.element_code("c") == 99
+        assert datastore.element_code("Ca") != datastore.element_code("Ac")
+
+    def test_load_without_compiled_file(self):
+        assert self.load() is None
+        assert material.StoppingPowerList.for_element("C").stopping_powers[0.01] == (
+            511.72
+        )
+
+    def test_bundle_of_table_edited_in_place_is_ignored(self):
+        material.compile_stopping_powers()
+        compiled_mtime = os.stat(material.STOPPING_POWER_BUNDLE).st_mtime_ns
+
+        table_path = os.path.join(self.stopping_power_dir, "c.dat")
+        os.utime(table_path, ns=(compiled_mtime + 1000,) * 2)
+        os.utime(self.stopping_power_dir, ns=(compiled_mtime - 1000,) * 2)
+
+        assert not material.StoppingPowerList("C").load_bundle()
+
+    def test_compile_and_load(self):
+        material.compile_stopping_powers()
+        bundle = self.load()
+
+        assert len(bundle.index) == 3
+        assert bundle.table("Fe") is None
+
+        for symbol in ["C", "H", "O"]:
+            expected = material.StoppingPowerList(symbol)
+            expected.load_file()
+            energies, values = bundle.table(symbol)
+
+            assert energies.tolist() == expected.energies.tolist()
+            assert values.tolist() == expected.values.tolist()
+            assert not energies.flags.writeable
+
+    def test_for_element_reads_from_bundle(self):
+        material.compile_stopping_powers()
+
+        with patch.object(material.StoppingPowerList, "load_file") as mocked_load:
+            stop_list = material.StoppingPowerList.for_element("C")
+            mocked_load.assert_not_called()
+
+        assert stop_list.for_alpha(0.525) == 1927.124
+        assert stop_list.for_alpha(4.25) == 906.4551
+
+    def test_element_missing_from_bundle(self):
+        material.compile_stopping_powers()
+
+        assert not material.StoppingPowerList("Fe").load_bundle()
+
+    def test_stale_bundle_is_ignored(self):
+        material.compile_stopping_powers()
+
+        compiled_mtime = os.stat(material.STOPPING_POWER_BUNDLE).st_mtime_ns
+        os.utime(
+            self.stopping_power_dir, ns=(compiled_mtime + 1000, compiled_mtime + 1000)
+        )
+
+        assert not material.StoppingPowerList("C").load_bundle()
+        assert material.StoppingPowerList.for_element("C").stopping_powers[0.01] == (
+            511.72
+        )
+
+    def test_compile_float32(self):
+        material.compile_stopping_powers("float32")
+        stop_list = material.StoppingPowerList.for_element("C")
+
+        assert stop_list.energies.dtype == numpy.float32
+        assert stop_list.for_alpha(4.25) == pytest.approx(906.4551, rel=1e-6)
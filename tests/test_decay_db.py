@@ -0,0 +1,158 @@
+import gzip
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+from neucbot import decay_db
+from neucbot.alpha import AlphaList, ChainAlphaList
+
+NUCLIDES = [
+    ("Bi", 212),
+    ("Po", 212),
+    ("Po", 216),
+    ("Ra", 224),
+    ("Rn", 220),
+    ("Th", 228),
+    ("Th", 232),
+]
+
+BETA_DECAY = """212PO    212BI B- DECAY (60.55 M)      1973DA38,1984GE07         20NDS    202009
+212BI  P 0.0          1(-)              60.55 M  6              2252.1    17
+212PO  N 1.0          1.0      0.6406   6
+212PO  L 0.0          0+"""
+
+EXCITED_ALPHA_DECAY = """208TL    212BI A DECAY (25.0 M)        1984ES01,1978BA44         07NDS    200707
+212BI  P 250         (9-)              25.0 M   2              6207.26   3
+208TL  A 6340       20 0.5"""
+
+
+def write_dump(file_path, datasets, opener=open):
+    with opener(file_path, "wt") as file:
+        file.write("\n\n".join(dataset.strip("\n") for dataset in datasets))
+        file.write("\n\n")
+
+
+def decay_files():
+    datasets = [BETA_DECAY, EXCITED_ALPHA_DECAY]
+
+    for element, isotope in NUCLIDES:
+        with open(f"./Data/Decays/ensdf/{element}{isotope}.dat") as file:
+            datasets.append(file.read())
+
+    return datasets
+
+
+class TestImport(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dump_path = os.path.join(self.tmp_dir.name, "ensdf_001.txt")
+        self.db_path = os.path.join(self.tmp_dir.name, "Decays", "ensdf.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parse_nucid(self):
+        self.assertEqual(decay_db.parse_nucid("212BI"), ("Bi", 212))
+        self.assertEqual(decay_db.parse_nucid("  4HE"), ("He", 4))
+        self.assertEqual(decay_db.parse_nucid(" 13C "), ("C", 13))
+        self.assertIsNone(decay_db.parse_nucid("     "))
+
+    def test_imports_ground_state_alpha_decays(self):
+        write_dump(self.dump_path, decay_files())
+
+        self.assertEqual(
+            decay_db.import_files([self.dump_path], self.db_path), len(NUCLIDES)
+        )
+
+        with decay_db.DecayDatabase(self.db_path) as database:
+            self.assertEqual(database.nuclides(), sorted(NUCLIDES))
+
+            # Alpha lists match the ones written from the same decay files
+            for element, isotope in NUCLIDES:
+                alpha_list = AlphaList(element, isotope)
+                self.assertEqual(database.alphas(element, isotope), alpha_list.load())
+
+            self.assertIsNone(database.alphas("U", 238))
+            self.assertTrue(
+                database.decay_file("Bi", 212).startswith(
+                    "208TL    212BI A DECAY (60.55 M)"
+                )
+            )
+
+    def test_keeps_first_dataset_of_each_parent(self):
+        write_dump(self.dump_path, decay_files())
+        duplicate_path = os.path.join(self.tmp_dir.name, "ensdf_002.txt.gz")
+        write_dump(
+            duplicate_path,
+            [decay_files()[-1].replace("78.2", "50.0")],
+            opener=gzip.open,
+        )
+
+        decay_db.import_files([self.dump_path, duplicate_path], self.db_path)
+
+        with decay_db.DecayDatabase(self.db_path) as database:
+            self.assertEqual(database.alphas("Th", 232), AlphaList("Th", 232).load())
+
+    def test_missing_database(self):
+        database = decay_db.DecayDatabase(self.db_path)
+
+        self.assertIsNone(database.alphas("Bi", 212))
+        self.assertEqual(database.nuclides(), [])
+        self.assertFalse(os.path.exists(self.db_path))
+
+
+class TestResolveFromDatabase(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        dump_path = os.path.join(self.tmp_dir.name, "ensdf.txt")
+        db_path = os.path.join(self.tmp_dir.name, "ensdf.sqlite")
+        write_dump(dump_path, decay_files())
+        decay_db.import_files([dump_path], db_path)
+
+        # No alpha list files, so alpha lists come from the database
+        self.patchers = [
+            patch.object(decay_db, "DECAY_DB_PATH", db_path),
+            patch("neucbot.alpha.ALPHA_LIST_DIR", self.tmp_dir.name),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmp_dir.cleanup()
+
+    @patch("neucbot.ensdf.fetch_all")
+    @patch.object(AlphaList, "write")
+    def test_load_or_fetch(self, mocked_write, mocked_fetch_all):
+        alpha_list = AlphaList("Bi", 212)
+        alphas = alpha_list.load_or_fetch()
+
+        self.assertEqual(
+            alphas,
+            [
+                [6.08988, 27.12],
+                [6.05078, 69.91],
+                [5.768, 1.7],
+                [5.626, 0.157],
+                [5.607, 1.13],
+                [5.481, 0.013],
+                [5.345, 0.001],
+                [5.302, 0.00011],
+            ],
+        )
+        self.assertFalse(os.path.exists(alpha_list.file_path))
+        mocked_write.assert_not_called()
+
+        chain_list = ChainAlphaList("Th", 232)
+        chain_list.file_path = "./Chains/Th232Chain.dat"
+        chain_list.load_or_fetch()
+
+        self.assertEqual(len(chain_list._alpha_lists), 7)
+        self.assertEqual(
+            chain_list.alphas[:3],
+            [[4.0123, 78.2], [3.9471999999999996, 21.7], [3.8110999999999997, 0.069]],
+        )
+        mocked_write.assert_not_called()
+        mocked_fetch_all.assert_not_called()
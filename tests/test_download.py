@@ -0,0 +1,303 @@
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from unittest.mock import patch
+
+from neucbot import download
+
+FILES = {
+    "TalysOut/outputE1.05": "./tests/test_material/TalysOut/outputE1.05",
+    "NSpectra/nspec1.05.tot": "./tests/test_material/C13Nspec.txt",
+}
+
+
+# Builds a gzipped tarball laid out like the dataset archives, with
+# incompressible padding so that it spans several reads
+def make_archive(symbol, mass_number):
+    buffer = io.BytesIO()
+
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, file_path in FILES.items():
+            archive.add(file_path, f"{symbol}/{symbol}{mass_number}/{name}")
+
+        padding = os.urandom(256 * 1024)
+        info = tarfile.TarInfo(f"{symbol}/{symbol}{mass_number}/padding")
+        info.size = len(padding)
+        archive.addfile(info, io.BytesIO(padding))
+
+    return buffer.getvalue()
+
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        file_path = os.path.join(server.mirror_dir, self.path.lstrip("/"))
+
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Range")))
+
+        if not os.path.exists(file_path):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with open(file_path, "rb") as file:
+            content = file.read()
+
+        start = 0
+        if range_header := self.headers.get("Range"):
+            start = int(range_header[len("bytes=") : -1])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}"
+            )
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(len(content) - start))
+        self.end_headers()
+
+        # Drops the connection after cut_after bytes, once
+        with server.lock:
+            cut_after, server.cut_after = server.cut_after, None
+
+        if cut_after is not None:
+            self.wfile.write(content[start : start + cut_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+
+        self.wfile.write(content[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestArchiveLocation(TestCase):
+    def test_github(self):
+        assert (
+            download.archive_location(download.DEFAULT_SOURCE, "v2", "C")
+            == "https://github.com/neucbot-datasets/c_v2/raw/HEAD/C.tar.gz"
+        )
+        assert (
+            download.archive_location(download.DEFAULT_SOURCE, "v1", "Ca")
+            == "https://github.com/neucbot-datasets/ca/raw/HEAD/Ca.tar.gz"
+        )
+
+    def test_mirrors(self):
+        assert (
+            download.archive_location("http://mirror/datasets/", "v2", "O")
+            == "http://mirror/datasets/o_v2/O.tar.gz"
+        )
+        assert download.archive_location("file:///srv/datasets", "v2", "O") == (
+            "/srv/datasets/o_v2/O.tar.gz"
+        )
+        assert download.archive_location("/srv/datasets", "v1", "O") == (
+            "/srv/datasets/o/O.tar.gz"
+        )
+
+    def test_unknown_version(self):
+        with self.assertRaisesRegex(RuntimeError, r"Unknown dataset version v3"):
+            download.archive_location(download.DEFAULT_SOURCE, "v3", "C")
+
+
+class TestDownload(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mirror_dir = os.path.join(self.tmp_dir, "mirror")
+        self.isotopes_dir = os.path.join(self.tmp_dir, "Isotopes")
+
+        self.archives = {}
+        for symbol, mass_number in [("C", 13), ("O", 17)]:
+            repository_dir = os.path.join(self.mirror_dir, f"{symbol.lower()}_v2")
+            os.makedirs(repository_dir)
+
+            self.archives[symbol] = make_archive(symbol, mass_number)
+            with open(os.path.join(repository_dir, f"{symbol}.tar.gz"), "wb") as file:
+                file.write(self.archives[symbol])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def archive_path(self, symbol):
+        return os.path.join(self.mirror_dir, f"{symbol.lower()}_v2", f"{symbol}.tar.gz")
+
+    def part_file_path(self, symbol):
+        return os.path.join(self.isotopes_dir, f"{symbol}.tar.gz.part")
+
+    def assert_installed(self, symbol, mass_number):
+        isotope_dir = os.path.join(self.isotopes_dir, symbol, f"{symbol}{mass_number}")
+
+        for name, file_path in FILES.items():
+            with open(os.path.join(isotope_dir, name)) as installed, open(
+                file_path
+            ) as expected:
+                assert installed.read() == expected.read()
+
+        # Nothing but the unpacked element directories is left behind
+        assert sorted(os.listdir(self.isotopes_dir)) == sorted(
+            set(os.listdir(self.isotopes_dir)) & {"C", "O"}
+        )
+
+    def test_local_directory(self):
+        download.download_elements(
+            ["C", "O"], "v2", self.mirror_dir, isotopes_dir=self.isotopes_dir
+        )
+
+        self.assert_installed("C", 13)
+        self.assert_installed("O", 17)
+
+    def test_file_url_with_checksum(self):
+        with open(f"{self.archive_path('C')}.sha256", "w") as file:
+            digest = hashlib.sha256(self.archives["C"]).hexdigest()
+            file.write(f"{digest}  C.tar.gz\n")
+
+        download.download_elements(
+            ["C"], "v2", f"file://{self.mirror_dir}", isotopes_dir=self.isotopes_dir
+        )
+
+        self.assert_installed("C", 13)
+
+    def test_checksum_mismatch(self):
+        with open(f"{self.archive_path('C')}.sha256", "w") as file:
+            file.write(f"{'0' * 64}  C.tar.gz\n")
+
+        with self.assertRaisesRegex(RuntimeError, r"C: Checksum mismatch"):
+            download.download_elements(
+                ["C"], "v2", self.mirror_dir, isotopes_dir=self.isotopes_dir
+            )
+
+        assert os.listdir(self.isotopes_dir) == []
+
+    def test_resumes_from_part_file(self):
+        os.makedirs(self.isotopes_dir)
+        with open(self.part_file_path("C"), "wb") as file:
+            file.write(self.archives["C"][:1000])
+
+        with patch.object(
+            download, "open_archive", wraps=download.open_archive
+        ) as mocked_open_archive:
+            download.download_element(
+                "C", "v2", self.mirror_dir, isotopes_dir=self.isotopes_dir
+            )
+
+        assert mocked_open_archive.call_args.args[1] == 1000
+        self.assert_installed("C", 13)
+
+    def test_corrupt_part_file_is_removed(self):
+        os.makedirs(self.isotopes_dir)
+        with open(self.part_file_path("C"), "wb") as file:
+            file.write(b"not an archive")
+
+        with self.assertRaisesRegex(RuntimeError, r"Unable to unpack"):
+            download.download_element(
+                "C", "v2", self.mirror_dir, isotopes_dir=self.isotopes_dir
+            )
+
+        assert os.listdir(self.isotopes_dir) == []
+
+    def test_missing_element(self):
+        with self.assertRaisesRegex(RuntimeError, r"Unable to download data for N:"):
+            download.download_elements(
+                ["C", "N"], "v2", self.mirror_dir, isotopes_dir=self.isotopes_dir
+            )
+
+        self.assert_installed("C", 13)
+
+
+class TestHTTPDownload(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.isotopes_dir = os.path.join(self.tmp_dir, "Isotopes")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MirrorHandler)
+        self.server.mirror_dir = os.path.join(self.tmp_dir, "mirror")
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.cut_after = None
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        self.thread.start()
+        self.source = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.archives = {}
+        for symbol, mass_number in [("C", 13), ("H", 2), ("O", 17)]:
+            repository_dir = os.path.join(
+                self.server.mirror_dir, f"{symbol.lower()}_v2"
+            )
+            os.makedirs(repository_dir)
+
+            self.archives[symbol] = make_archive(symbol, mass_number)
+            with open(os.path.join(repository_dir, f"{symbol}.tar.gz"), "wb") as file:
+                file.write(self.archives[symbol])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmp_dir)
+
+    def archive_requests(self):
+        return [
+            (path, range_header)
+            for path, range_header in self.server.requests
+            if path.endswith(".tar.gz")
+        ]
+
+    def test_downloads_each_element_once(self):
+        download.download_elements(
+            ["C", "H", "C", "O", "H"],
+            "v2",
+            self.source,
+            concurrency=2,
+            isotopes_dir=self.isotopes_dir,
+        )
+
+        assert sorted(self.archive_requests()) == [
+            ("/c_v2/C.tar.gz", None),
+            ("/h_v2/H.tar.gz", None),
+            ("/o_v2/O.tar.gz", None),
+        ]
+        assert sorted(os.listdir(self.isotopes_dir)) == ["C", "H", "O"]
+
+    def test_resumes_interrupted_transfer(self):
+        self.server.cut_after = 100000
+
+        with patch.object(download.ensdf, "RETRY_BACKOFF_FACTOR", 0):
+            with self.assertRaisesRegex(RuntimeError, r"Unable to download data for C"):
+                download.download_elements(
+                    ["C"], "v2", self.source, retries=0, isotopes_dir=self.isotopes_dir
+                )
+
+        part_file_path = os.path.join(self.isotopes_dir, "C.tar.gz.part")
+        with open(part_file_path, "rb") as file:
+            received = file.read()
+
+        # Whatever arrived before the connection dropped is kept
+        assert 0 < len(received) <= 100000
+        assert received == self.archives["C"][: len(received)]
+        assert not os.path.exists(os.path.join(self.isotopes_dir, "C"))
+
+        download.download_elements(
+            ["C"], "v2", self.source, isotopes_dir=self.isotopes_dir
+        )
+
+        assert self.archive_requests() == [
+            ("/c_v2/C.tar.gz", None),
+            ("/c_v2/C.tar.gz", f"bytes={len(received)}-"),
+        ]
+        assert os.listdir(self.isotopes_dir) == ["C"]
+
+        with open(
+            os.path.join(self.isotopes_dir, "C", "C13", "NSpectra", "nspec1.05.tot")
+        ) as installed, open("./tests/test_material/C13Nspec.txt") as expected:
+            assert installed.read() == expected.read()
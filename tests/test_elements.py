@@ -1,3 +1,4 @@
+import json
 import pytest
 
 from neucbot import elements
@@ -22,3 +23,16 @@ class TestElements:
         carbon = elements.Element("C")
         assert carbon.abundance("12") == pytest.approx(0.9890)
         assert carbon.abundance("13") == pytest.approx(0.0110)
+
+    def test_isotope_table_matches_json(self):
+        with open(elements.ELEMENTS_JSON) as file:
+            assert elements.ISOTOPES == json.load(file)
+
+    def test_write_isotope_table(self, tmp_path):
+        table_path = tmp_path / "isotope_table.py"
+
+        elements.write_isotope_table(table_path=table_path)
+
+        namespace = {}
+        exec(table_path.read_text(), namespace)
+        assert namespace["ISOTOPES"] == elements.ISOTOPES
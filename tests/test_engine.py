@@ -0,0 +1,62 @@
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy
+
+from neucbot import engine, material, utils
+
+
+class TestYieldTensors(TestCase):
+    def setUp(self):
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+        self.condensed = [[2.0, 50.0], [2.0, 50.0], [1.0, 100.0]]
+
+    @patch.object(material.Isotope, "cross_section", return_value=2e-27)
+    @patch.object(
+        material.Isotope,
+        "differential_n_spec",
+        return_value=utils.Histogram({100: 1.0, 200: 3.0}),
+    )
+    @patch.object(material.Composition, "stopping_power", return_value=50)
+    def test_build(self, mocked_stop_power, mocked_diff_n_spec, mocked_cross_sect):
+        tensors = engine.YieldTensors.build(self.condensed, self.comp, 0.5)
+
+        numpy.testing.assert_array_equal(tensors.energies, [2.0, 2.0, 1.0])
+        numpy.testing.assert_array_equal(tensors.deltas, [0.5, 0.5, 0.5])
+        numpy.testing.assert_array_equal(tensors.bins, [100, 200])
+
+        assert tensors.names == ["C12", "O16", "H1"]
+        assert tensors.cross_sections.shape == (3, 3)
+        assert tensors.spectra.shape == (3, 3, 2)
+        numpy.testing.assert_array_equal(tensors.spectra[1, 2], [1.0, 3.0])
+
+    @patch.object(material.Isotope, "cross_section", return_value=2e-27)
+    @patch.object(
+        material.Isotope,
+        "differential_n_spec",
+        return_value=utils.Histogram({100: 1.0, 200: 3.0}),
+    )
+    @patch.object(material.Composition, "stopping_power", return_value=50)
+    def test_contract(self, mocked_stop_power, mocked_diff_n_spec, mocked_cross_sect):
+        results = engine.YieldTensors.build(self.condensed, self.comp, 0.5).contract()
+
+        # Sum of intensity / 100 * dE / S(E) over all steps
+        step_sum = (0.5 + 0.5 + 1.0) * 0.5 / 50
+        mat_terms = {m.name(): m.material_term() for m in self.comp.materials}
+        total_mat_term = sum(mat_terms.values())
+
+        assert results["cross_sections"] == {
+            name: pytest.approx(step_sum * term * 2e-27)
+            for name, term in mat_terms.items()
+        }
+        assert results["total_cross_section"] == pytest.approx(
+            step_sum * total_mat_term * 2e-27
+        )
+        assert results["spectra_totals"] == {
+            100: pytest.approx(step_sum * total_mat_term * 1.0),
+            200: pytest.approx(step_sum * total_mat_term * 3.0),
+        }
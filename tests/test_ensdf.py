@@ -1,10 +1,16 @@
+import os
 import pytest
 import re
+import tempfile
+import threading
+import time
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase
 from unittest.mock import call, Mock, patch
 from requests import Session
 from requests.exceptions import HTTPError
+from neucbot import ensdf
 from neucbot.ensdf import Client, Parser, REQUEST_HEADERS, URL_BASE
 
 
@@ -169,6 +175,127 @@ class TestClient(TestCase):
         self.assertEqual(mocked_get.call_count, 3)
 
 
+# Stand-in for the NNDC server, answering every search with the Bi212 search
+# results and every dataset request with the Bi212 alpha decay page
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+
+        with server.lock:
+            server.requests.append(self.path)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = server.failures > 0
+            server.failures -= 1
+
+        time.sleep(server.delay)
+
+        if fail:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            if self.path.startswith("/decaysearchdirect"):
+                file_path = "./tests/test_ensdf/bi212_search_results.html"
+            else:
+                file_path = "./tests/test_ensdf/bi212.html"
+
+            with open(file_path, "rb") as file:
+                content = file.read()
+
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestFetchAll(TestCase):
+    ISOTOPES = [("Bi", 212), ("Po", 212), ("Po", 216), ("Rn", 220)]
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.failures = 0
+        self.server.delay = 0.05
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        self.thread.start()
+        self.url_base = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch.object(ensdf, "DECAY_DATA_DIR", self.tmp_dir.name)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp_dir.cleanup()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_fetches_all_decay_files(self):
+        decay_files = ensdf.fetch_all(
+            self.ISOTOPES, concurrency=2, url_base=self.url_base
+        )
+
+        with open("./tests/test_ensdf/bi212.txt") as file:
+            expected = file.read().strip()
+
+        self.assertEqual(
+            list(decay_files), [(element, str(A)) for element, A in self.ISOTOPES]
+        )
+        for element, isotope in self.ISOTOPES:
+            file_path = f"{self.tmp_dir.name}/{element}{isotope}.dat"
+            self.assertTrue(os.path.exists(file_path))
+            self.assertEqual(decay_files[(element, str(isotope))], expected)
+
+        # One search and one dataset request per isotope, at most 2 at once
+        self.assertEqual(len(self.server.requests), 2 * len(self.ISOTOPES))
+        self.assertLessEqual(self.server.max_in_flight, 2)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_skips_existing_decay_files(self):
+        ensdf.fetch_all(self.ISOTOPES[:1], url_base=self.url_base)
+        self.server.requests.clear()
+
+        ensdf.fetch_all(self.ISOTOPES, url_base=self.url_base)
+
+        self.assertEqual(len(self.server.requests), 2 * (len(self.ISOTOPES) - 1))
+        self.assertFalse(any("nuc=212BI" in path for path in self.server.requests))
+
+    def test_retries_failed_requests(self):
+        self.server.failures = 2
+
+        with patch.object(ensdf, "RETRY_BACKOFF_FACTOR", 0):
+            decay_files = ensdf.fetch_all(
+                self.ISOTOPES[:1], retries=2, url_base=self.url_base
+            )
+
+        self.assertEqual(len(decay_files), 1)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_raises_when_retries_are_exhausted(self):
+        self.server.failures = 100
+
+        with patch.object(ensdf, "RETRY_BACKOFF_FACTOR", 0):
+            with self.assertRaisesRegex(RuntimeError, r"Bi212.*Po212"):
+                ensdf.fetch_all(self.ISOTOPES[:2], retries=1, url_base=self.url_base)
+
+        # The first attempt and one retry of each search
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertFalse(os.listdir(self.tmp_dir.name))
+
+
 class TestParser(TestCase):
     def test_parse(self):
         with open("./tests/test_ensdf/bi212.txt", "r") as file:
@@ -0,0 +1,250 @@
+import io
+import json
+import numpy
+import os
+import pytest
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from neucbot import alpha, config, ensemble, material, runner, talys
+
+
+class TestEnsembleSpec(TestCase):
+    def test_from_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(tmp_dir, "spec.json")
+
+        with open(file_path, "w") as file:
+            json.dump(
+                {
+                    "realizations": 10,
+                    "seed": 3,
+                    "stopping_powers": {"c": 0.05},
+                    "cross_sections": {"o16": 0.1},
+                },
+                file,
+            )
+
+        spec = ensemble.EnsembleSpec.from_file(file_path)
+        shutil.rmtree(tmp_dir)
+
+        assert spec.realizations == 10
+        assert spec.seed == 3
+        assert spec.stopping_powers == {"C": 0.05}
+        assert spec.cross_sections == {"O16": 0.1}
+        assert spec.intensities == 0
+        assert spec.percentiles == ensemble.DEFAULT_PERCENTILES
+
+    def test_invalid_specs(self):
+        with self.assertRaisesRegex(RuntimeError, r"Unknown ensemble spec keys: n"):
+            ensemble.EnsembleSpec({"n": 10})
+
+        with self.assertRaisesRegex(RuntimeError, r"at least one realization"):
+            ensemble.EnsembleSpec({"realizations": 0}).validate()
+
+        with self.assertRaisesRegex(RuntimeError, r"must not be negative"):
+            ensemble.EnsembleSpec({"cross_sections": {"C": -0.1}}).validate()
+
+        with self.assertRaisesRegex(RuntimeError, r"between 0 and 100"):
+            ensemble.EnsembleSpec({"percentiles": [50, 101]}).validate()
+
+    def test_sample(self):
+        spec = ensemble.EnsembleSpec(
+            {
+                "realizations": 1000,
+                "seed": 1,
+                "stopping_powers": {"O": 0.1},
+                "cross_sections": {"C": 0.2, "O16": 0.05},
+            }
+        )
+        stopping_powers, cross_sections, intensities = spec.sample(
+            ["C", "O"], ["C12", "C13", "O16"], 4
+        )
+
+        assert stopping_powers.shape == (1000, 2)
+        assert cross_sections.shape == (1000, 3)
+        assert intensities.shape == (1000, 4)
+
+        assert numpy.all(stopping_powers[:, 0] == 1)
+        assert numpy.all(intensities == 1)
+        assert stopping_powers[:, 1].std() == pytest.approx(0.1, rel=0.1)
+        assert cross_sections[:, 1].std() == pytest.approx(0.2, rel=0.1)
+        assert cross_sections[:, 2].std() == pytest.approx(0.05, rel=0.1)
+
+        # The same seed draws the same realizations
+        assert numpy.array_equal(
+            cross_sections, spec.sample(["C", "O"], ["C12", "C13", "O16"], 4)[1]
+        )
+
+    def test_sample_unknown_names(self):
+        with self.assertRaisesRegex(RuntimeError, r"Element Ca is not in"):
+            ensemble.EnsembleSpec({"stopping_powers": {"Ca": 0.1}}).sample(
+                ["C"], ["C12"], 1
+            )
+
+        with self.assertRaisesRegex(RuntimeError, r"Isotope or element O17 is not"):
+            ensemble.EnsembleSpec({"cross_sections": {"O17": 0.1}}).sample(
+                ["O"], ["O16"], 1
+            )
+
+
+class TestEnsemble(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.isotopes_dir = tempfile.mkdtemp()
+        synthetic.generate(
+            cls.isotopes_dir,
+            [("C", 12), ("O", 16), ("H", 1)],
+            synthetic.energy_grid(3.0),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.isotopes_dir)
+
+    def setUp(self):
+        self.isotopes_dir_patch = patch.object(talys, "ISOTOPES_DIR", self.isotopes_dir)
+        self.isotopes_dir_patch.start()
+
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+        self.alpha_list = alpha.AlphaList("Bi", "212")
+        self.alpha_list.set_alphas([[2.6, 30.0], [2.95, 50.0], [1.8, 20.0]])
+
+        self.ensemble = ensemble.Ensemble.build(
+            self.alpha_list, self.comp, 0.01, progress=False
+        )
+
+    def tearDown(self):
+        self.isotopes_dir_patch.stop()
+
+    def nominal(self):
+        cfg = config.Config({"quiet": True})
+        condensed_alphas = self.alpha_list.condense(0.01)
+
+        return runner.create_runner(cfg).compute(condensed_alphas, self.comp)
+
+    def evaluate(self, stopping_powers, cross_sections, intensities, batch_size=64):
+        return self.ensemble.evaluate(
+            numpy.array(stopping_powers, dtype=float),
+            numpy.array(cross_sections, dtype=float),
+            numpy.array(intensities, dtype=float),
+            batch_size,
+        )
+
+    def test_unperturbed_realization_matches_runner(self):
+        expected = self.nominal()
+        totals, isotope_totals, spectra_totals = self.evaluate(
+            [[1, 1, 1]], [[1, 1, 1]], [[1, 1, 1]]
+        )
+
+        assert totals[0] == pytest.approx(expected["total_cross_section"], rel=1e-12)
+        assert list(isotope_totals[0]) == pytest.approx(
+            list(expected["cross_sections"].values()), rel=1e-12
+        )
+
+        assert list(spectra_totals[0]) == pytest.approx(
+            [
+                expected["spectra_totals"].get(int(e), 0)
+                for e in self.ensemble.tensors.bins
+            ],
+            rel=1e-12,
+            abs=1e-30,
+        )
+
+    def test_scales(self):
+        (nominal,), (isotope_nominal,), (spectrum_nominal,) = self.evaluate(
+            [[1, 1, 1]], [[1, 1, 1]], [[1, 1, 1]]
+        )
+
+        # Doubling every stopping power halves the yield
+        totals, _, spectra_totals = self.evaluate([[2, 2, 2]], [[1, 1, 1]], [[1, 1, 1]])
+        assert totals[0] == pytest.approx(nominal / 2, rel=1e-12)
+        assert list(spectra_totals[0]) == pytest.approx(
+            list(spectrum_nominal / 2), rel=1e-12
+        )
+
+        # Isotope scale factors only change their own isotope's yield
+        _, isotope_totals, _ = self.evaluate([[1, 1, 1]], [[3, 1, 0]], [[1, 1, 1]])
+        assert list(isotope_totals[0]) == pytest.approx(
+            [3 * isotope_nominal[0], isotope_nominal[1], 0], rel=1e-12
+        )
+
+    def test_intensity_scales_match_recondensed_alphas(self):
+        scales = [0.5, 1.2, 2.0]
+        sorted_alphas, _, _ = self.alpha_list.condensed_steps(0.01)
+
+        perturbed_list = alpha.AlphaList("Bi", "212")
+        perturbed_list.set_alphas(
+            [
+                [energy, intensity * scale]
+                for (energy, intensity), scale in zip(sorted_alphas, scales)
+            ]
+        )
+        cfg = config.Config({"quiet": True})
+        expected = runner.create_runner(cfg).compute(
+            perturbed_list.condense(0.01), self.comp
+        )
+
+        totals, _, _ = self.evaluate([[1, 1, 1]], [[1, 1, 1]], [scales])
+
+        assert totals[0] == pytest.approx(expected["total_cross_section"], rel=1e-12)
+
+    def test_batch_size_does_not_change_results(self):
+        spec = ensemble.EnsembleSpec(
+            {
+                "realizations": 10,
+                "seed": 7,
+                "stopping_powers": {"C": 0.05, "H": 0.1},
+                "cross_sections": {"O": 0.2},
+                "intensities": 0.02,
+            }
+        )
+        scales = spec.sample(["C", "O", "H"], self.ensemble.tensors.names, 3)
+
+        whole = self.ensemble.evaluate(*scales, batch_size=64)
+        batched = self.ensemble.evaluate(*scales, batch_size=3)
+
+        for expected, values in zip(whole, batched):
+            assert numpy.allclose(values, expected, rtol=1e-12, atol=0)
+
+    def test_run(self):
+        spec = ensemble.EnsembleSpec(
+            {"realizations": 50, "seed": 2, "cross_sections": {"C12": 0.1}}
+        )
+        results = ensemble.run(self.alpha_list, self.comp, spec, 0.01, progress=False)
+        expected = self.nominal()
+
+        assert results["total_cross_section"] == pytest.approx(
+            expected["total_cross_section"], rel=1e-12
+        )
+
+        summary = results["ensemble"]
+        assert summary["realizations"] == 50
+        assert list(summary["total_cross_section"]["percentiles"]) == [
+            5,
+            16,
+            50,
+            84,
+            95,
+        ]
+
+        # Only C12 is perturbed
+        assert summary["cross_sections"]["C12"]["std"] > 0
+        assert summary["cross_sections"]["O16"]["std"] == pytest.approx(
+            0, abs=1e-12 * expected["cross_sections"]["O16"]
+        )
+        assert summary["cross_sections"]["O16"]["mean"] == pytest.approx(
+            expected["cross_sections"]["O16"], rel=1e-12
+        )
+
+        output = io.StringIO()
+        ensemble.print_summary(results, output)
+
+        assert "# Ensemble of 50 realizations" in output.getvalue()
+        assert "# mean std p5 p16 p50 p84 p95" in output.getvalue()
@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from neucbot import config, manifest, material, runner, talys
+
+
+class TestEnergyManifest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.runner = talys.Runner("C", 13, self.tmp_dir)
+
+        for energy in [1.05, 1.06, 6.76]:
+            self.write(self.runner.output_file(energy), "output")
+            self.write(self.runner.spectra_file(energy), "EMPTY")
+
+        # A TALYS run that died before writing anything
+        self.write(self.runner.output_file(1.07), "")
+        self.write(self.runner.spectra_file(1.07), "")
+
+        self.age_directories()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, file_path, text):
+        with open(file_path, "w") as file:
+            file.write(text)
+
+    # Moves the modification times of the data directories out of the window
+    # in which they are not trusted
+    def age_directories(self, directories=None):
+        past = time.time_ns() - 10 * manifest.RACY_WINDOW_NS
+
+        for directory in directories or [
+            self.runner.output_dir,
+            self.runner.spectra_dir,
+        ]:
+            os.utime(directory, ns=(past, past))
+
+    def test_load(self):
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        assert energy_manifest.outputs == {105, 106, 676}
+        assert energy_manifest.spectra == {105, 106, 676}
+        assert energy_manifest.has_output(1.05)
+        assert energy_manifest.has_spectrum(6.76)
+        assert not energy_manifest.has_spectrum(1.07)
+
+        with open(energy_manifest.file_path()) as file:
+            data = json.load(file)
+
+        assert data["format_version"] == manifest.FORMAT_VERSION
+        assert data["outputs"] == [105, 106, 676]
+        assert data["directories"] == {
+            "TalysOut": os.stat(self.runner.output_dir).st_mtime_ns,
+            "NSpectra": os.stat(self.runner.spectra_dir).st_mtime_ns,
+        }
+
+    def test_unchanged_directories_are_not_listed(self):
+        manifest.EnergyManifest.load(self.runner)
+
+        with patch.object(manifest, "scan") as mocked_scan:
+            energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        mocked_scan.assert_not_called()
+        assert energy_manifest.spectra == {105, 106, 676}
+
+    def test_changed_directory_is_listed_again(self):
+        manifest.EnergyManifest.load(self.runner)
+
+        os.remove(self.runner.spectra_file(1.06))
+        self.write(self.runner.spectra_file(2.00), "EMPTY")
+        self.age_directories([self.runner.spectra_dir])
+
+        with patch.object(manifest, "scan", wraps=manifest.scan) as mocked_scan:
+            energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        mocked_scan.assert_called_once()
+        assert energy_manifest.outputs == {105, 106, 676}
+        assert energy_manifest.spectra == {105, 200, 676}
+
+    def test_recently_modified_directory_is_listed_again(self):
+        self.write(self.runner.output_file(2.00), "output")
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        assert energy_manifest.directory_mtimes["TalysOut"] is None
+        assert energy_manifest.outputs == {105, 106, 200, 676}
+
+        with patch.object(manifest, "scan", wraps=manifest.scan) as mocked_scan:
+            manifest.EnergyManifest.load(self.runner)
+
+        mocked_scan.assert_called_once_with(
+            self.runner.output_dir, manifest.datastore.OUTPUT_FILE_PATTERN
+        )
+
+    def test_no_manifest_without_data(self):
+        empty_runner = talys.Runner("O", 17, self.tmp_dir)
+        energy_manifest = manifest.EnergyManifest.load(empty_runner)
+
+        assert energy_manifest.outputs == set()
+        assert not os.path.exists(energy_manifest.file_path())
+
+    def test_update(self):
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        self.write(self.runner.output_file(2.00), "output")
+        os.remove(self.runner.spectra_file(1.05))
+        energy_manifest.update([2.00, 1.05])
+
+        assert energy_manifest.has_output(2.00)
+        assert not energy_manifest.has_spectrum(2.00)
+        assert energy_manifest.has_output(1.05)
+        assert not energy_manifest.has_spectrum(1.05)
+
+    def test_update_of_file_rewritten_in_place(self):
+        # The output of the crashed run at 1.07 is rewritten in place, which
+        # leaves the directory's modification time as recorded
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+        output_dir_mtime = os.stat(self.runner.output_dir).st_mtime_ns
+
+        self.write(self.runner.output_file(1.07), "output")
+        self.write(self.runner.spectra_file(1.07), "EMPTY")
+        energy_manifest.update([1.07])
+
+        assert os.stat(self.runner.output_dir).st_mtime_ns == output_dir_mtime
+
+        # Other processes see the rewritten files
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        assert energy_manifest.has_output(1.07)
+        assert energy_manifest.has_spectrum(1.07)
+
+    def test_concurrent_saves_use_own_temporary_files(self):
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        # Both threads have written their temporary file before either one
+        # replaces the manifest
+        barrier = threading.Barrier(2)
+        replace = os.replace
+        tmp_file_paths = []
+
+        def replace_together(source, destination):
+            tmp_file_paths.append(source)
+            barrier.wait(timeout=5)
+            replace(source, destination)
+
+        with patch("os.replace", side_effect=replace_together):
+            threads = [threading.Thread(target=energy_manifest.save) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(set(tmp_file_paths)) == 2
+        assert sorted(os.listdir(self.runner.base_path)) == [
+            "NSpectra",
+            "TalysInputs",
+            "TalysOut",
+            manifest.MANIFEST_FILE,
+        ]
+
+        with open(energy_manifest.file_path()) as file:
+            assert json.load(file)["outputs"] == [105, 106, 676]
+
+    def test_gaps(self):
+        energy_manifest = manifest.EnergyManifest.load(self.runner)
+
+        assert energy_manifest.gaps([1.04, 1.05, 1.06, 1.07, 6.76]) == [104, 107]
+
+    def test_format_ranges(self):
+        assert manifest.format_ranges([1, 2, 3, 12, 450, 451]) == (
+            "0.01-0.03, 0.12, 4.50-4.51 MeV"
+        )
+
+
+class TestCoverageReport(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        with patch.object(talys, "ISOTOPES_DIR", self.tmp_dir):
+            self.comp = material.Composition.from_file(
+                "./tests/test_material/WithIsotopes.dat"
+            )
+
+        carbon = self.comp.materials[0].talys_runner
+        for energy in [2.25, 2.5]:
+            for file_path in [carbon.output_file(energy), carbon.spectra_file(energy)]:
+                with open(file_path, "w") as file:
+                    file.write("EMPTY")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_report_coverage(self):
+        neucbot_runner = runner.NeucbotRunner(config.Config({}))
+        condensed_alphas = [[2.75, 1.0], [2.5, 1.0], [2.25, 1.0], [2.0, 1.0]]
+
+        with patch.object(neucbot_runner, "log") as mocked_log:
+            neucbot_runner.report_coverage(condensed_alphas, self.comp)
+
+        assert [args[0] for args, _ in mocked_log.call_args_list] == [
+            "C12 has no TALYS data for 2 of 4 alpha energies: 2.00, 2.75 MeV",
+            "O16 has no TALYS data for 4 of 4 alpha energies: 2.00, 2.25, 2.50, 2.75 MeV",
+            "H1 has no TALYS data for 4 of 4 alpha energies: 2.00, 2.25, 2.50, 2.75 MeV",
+        ]
@@ -1,17 +1,32 @@
 import pytest
+import numpy
+import shutil
+import tempfile
 
 from unittest import TestCase
 from unittest.mock import call, mock_open, patch
 
-from neucbot import elements, material
+from neucbot import cache, download, elements, manifest, material
 from neucbot.talys import Runner
 
 
 class TestIsotope(TestCase):
     def setUp(self):
+        cache.ISOTOPE_DATA.clear()
+
         carbon = elements.Element("C")
         self.isotope = material.Isotope(carbon, 13, 1.0)
 
+        # Energies with TALYS data are looked up in the isotope's manifest,
+        # which starts out empty here instead of listing ./Data/Isotopes
+        self.manifest = manifest.EnergyManifest(self.isotope.talys_runner)
+        self.isotope._energy_manifest = self.manifest
+
+        # TALYS runs update the manifest, which is not saved to ./Data/Isotopes
+        save_patch = patch.object(self.manifest, "save")
+        save_patch.start()
+        self.addCleanup(save_patch.stop)
+
         with open("./tests/test_material/C13Nspec.txt") as nspec_file:
             self.nspec_text = nspec_file.read()
 
@@ -30,46 +45,78 @@ class TestIsotope(TestCase):
         assert self.isotope.name() == "C13"
 
     @patch.object(Runner, "run")
-    @patch("os.path.exists", return_value=True)
-    def test_differential_n_spec_file_exists(self, mocked_exists, mocked_talys_run):
+    def test_differential_n_spec_file_exists(self, mocked_talys_run):
+        self.manifest.spectra.add(100)
+
         mocked_open = mock_open(read_data=self.nspec_text)
         with patch("builtins.open", mocked_open):
             assert (
                 self.isotope.differential_n_spec(1.0).to_dict() == self.expected_nspec
             )
 
-            mocked_exists.assert_has_calls(
+            mocked_open.assert_has_calls(
                 [
                     call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                    call("./Data/Isotopes/C/C13/TalysOut"),
                 ]
             )
 
-            mocked_open.assert_has_calls(
-                [
-                    call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                ]
+        mocked_talys_run.assert_not_called()
+
+    def test_differential_n_spec_shared_cache(self):
+        self.manifest.spectra.add(100)
+
+        with patch("builtins.open", mock_open(read_data=self.nspec_text)):
+            self.isotope.differential_n_spec(1.0)
+
+        # A fresh Isotope for the same nuclide is served from the process-wide
+        # cache without reading the spectra file again
+        fresh_isotope = material.Isotope(elements.Element("C"), 13, 0.5)
+        mocked_open = mock_open(read_data="")
+        with patch("builtins.open", mocked_open):
+            assert (
+                fresh_isotope.differential_n_spec(1.0).to_dict() == self.expected_nspec
             )
+            mocked_open.assert_not_called()
+
+        assert cache.ISOTOPE_DATA.stats()["hits"] == 1
+
+    @patch.object(Runner, "run")
+    @patch("neucbot.manifest.valid_file", return_value=True)
+    def test_differential_n_spec_force_recalculation_invalidates_cache(
+        self, mocked_valid_file, mocked_talys_run
+    ):
+        self.manifest.spectra.add(100)
+
+        with patch("builtins.open", mock_open(read_data=self.nspec_text)):
+            self.isotope.differential_n_spec(1.0)
+
+        with patch("builtins.open", mock_open(read_data="EMPTY")):
+            assert self.isotope.differential_n_spec(1.0, False, True).to_dict() == {}
 
-    @patch("os.path.exists", return_value=False)
-    def test_differential_n_spec_no_file_no_talys(self, mocked_exists):
+    def test_missing_talys_energies(self):
+        self.manifest.spectra.add(609)
+
+        assert self.isotope.missing_talys_energies([6.095, 6.09, 6.08]) == [6.08]
+        assert self.isotope.missing_talys_energies([6.09, 6.08], True) == [
+            6.08,
+            6.09,
+        ]
+
+    @patch("builtins.open")
+    def test_differential_n_spec_no_file_no_talys(self, mocked_open):
         assert self.isotope.differential_n_spec(1.0, False).to_dict() == {}
-        mocked_exists.assert_has_calls(
-            [
-                call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-            ]
-        )
+        mocked_open.assert_not_called()
 
     @patch.object(Runner, "run")
-    @patch("os.path.exists")
+    @patch("neucbot.manifest.valid_file")
     def test_differential_n_spec_no_file_run_talys(
-        self, mocked_exists, mocked_talys_run
+        self, mocked_valid_file, mocked_talys_run
     ):
-        mocked_exists.side_effect = [
-            False,  # File doesn't exist initially
-            False,  # Before first TALYS Run
-            True,  # Found after first TALYS Run
-            True,  # TALYS Output directory exists
+        mocked_valid_file.side_effect = [
+            False,  # No output after the first TALYS run
+            False,  # No spectra after the first TALYS run
+            True,  # Output found after the second TALYS run
+            True,  # Spectra found after the second TALYS run
         ]
 
         mocked_open = mock_open(read_data=self.nspec_text)
@@ -85,51 +132,27 @@ class TestIsotope(TestCase):
                 ]
             )
 
-            mocked_exists.assert_has_calls(
-                [
-                    # First check
-                    call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                    # Before successful TALYS run
-                    call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                    # After successful TALYS run
-                    call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                    call("./Data/Isotopes/C/C13/TalysOut"),
-                ]
-            )
-
-    @patch.object(Runner, "run")
-    @patch("os.path.exists", return_value=False)
-    def test_differential_n_spec_no_file_run_talys_no_successful_retries(
-        self, mocked_exists, mocked_talys_run
-    ):
-        assert self.isotope.differential_n_spec(1.0, True).to_dict() == {}
-        mocked_exists.assert_has_calls(
+        assert mocked_talys_run.call_count == 2
+        mocked_valid_file.assert_has_calls(
             [
-                # First check
-                call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                # Three failed attempts
-                call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
+                call("./Data/Isotopes/C/C13/TalysOut/outputE1.0"),
                 call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
             ]
         )
+        assert self.manifest.has_output(1.0) and self.manifest.has_spectrum(1.0)
 
-    @patch("os.path.exists")
-    def test_differential_n_spec_no_output_dir(self, mocked_exists):
-        mocked_exists.side_effect = [True, False]
-        assert self.isotope.differential_n_spec(1.0).to_dict() == {}
-
-        mocked_exists.assert_has_calls(
-            [
-                call("./Data/Isotopes/C/C13/NSpectra/nspec001.000.tot"),
-                call("./Data/Isotopes/C/C13/TalysOut"),
-            ]
-        )
+    @patch.object(Runner, "run")
+    @patch("neucbot.manifest.valid_file", return_value=False)
+    def test_differential_n_spec_no_file_run_talys_no_successful_retries(
+        self, mocked_valid_file, mocked_talys_run
+    ):
+        assert self.isotope.differential_n_spec(1.0, True).to_dict() == {}
+        assert mocked_talys_run.call_count == 3
 
     @patch.object(Runner, "run")
-    @patch("os.path.exists", return_value=True)
+    @patch("neucbot.manifest.valid_file", return_value=True)
     def test_differential_n_spec_force_recalculation(
-        self, mocked_exists, mocked_talys_run
+        self, mocked_valid_file, mocked_talys_run
     ):
         mocked_open = mock_open(read_data=self.nspec_text)
         with patch("builtins.open", mocked_open):
@@ -144,8 +167,11 @@ class TestIsotope(TestCase):
                 ]
             )
 
-    @patch("os.path.exists", return_value=True)
-    def test_cross_section_valid_file(self, mocked_exists):
+        mocked_talys_run.assert_called_once_with(1.0)
+
+    def test_cross_section_valid_file(self):
+        self.manifest.outputs.update([105, 676, 677, 678, 679])
+
         with open("./tests/test_material/TalysOut/outputE6.79") as talys_out_file:
             talys_out_text = talys_out_file.read()
             with patch("builtins.open", mock_open(read_data=talys_out_text)):
@@ -171,9 +197,53 @@ class TestIsotope(TestCase):
             with patch("builtins.open", mock_open(read_data=talys_out_text)):
                 assert self.isotope.cross_section(1.05) == 1.51335e-28
 
+    def test_cross_section_shared_cache(self):
+        self.manifest.outputs.add(679)
+
+        with open("./tests/test_material/TalysOut/outputE6.79") as talys_out_file:
+            talys_out_text = talys_out_file.read()
+            with patch("builtins.open", mock_open(read_data=talys_out_text)):
+                self.isotope.cross_section(6.79)
+
+        fresh_isotope = material.Isotope(elements.Element("C"), 13, 0.5)
+        mocked_open = mock_open(read_data="")
+        with patch("builtins.open", mocked_open):
+            assert fresh_isotope.cross_section(6.79) == 3.40154e-25
+            mocked_open.assert_not_called()
+
+    def test_cross_section_cache_per_data_directory(self):
+        self.manifest.outputs.add(679)
+
+        with open("./tests/test_material/TalysOut/outputE6.79") as talys_out_file:
+            with patch("builtins.open", mock_open(read_data=talys_out_file.read())):
+                self.isotope.cross_section(6.79)
+
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        with patch("neucbot.talys.ISOTOPES_DIR", tmp_dir):
+            other_isotope = material.Isotope(elements.Element("C"), 13, 1.0)
+        other_isotope._energy_manifest = manifest.EnergyManifest(
+            other_isotope.talys_runner
+        )
+        other_isotope._energy_manifest.outputs.add(679)
+
+        with open("./tests/test_material/TalysOut/outputE6.78") as talys_out_file:
+            mocked_open = mock_open(read_data=talys_out_file.read())
+            with patch("builtins.open", mocked_open):
+                assert other_isotope.cross_section(6.79) == 3.39437e-25
+                mocked_open.assert_called_once_with(
+                    other_isotope.talys_runner.output_file(6.79), "r"
+                )
+
+    def test_cross_section_missing_file_not_cached(self):
+        assert self.isotope.cross_section(5.55) == 0
+        assert len(cache.ISOTOPE_DATA) == 0
+
     @patch("re.search", return_value=None)
-    @patch("os.path.exists", return_value=True)
-    def test_cross_section_no_file_content_match(self, mocked_exists, mocked_search):
+    def test_cross_section_no_file_content_match(self, mocked_search):
+        self.manifest.outputs.add(777)
+
         mocked_open = mock_open(read_data=self.nspec_text)
         with patch("builtins.open", mocked_open):
             assert self.isotope.cross_section(7.77) == 0
@@ -184,13 +254,12 @@ class TestIsotope(TestCase):
                 ]
             )
 
-    @patch("os.path.exists", return_value=False)
-    def test_cross_section_no_file_exists(self, mocked_exists):
-        assert self.isotope.cross_section(5.55) == 0
+    @patch("builtins.open")
+    def test_cross_section_no_file_exists(self, mocked_open):
+        self.manifest.spectra.add(555)
 
-        mocked_exists.assert_has_calls(
-            [call("./Data/Isotopes/C/C13/TalysOut/outputE5.55")]
-        )
+        assert self.isotope.cross_section(5.55) == 0
+        mocked_open.assert_not_called()
 
 
 class TestComposition(TestCase):
@@ -277,9 +346,35 @@ class TestComposition(TestCase):
         # 25% stopping power of O = 0.25 * 462.8758
         assert comp.stopping_power(11.0) == 701.5617
 
-    @patch("subprocess.call")
+    def test_stopping_power_table(self):
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+        energies = [11.0, 4.25, 0.525, 0.001]
+
+        table = comp.stopping_power_table(energies)
+
+        numpy.testing.assert_allclose(
+            table, [comp.stopping_power(energy) for energy in energies]
+        )
+        assert comp.stopping_power_table(energies) is table
+
+    def test_stopping_power_tables_bounded(self):
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+        first = comp.stopping_power_table([1.0])
+
+        for step in range(material.STOPPING_POWER_TABLES):
+            comp.stopping_power_table([2.0 + step])
+
+        assert len(comp._stopping_power_tables) == material.STOPPING_POWER_TABLES
+        assert comp.stopping_power_table([1.0]) is not first
+
+    def test_stopping_power_table_empty_composition(self):
+        comp = material.Composition()
+
+        numpy.testing.assert_array_equal(comp.stopping_power_table([1.0, 2.0]), [0, 0])
+
+    @patch("neucbot.download.download_elements")
     @patch("os.listdir", return_value=["data"])
-    def test_download_data_all_data_present(self, mocked_listdir, mocked_call):
+    def test_download_data_all_data_present(self, mocked_listdir, mocked_download):
         comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
 
         comp.download_data("v2")
@@ -295,11 +390,11 @@ class TestComposition(TestCase):
             ]
         )
 
-        mocked_call.assert_has_calls([])
+        mocked_download.assert_not_called()
 
-    @patch("subprocess.call")
+    @patch("neucbot.download.download_elements")
     @patch("os.listdir", return_value=[])
-    def test_download_data_missing_data(self, mocked_listdir, mocked_call):
+    def test_download_data_missing_data(self, mocked_listdir, mocked_download):
         comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
 
         comp.download_data("v2")
@@ -312,12 +407,35 @@ class TestComposition(TestCase):
             ]
         )
 
-        mocked_call.assert_has_calls(
-            [
-                call("./Scripts/download_element_v2.sh C", shell=True),
-                call("./Scripts/download_element_v2.sh O", shell=True),
-                call("./Scripts/download_element_v2.sh H", shell=True),
-            ]
+        mocked_download.assert_called_once_with(
+            ["C", "O", "H"], "v2", download.DEFAULT_SOURCE
+        )
+
+    @patch("neucbot.download.download_elements")
+    @patch("os.listdir", return_value=[])
+    def test_download_data_once_per_element(self, mocked_listdir, mocked_download):
+        comp = material.Composition.from_file("./tests/test_material/NoIsotopes.dat")
+
+        comp.download_data("v1", "/mirror")
+
+        # Natural carbon and oxygen have several isotopes each
+        assert len(comp.materials) > 3
+        mocked_download.assert_called_once_with(["C", "O", "H"], "v1", "/mirror")
+
+    @patch(
+        "neucbot.download.download_elements",
+        side_effect=RuntimeError("Unable to download data for C: offline"),
+    )
+    @patch("os.listdir", return_value=[])
+    def test_download_data_failure_is_skipped(self, mocked_listdir, mocked_download):
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        with patch("builtins.print") as mocked_print:
+            comp.download_data("v2")
+
+        mocked_download.assert_called_once()
+        mocked_print.assert_called_with(
+            "Unable to download data for C: offline, continuing without it"
         )
 
 
@@ -342,3 +460,12 @@ class TestStoppingPowerList(TestCase):
 
         # Energy higher than the highest in the list
         assert stop_list.for_alpha(11.0) == 486.0835
+
+    def test_for_alpha_array(self):
+        stop_list = material.StoppingPowerList("C")
+        stop_list.load_file()
+
+        numpy.testing.assert_allclose(
+            stop_list.for_alpha(numpy.array([0.001, 0.525, 4.25, 11.0])),
+            [511.72, 1927.124, 906.4551, 486.0835],
+        )
@@ -0,0 +1,110 @@
+import pytest
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from neucbot import config, material, parallel, runner, talys
+
+
+class TestShards(TestCase):
+    def test_contiguous_ranges(self):
+        self.assertEqual(parallel.contiguous_ranges(10, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(parallel.contiguous_ranges(2, 4), [(0, 1), (1, 2)])
+        self.assertEqual(parallel.contiguous_ranges(0, 4), [(0, 0)])
+
+    def test_make_shards(self):
+        self.assertEqual(
+            parallel.make_shards(10, 3, 2, "energy"),
+            [((0, 5), [0, 1, 2]), ((5, 10), [0, 1, 2])],
+        )
+        self.assertEqual(
+            parallel.make_shards(10, 3, 2, "isotope"),
+            [((0, 10), [0]), ((0, 10), [1, 2])],
+        )
+
+        with self.assertRaisesRegex(RuntimeError, r"Unknown shard kind"):
+            parallel.make_shards(10, 3, 2, "bins")
+
+
+class TestParallelRunner(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.isotopes_dir = tempfile.mkdtemp()
+        synthetic.generate(
+            cls.isotopes_dir,
+            [("C", 12), ("O", 16), ("H", 1)],
+            synthetic.energy_grid(3.0),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.isotopes_dir)
+
+    def setUp(self):
+        self.isotopes_dir_patch = patch.object(talys, "ISOTOPES_DIR", self.isotopes_dir)
+        self.isotopes_dir_patch.start()
+
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+        energies = synthetic.energy_grid(3.0)[::-1]
+        self.condensed_alphas = [[energies[0], 40.0]] + [
+            [energy, 40.0 if energy > 2.0 else 100.0] for energy in energies
+        ]
+
+    def tearDown(self):
+        self.isotopes_dir_patch.stop()
+
+    def compute(self, args):
+        cfg = config.Config({"quiet": True, **args})
+
+        return runner.create_runner(cfg).compute(self.condensed_alphas, self.comp)
+
+    def test_matches_serial_loop(self):
+        expected = self.compute({})
+
+        self.assertGreater(expected["total_cross_section"], 0)
+
+        for shard_by in ["energy", "isotope"]:
+            results = self.compute(
+                {"engine": "parallel", "jobs": 3, "shard_by": shard_by}
+            )
+
+            self.assertEqual(
+                results["total_cross_section"],
+                pytest.approx(expected["total_cross_section"], rel=1e-12),
+            )
+            self.assertEqual(list(results["cross_sections"]), ["C12", "O16", "H1"])
+            self.assertEqual(
+                results["cross_sections"],
+                pytest.approx(expected["cross_sections"], rel=1e-12),
+            )
+            self.assertEqual(
+                sorted(results["spectra_totals"]), sorted(expected["spectra_totals"])
+            )
+            self.assertEqual(
+                results["spectra_totals"],
+                pytest.approx(expected["spectra_totals"], rel=1e-12),
+            )
+
+    def test_deterministic(self):
+        args = {"engine": "parallel", "jobs": 2}
+
+        self.assertEqual(self.compute(args), self.compute(args))
+
+    @patch.object(parallel, "compute")
+    def test_single_job_runs_serial_loop(self, mocked_parallel_compute):
+        results = self.compute({"engine": "parallel", "jobs": 1})
+
+        mocked_parallel_compute.assert_not_called()
+        self.assertEqual(results, self.compute({}))
+
+    def test_validate(self):
+        with self.assertRaisesRegex(RuntimeError, r"Unknown shard kind"):
+            config.Config({"shard_by": "bins"}).validate()
+
+        with self.assertRaisesRegex(RuntimeError, r"at least one"):
+            config.Config({"jobs": -2}).validate()
@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from neucbot import (
+    alpha,
+    cache,
+    config,
+    datastore,
+    material,
+    profiling,
+    runner,
+    talys,
+    utils,
+)
+
+
+class TestProfiler(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_phase_is_a_no_op_without_profiler(self):
+        with profiling.phase("compute"):
+            profiling.count("anything")
+
+        self.assertIsNone(profiling.ACTIVE)
+
+    def test_restores_functions(self):
+        original = material.Isotope.__dict__["cross_section"]
+        from_file = material.Composition.__dict__["from_file"]
+        store_init = datastore.IsotopeDataStore.__dict__["__init__"]
+
+        with profiling.Profiler():
+            self.assertIsNot(material.Isotope.__dict__["cross_section"], original)
+            self.assertIsInstance(
+                material.Composition.__dict__["from_file"], classmethod
+            )
+
+        self.assertIs(material.Isotope.__dict__["cross_section"], original)
+        self.assertIs(material.Composition.__dict__["from_file"], from_file)
+        self.assertIs(datastore.IsotopeDataStore.__dict__["__init__"], store_init)
+        self.assertIsNone(profiling.ACTIVE)
+
+    def test_only_one_active_profiler(self):
+        with profiling.Profiler():
+            with self.assertRaisesRegex(RuntimeError, r"already active"):
+                profiling.Profiler().start()
+
+    def test_records_files_phases_and_self_time(self):
+        with profiling.Profiler() as profiler:
+            with profiling.phase("load"):
+                alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+                alpha_list.load_or_fetch()
+                material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+            utils.Histogram({1000: 1.0, 1100: 2.0}).rebin()
+            profiling.count("custom", 2)
+
+        report = profiler.report()
+
+        self.assertEqual(report["phases"]["load"]["calls"], 1)
+        self.assertEqual(report["functions"]["alpha.AlphaList.load"]["calls"], 1)
+        self.assertEqual(
+            report["functions"]["material.Composition.from_file"]["calls"], 1
+        )
+        self.assertEqual(report["functions"]["utils.Histogram.rebin"]["calls"], 1)
+        self.assertEqual(report["counters"], {"custom": 2})
+
+        # Self time of the phase excludes the profiled calls made inside it
+        load = report["phases"]["load"]
+        self.assertLess(load["self_time"], load["total_time"])
+        self.assertGreaterEqual(load["self_time"], 0)
+
+        # The alpha list, the material file and its stopping power tables
+        # (unless already loaded by an earlier test)
+        self.assertGreaterEqual(report["io"]["files_opened"], 2)
+        self.assertGreaterEqual(
+            report["io"]["bytes_read"],
+            os.path.getsize("AlphaLists/Bi212Alphas.dat")
+            + os.path.getsize("./tests/test_material/WithIsotopes.dat"),
+        )
+
+    @patch.object(material.Isotope, "cross_section", return_value=1e-27)
+    @patch.object(
+        material.Isotope, "rebinned_n_spec", return_value=utils.Histogram({1000: 1})
+    )
+    def test_run_report(self, mocked_rebinned_n_spec, mocked_cross_sect):
+        alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+        alpha_list.load_or_fetch()
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+        file_path = os.path.join(self.tmp_dir, "profile.json")
+
+        with profiling.Profiler() as profiler:
+            runner.NeucbotRunner(config.Config({"quiet": True})).run(alpha_list, comp)
+
+        profiler.write(file_path)
+
+        with open(file_path) as file:
+            report = json.load(file)
+
+        self.assertEqual(
+            sorted(report),
+            ["caches", "counters", "functions", "io", "phases", "wall_time"],
+        )
+        self.assertEqual(list(report["phases"]), ["condense", "compute"])
+        self.assertEqual(
+            report["functions"]["material.Composition.stopping_power_table"]["calls"],
+            1,
+        )
+        self.assertEqual(
+            sorted(report["caches"]["isotope_data"]),
+            ["bytes", "entries", "evictions", "hit_rate", "hits", "misses"],
+        )
+        self.assertGreaterEqual(
+            report["wall_time"], report["phases"]["compute"]["total_time"]
+        )
+
+    def test_records_mapped_stores_and_manifests(self):
+        isotopes_dir = os.path.join(self.tmp_dir, "Isotopes")
+        synthetic.generate(isotopes_dir, [("C", 12)], synthetic.energy_grid(2.0))
+        bundle = os.path.join(self.tmp_dir, "stopping_powers.npy")
+
+        with patch.object(talys, "ISOTOPES_DIR", isotopes_dir), patch.object(
+            material, "STOPPING_POWER_BUNDLE", bundle
+        ), patch.dict(material.STOPPING_POWER_LISTS, clear=True), patch.dict(
+            datastore.OPEN_STORES, clear=True
+        ):
+            comp = material.Composition.from_file(
+                "./tests/test_material/CarbonOnly.dat"
+            )
+            with patch("sys.stdout"):
+                comp.compile_data()
+
+            # Listing the TALYS directories writes each isotope's manifest
+            manifest_bytes = sum(
+                os.path.getsize(isotope.energy_manifest().file_path())
+                for isotope in comp.materials
+            )
+
+            cache.ISOTOPE_DATA.clear()
+            material.STOPPING_POWER_LISTS.clear()
+            datastore.OPEN_STORES.clear()
+
+            with profiling.Profiler() as profiler:
+                comp = material.Composition.from_file(
+                    "./tests/test_material/CarbonOnly.dat"
+                )
+                for isotope in comp.materials:
+                    isotope.cross_section(1.5)
+                    isotope.energy_manifest()
+
+        stores = [bundle] + [
+            isotope.talys_runner.compiled_file() for isotope in comp.materials
+        ]
+        io = profiler.report()["io"]
+
+        self.assertEqual(io["files_mapped"], len(stores))
+        self.assertEqual(
+            io["bytes_mapped"], sum(os.path.getsize(store) for store in stores)
+        )
+        self.assertGreaterEqual(io["bytes_read"], manifest_bytes)
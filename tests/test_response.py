@@ -0,0 +1,240 @@
+import os
+import shutil
+import tempfile
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy
+
+from neucbot import alpha, cache, config, material, response, runner, utils
+
+
+# Cross sections and spectra that vary with the (truncated) alpha energy, and
+# spectra whose bins depend on it, so that results depend on which grid
+# energies an alpha list visits
+def cross_section(alpha_energy):
+    return int(100 * alpha_energy) * 1e-29
+
+
+def rebinned_n_spec(alpha_energy, run_talys=False, force_recalculation=False):
+    rounded_alpha_energy = int(100 * alpha_energy) / 100.0
+
+    if rounded_alpha_energy < 1:
+        return utils.Histogram()
+
+    return utils.Histogram(
+        {
+            100: rounded_alpha_energy,
+            100 * int(rounded_alpha_energy): 2 * rounded_alpha_energy,
+        }
+    )
+
+
+@patch.object(material.Isotope, "cross_section", side_effect=cross_section)
+@patch.object(material.Isotope, "rebinned_n_spec", side_effect=rebinned_n_spec)
+@patch.object(material.Composition, "stopping_power", side_effect=lambda e: 100 + e)
+class TestResponse(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.responses_dir = patch(
+            "neucbot.response.RESPONSES_DIR", os.path.join(self.tmp_dir, "Responses")
+        )
+        self.responses_dir.start()
+        response.RESPONSES.clear()
+
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+
+    def tearDown(self):
+        self.responses_dir.stop()
+        response.RESPONSES.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def loop_results(self, condensed_alphas, step_size=0.01):
+        cfg = config.Config({"quiet": True})
+
+        return runner.NeucbotRunner(cfg).compute(condensed_alphas, self.comp, step_size)
+
+    def test_grid_index(self, *mocks):
+        # 100 * 0.29 is just below 29, and truncates to 28 as in
+        # Isotope.cross_section
+        numpy.testing.assert_array_equal(
+            response.grid_index([0.29, 0.005, 6.09, 6.0899999]), [28, 0, 609, 608]
+        )
+
+    def test_evaluate_matches_loop_runner(self, *mocks):
+        for file_path, step_size in [
+            ("AlphaLists/Bi212Alphas.dat", 0.01),
+            ("AlphaLists/Bi212Alphas.dat", 0.05),
+            ("AlphaLists/Po212Alphas.dat", 0.01),
+        ]:
+            alpha_list = alpha.AlphaList.from_filepath(file_path)
+            alpha_list.load_or_fetch()
+            condensed_alphas = alpha_list.condense(step_size)
+
+            material_response = response.Response.load_or_build(
+                self.comp, progress=False
+            )
+            results = material_response.evaluate(
+                condensed_alphas,
+                self.comp.stopping_power_table([e for e, _ in condensed_alphas]),
+                step_size,
+            )
+            expected = self.loop_results(condensed_alphas, step_size)
+
+            assert results["total_cross_section"] == pytest.approx(
+                expected["total_cross_section"]
+            )
+            assert results["cross_sections"] == pytest.approx(
+                expected["cross_sections"]
+            )
+            assert list(results["spectra_totals"]) == sorted(expected["spectra_totals"])
+            assert results["spectra_totals"] == pytest.approx(
+                expected["spectra_totals"]
+            )
+
+    def test_load_or_build_saves_and_reuses(self, *mocks):
+        built = response.Response.load_or_build(self.comp, progress=False)
+
+        files = os.listdir(response.RESPONSES_DIR)
+        assert len(files) == 1
+
+        # Same process: reused from memory
+        assert response.Response.load_or_build(self.comp, progress=False) is built
+
+        # New process: read back from disk
+        response.RESPONSES.clear()
+        with patch.object(response.Response, "build") as mocked_build:
+            loaded = response.Response.load_or_build(self.comp, progress=False)
+
+        mocked_build.assert_not_called()
+        assert loaded.names == built.names
+        numpy.testing.assert_array_equal(loaded.spectra, built.spectra)
+        numpy.testing.assert_array_equal(loaded.present, built.present)
+
+    def test_load_or_build_extends_grid(self, *mocks):
+        default = response.Response.load_or_build(self.comp, progress=False)
+        extended = response.Response.load_or_build(self.comp, 12.345, progress=False)
+
+        assert len(default.spectra) == 1001
+        assert len(extended.spectra) == 1235
+
+    def test_responses_bounded_in_memory(self, *mocks):
+        default = response.Response.load_or_build(self.comp, progress=False)
+
+        assert response.RESPONSES.bytes == default.nbytes()
+        assert default.nbytes() >= default.spectra.nbytes
+
+        # Room for one response only
+        with patch.object(
+            response, "RESPONSES", cache.LRUCache(default.nbytes() * 3 // 2)
+        ):
+            first = response.Response.load_or_build(self.comp, progress=False)
+            response.Response.load_or_build(self.comp, 12.345, progress=False)
+
+            assert len(response.RESPONSES) == 1
+            assert response.RESPONSES.evictions == 1
+            assert response.Response.load_or_build(self.comp, progress=False) is not (
+                first
+            )
+
+    def test_response_key(self, *mocks):
+        key = response.response_key(self.comp, 1000)
+
+        assert key == response.response_key(self.comp, 1000)
+        assert key != response.response_key(self.comp, 1100)
+        assert key != response.response_key(self.comp, 1000, step=50)
+
+        other = material.Composition.from_file("./tests/test_material/CarbonOnly.dat")
+        assert key != response.response_key(other, 1000)
+
+    def test_response_key_changes_with_data(self, *mocks):
+        with patch("neucbot.talys.ISOTOPES_DIR", self.tmp_dir):
+            comp = material.Composition.from_file(
+                "./tests/test_material/CarbonOnly.dat"
+            )
+
+        key = response.response_key(comp, 1000)
+
+        talys_runner = comp.materials[0].talys_runner
+        with open(talys_runner.output_file(5.0), "w") as file:
+            file.write("neutron = 1.00000E+00")
+
+        assert key != response.response_key(comp, 1000)
+
+    def test_response_key_changes_with_file_edited_in_place(self, *mocks):
+        with patch("neucbot.talys.ISOTOPES_DIR", self.tmp_dir):
+            comp = material.Composition.from_file(
+                "./tests/test_material/CarbonOnly.dat"
+            )
+
+        talys_runner = comp.materials[0].talys_runner
+        with open(talys_runner.output_file(5.0), "w") as file:
+            file.write("neutron = 1.00000E+00")
+
+        directories = [
+            talys_runner.base_path,
+            talys_runner.output_dir,
+            talys_runner.spectra_dir,
+        ]
+        for directory in directories:
+            os.utime(directory, ns=(10**18, 10**18))
+
+        key = response.response_key(comp, 1000)
+
+        # Rewriting a file in place leaves its directory's time unchanged
+        with open(talys_runner.output_file(5.0), "w") as file:
+            file.write("neutron = 2.00000E+00")
+        os.utime(talys_runner.output_dir, ns=(10**18, 10**18))
+
+        assert key != response.response_key(comp, 1000)
+
+
+class TestResponseNeucbotRunner(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        response.RESPONSES.clear()
+
+    def tearDown(self):
+        response.RESPONSES.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    @patch.object(material.Isotope, "cross_section", side_effect=cross_section)
+    @patch.object(material.Isotope, "rebinned_n_spec", side_effect=rebinned_n_spec)
+    @patch.object(material.Composition, "stopping_power", return_value=100)
+    def test_compute(self, mocked_stop_power, mocked_rebinned, mocked_cross_sect):
+        alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+        alpha_list.load_or_fetch()
+        condensed_alphas = alpha_list.condense(0.01)
+
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        with patch("neucbot.response.RESPONSES_DIR", self.tmp_dir):
+            results = runner.create_runner(
+                config.Config({"engine": "response", "quiet": True})
+            ).compute(condensed_alphas, comp)
+
+        expected = runner.NeucbotRunner(config.Config({"quiet": True})).compute(
+            condensed_alphas, comp
+        )
+
+        assert list(results["cross_sections"]) == list(expected["cross_sections"])
+        assert results["total_cross_section"] == pytest.approx(
+            expected["total_cross_section"]
+        )
+
+    @patch.object(runner.NeucbotRunner, "compute", return_value={})
+    @patch.object(runner.NeucbotRunner, "prepare_talys", return_value=False)
+    def test_compute_with_serial_talys_uses_loop(
+        self, mocked_prepare_talys, mocked_compute
+    ):
+        cfg = config.Config({"engine": "response", "talys": True, "quiet": True})
+
+        with patch.object(response.Response, "load_or_build") as mocked_load:
+            runner.create_runner(cfg).compute([[1.0, 100]], None)
+
+        mocked_compute.assert_called_once()
+        mocked_load.assert_not_called()
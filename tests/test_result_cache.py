@@ -0,0 +1,165 @@
+import os
+import shutil
+import tempfile
+import pytest
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from neucbot import config, material, result_cache, runner, utils
+
+CONDENSED_ALPHAS = [[6.09, 27.12], [6.09, 27.12], [6.08, 27.12]]
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.results_dir = patch(
+            "neucbot.result_cache.RESULTS_DIR", os.path.join(self.tmp_dir, "Results")
+        )
+        self.results_dir.start()
+
+        with patch("neucbot.talys.ISOTOPES_DIR", self.tmp_dir):
+            self.comp = material.Composition.from_file(
+                "./tests/test_material/CarbonOnly.dat"
+            )
+
+    def tearDown(self):
+        self.results_dir.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_and_load(self):
+        results = {
+            "total_cross_section": 0.1 + 0.2,
+            "cross_sections": {"C12": 1 / 3, "C13": 2 / 3},
+            "spectra_totals": {100: 1e-300, 200: 5.0},
+        }
+
+        assert result_cache.load("key") is None
+
+        result_cache.save("key", results)
+
+        assert result_cache.load("key") == results
+        assert os.listdir(result_cache.RESULTS_DIR) == ["key.json"]
+
+    def test_result_key(self):
+        key = result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+        assert key == result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+        assert key != result_cache.result_key(CONDENSED_ALPHAS[:2], self.comp, 0.01)
+        assert key != result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.05)
+        assert key != result_cache.result_key(
+            CONDENSED_ALPHAS, self.comp, 0.01, run_talys=True
+        )
+
+        with patch("neucbot.utils.HISTO_DELTA_BIN", 50):
+            assert key != result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+    def test_result_key_changes_with_fractions(self):
+        key = result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+        self.comp.materials[0].fraction *= 2
+
+        assert key != result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+    def test_result_key_changes_with_isotope_data(self):
+        key = result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+        talys_runner = self.comp.materials[0].talys_runner
+        with open(talys_runner.spectra_file(6.09), "w") as file:
+            file.write("EMPTY")
+
+        assert key != result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+    def test_result_key_changes_with_file_edited_in_place(self):
+        talys_runner = self.comp.materials[0].talys_runner
+        with open(talys_runner.output_file(6.09), "w") as file:
+            file.write("neutron = 1.00000E+00")
+
+        directories = [
+            talys_runner.base_path,
+            talys_runner.output_dir,
+            talys_runner.spectra_dir,
+        ]
+        for directory in directories:
+            os.utime(directory, ns=(10**18, 10**18))
+
+        key = result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+        # Rewriting a file in place leaves its directory's time unchanged
+        with open(talys_runner.output_file(6.09), "w") as file:
+            file.write("neutron = 2.00000E+00")
+        os.utime(talys_runner.output_dir, ns=(10**18, 10**18))
+
+        assert key != result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+    def test_result_key_changes_with_stopping_powers(self):
+        key = result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+        stopping_powers = self.comp.stopping_powers["C"]
+        stat = os.stat(stopping_powers.file_path())
+        real_stat = os.stat
+
+        def touched_stat(path, *args, **kwargs):
+            if path == stopping_powers.file_path():
+                return os.stat_result(stat[:8] + (stat.st_mtime + 1, stat.st_ctime))
+
+            return real_stat(path, *args, **kwargs)
+
+        with patch("os.stat", side_effect=touched_stat):
+            assert key != result_cache.result_key(CONDENSED_ALPHAS, self.comp, 0.01)
+
+
+@patch.object(material.Isotope, "cross_section", return_value=1e-27)
+@patch.object(
+    material.Isotope, "rebinned_n_spec", return_value=utils.Histogram({1000: 1})
+)
+@patch.object(material.Composition, "stopping_power", return_value=100)
+class TestRunnerResultCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.results_dir = patch("neucbot.result_cache.RESULTS_DIR", self.tmp_dir)
+        self.results_dir.start()
+
+        self.comp = material.Composition.from_file(
+            "./tests/test_material/WithIsotopes.dat"
+        )
+
+    def tearDown(self):
+        self.results_dir.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def cached_compute(self, args):
+        neucbot = runner.NeucbotRunner(config.Config({"quiet": True, **args}))
+
+        with patch.object(
+            runner.NeucbotRunner, "compute", wraps=neucbot.compute
+        ) as mocked_compute:
+            results = neucbot.cached_compute(CONDENSED_ALPHAS, self.comp)
+
+        return results, mocked_compute.call_count
+
+    def test_cached_compute(self, *mocks):
+        results, computed = self.cached_compute({"cache_results": True})
+        assert computed == 1
+
+        cached_results, computed = self.cached_compute({"cache_results": True})
+        assert computed == 0
+        assert cached_results == results
+
+    def test_cached_compute_disabled(self, *mocks):
+        self.cached_compute({})
+        _, computed = self.cached_compute({})
+
+        assert computed == 1
+        assert os.listdir(self.tmp_dir) == []
+
+    def test_cached_compute_force_recalculation(self, *mocks):
+        self.cached_compute({"cache_results": True})
+
+        with patch.object(runner.NeucbotRunner, "prepare_talys", return_value=False):
+            _, computed = self.cached_compute(
+                {"cache_results": True, "force_recalculation": True}
+            )
+
+        assert computed == 1
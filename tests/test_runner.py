@@ -5,7 +5,7 @@ from unittest.mock import call, patch
 
 import numpy
 
-from neucbot import alpha, config, material, runner, utils
+from neucbot import alpha, config, material, runner, talys, utils
 
 
 class TestNeucbotRunner(TestCase):
@@ -37,3 +37,118 @@ class TestNeucbotRunner(TestCase):
         }
 
         assert neucbot.run(alpha_list, comp) == expected
+
+    @patch.object(material.Isotope, "cross_section", return_value=1e-27)
+    @patch.object(
+        material.Isotope, "rebinned_n_spec", return_value=utils.Histogram({1000: 1})
+    )
+    @patch.object(material.Composition, "stopping_power", return_value=100)
+    @patch.object(runner.NeucbotRunner, "print_outputs")
+    def test_run_quiet(
+        self,
+        mocked_print_outputs,
+        mocked_stop_power,
+        mocked_rebinned_n_spec,
+        mocked_cross_sect,
+    ):
+        cfg = config.Config({"quiet": True})
+        neucbot = runner.NeucbotRunner(cfg)
+
+        alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+        alpha_list.load_or_fetch()
+
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        with patch("builtins.print") as mocked_print:
+            results = neucbot.run(alpha_list, comp)
+
+        mocked_print.assert_not_called()
+        mocked_print_outputs.assert_not_called()
+        assert results == neucbot.compute(alpha_list.condense(0.01), comp)
+
+    @patch.object(talys, "run_parallel", return_value=[])
+    @patch.object(material.Isotope, "missing_talys_energies", return_value=[6.09, 6.08])
+    def test_prepare_talys_parallel(self, mocked_missing, mocked_run_parallel):
+        cfg = config.Config({"talys": True, "force_recalculation": True, "jobs": 4})
+        neucbot = runner.NeucbotRunner(cfg)
+
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        # Outputs have been recalculated in parallel, so the main loop must
+        # not force another recalculation
+        assert neucbot.prepare_talys([[6.09, 10], [6.08, 10]], comp) is False
+
+        mocked_missing.assert_has_calls([call([6.09, 6.08], True)] * 3)
+        mocked_run_parallel.assert_called_once_with(
+            [
+                ("C", 12, 6.08),
+                ("C", 12, 6.09),
+                ("H", 1, 6.08),
+                ("H", 1, 6.09),
+                ("O", 16, 6.08),
+                ("O", 16, 6.09),
+            ],
+            4,
+            False,
+        )
+
+    @patch.object(material.Isotope, "run_talys")
+    @patch.object(talys, "run_parallel", return_value=[("H", 1, 6.09)])
+    @patch.object(material.Isotope, "missing_talys_energies", return_value=[6.09])
+    def test_prepare_talys_parallel_failed_jobs(
+        self, mocked_missing, mocked_run_parallel, mocked_run_talys
+    ):
+        cfg = config.Config(
+            {"talys": True, "force_recalculation": True, "jobs": 4, "quiet": True}
+        )
+        neucbot = runner.NeucbotRunner(cfg)
+
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        # Jobs that failed in parallel are run again serially
+        assert neucbot.prepare_talys([[6.09, 10]], comp) is False
+
+        mocked_run_parallel.assert_called_once_with(
+            [("C", 12, 6.09), ("H", 1, 6.09), ("O", 16, 6.09)], 4, True
+        )
+        mocked_run_talys.assert_called_once_with(6.09)
+
+    @patch.object(talys, "run_parallel")
+    def test_prepare_talys_serial(self, mocked_run_parallel):
+        cfg = config.Config({"talys": True, "force_recalculation": True})
+        neucbot = runner.NeucbotRunner(cfg)
+
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        assert neucbot.prepare_talys([[6.09, 10]], comp) is True
+        mocked_run_parallel.assert_not_called()
+
+
+class TestVectorizedNeucbotRunner(TestCase):
+    @patch.object(material.Isotope, "cross_section", return_value=1e-27)
+    @patch.object(utils.Histogram, "rebin", return_value=utils.Histogram({1000: 1}))
+    @patch.object(
+        material.Isotope, "differential_n_spec", return_value=utils.Histogram()
+    )
+    @patch.object(material.Composition, "stopping_power", return_value=100)
+    def test_run_matches_loop_runner(
+        self, mocked_stop_power, mocked_diff_n_spec, mocked_rebin, mocked_cross_sect
+    ):
+        cfg = config.Config({})
+
+        alpha_list = alpha.AlphaList.from_filepath("AlphaLists/Bi212Alphas.dat")
+        alpha_list.load_or_fetch()
+
+        comp = material.Composition.from_file("./tests/test_material/WithIsotopes.dat")
+
+        expected = {
+            "cross_sections": {
+                "C12": pytest.approx(1.517498e-06),
+                "H1": pytest.approx(9.104992e-06),
+                "O16": pytest.approx(5.690620e-07),
+            },
+            "spectra_totals": {1000: pytest.approx(1.119155e22)},
+            "total_cross_section": pytest.approx(1.119155e-05),
+        }
+
+        assert runner.VectorizedNeucbotRunner(cfg).run(alpha_list, comp) == expected
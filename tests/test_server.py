@@ -0,0 +1,185 @@
+import io
+import json
+import threading
+import pytest
+
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+from urllib import request
+from urllib.error import HTTPError
+
+from neucbot import cache, config, material, runner, server, utils
+
+ALPHA_LIST_JSON = {
+    "element": "Bi",
+    "isotope": 212,
+    "alphas": {"6.08988": 27.12, "6.05078": 69.91, "5.768": 1.7},
+}
+
+COMPOSITION_JSON = {
+    "elements": [
+        {"element": "C", "mass_number": "12", "fraction": "33"},
+        {"element": "H", "mass_number": "1", "fraction": "33"},
+        {"element": "O", "mass_number": "16", "fraction": "34"},
+    ]
+}
+
+
+@patch.object(material.Isotope, "cross_section", return_value=1e-27)
+@patch.object(
+    material.Isotope,
+    "rebinned_n_spec",
+    return_value=utils.Histogram({1000: 1}),
+)
+@patch.object(material.Composition, "stopping_power", return_value=100)
+class TestNeucbotServer(TestCase):
+    def setUp(self):
+        cache.ISOTOPE_DATA.clear()
+
+        self.service = server.NeucbotService(workers=2)
+        self.httpd = server.NeucbotServer(self.service, port=0)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def post(self, path, body):
+        req = request.Request(
+            self.url + path,
+            data=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+
+        with request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+
+    def test_run(self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect):
+        body = {
+            "alpha_list": ALPHA_LIST_JSON,
+            "composition": COMPOSITION_JSON,
+            "step_size": 0.01,
+        }
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            status, result = self.post("/run", body)
+
+        assert status == 200
+        assert stdout.getvalue() == ""
+
+        expected = runner.NeucbotRunner(config.Config({"quiet": True})).compute(
+            self.service.condense(ALPHA_LIST_JSON, 0.01),
+            self.service.composition(COMPOSITION_JSON),
+            0.01,
+        )
+
+        assert set(result) == {
+            "total_cross_section",
+            "cross_sections",
+            "spectra_totals",
+        }
+        assert result["total_cross_section"] == pytest.approx(
+            expected["total_cross_section"]
+        )
+        assert result["cross_sections"] == pytest.approx(expected["cross_sections"])
+        assert result["spectra_totals"] == {
+            "1000": pytest.approx(expected["spectra_totals"][1000])
+        }
+
+    def test_run_engines_agree(
+        self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect
+    ):
+        body = {"alpha_list": ALPHA_LIST_JSON, "composition": COMPOSITION_JSON}
+
+        _, loop = self.post("/run", {**body, "engine": "loop"})
+        _, vectorized = self.post("/run", {**body, "engine": "vectorized"})
+
+        assert vectorized["total_cross_section"] == pytest.approx(
+            loop["total_cross_section"]
+        )
+        assert vectorized["spectra_totals"]["1000"] == pytest.approx(
+            loop["spectra_totals"]["1000"]
+        )
+
+    def test_run_reuses_compositions_and_alpha_lists(
+        self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect
+    ):
+        body = {"alpha_list": ALPHA_LIST_JSON, "composition": COMPOSITION_JSON}
+
+        with patch.object(
+            material.Composition,
+            "from_json",
+            wraps=material.Composition.from_json,
+        ) as mocked_from_json:
+            self.post("/run", body)
+            self.post("/run", body)
+
+        mocked_from_json.assert_called_once()
+
+        stats = self.service.health()
+        assert stats["requests"] == 2
+        assert stats["compositions"]["hits"] == 1
+        assert stats["condensed_alphas"]["hits"] == 1
+
+    def test_compositions_bounded_by_count(
+        self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect
+    ):
+        assert self.service.compositions.max_entries == server.MEMO_MAX_ENTRIES
+
+        for fraction in range(server.MEMO_MAX_ENTRIES + 1):
+            self.service.composition(
+                {
+                    "elements": [
+                        {
+                            "element": "C",
+                            "mass_number": "0",
+                            "fraction": str(fraction + 1),
+                        }
+                    ]
+                }
+            )
+
+        stats = self.service.health()["compositions"]
+        assert stats["entries"] == server.MEMO_MAX_ENTRIES
+        assert stats["evictions"] == 1
+
+    def test_run_invalid_request(
+        self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect
+    ):
+        with self.assertRaises(HTTPError) as context:
+            self.post("/run", {"composition": COMPOSITION_JSON})
+
+        assert context.exception.code == 400
+        assert "alpha_list" in json.loads(context.exception.read())["error"]
+
+    def test_run_invalid_json(
+        self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect
+    ):
+        req = request.Request(self.url + "/run", data=b"{not json")
+
+        with self.assertRaises(HTTPError) as context:
+            request.urlopen(req)
+
+        assert context.exception.code == 400
+
+    def test_health(self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect):
+        with request.urlopen(self.url + "/health") as response:
+            health = json.loads(response.read())
+
+        assert health["status"] == "ok"
+        assert health["workers"] == 2
+        assert health["isotope_data"]["max_bytes"] == cache.ISOTOPE_DATA.max_bytes
+
+    def test_unknown_path(
+        self, mocked_stop_power, mocked_rebinned_n_spec, mocked_cross_sect
+    ):
+        with self.assertRaises(HTTPError) as context:
+            request.urlopen(self.url + "/unknown")
+
+        assert context.exception.code == 404
@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+
+from unittest import TestCase
+
+# Libraries only needed to fetch decay data from the NNDC
+NETWORK_MODULES = ["requests", "urllib3", "bs4"]
+
+PRINT_MODULES = "import sys, json; print(json.dumps(sorted(sys.modules)))"
+
+
+def imported_modules(code):
+    output = subprocess.run(
+        [sys.executable, "-c", f"{code}\n{PRINT_MODULES}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+class TestStartup(TestCase):
+    def assert_not_imported(self, modules, names):
+        for name in names:
+            assert name not in modules, f"{name} was imported"
+
+    def test_import_neucbot(self):
+        modules = imported_modules(
+            "from neucbot import alpha, elements, ensdf, material, runner"
+        )
+
+        self.assert_not_imported(modules, NETWORK_MODULES + ["tqdm"])
+
+    def test_print_alphas_only(self):
+        modules = imported_modules(
+            "import runpy, sys\n"
+            "sys.argv = ['neucbot.py', '-l', 'AlphaLists/Bi212Alphas.dat', "
+            "'-m', 'Materials/Acrylic.dat', '--print-alphas-only']\n"
+            "runpy.run_path('neucbot.py', run_name='__main__')"
+        )
+
+        self.assert_not_imported(modules, NETWORK_MODULES + ["tqdm"])
@@ -0,0 +1,115 @@
+import io
+import os
+import pytest
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from neucbot import config, material, runner, sweep, talys
+
+MATERIAL_LINES = [("c", 0), ("o", 16), ("h", 0), ("c", 13)]
+BASE_FRACTIONS = [50.0, 30.0, 15.0, 5.0]
+FRACTION_VECTORS = [
+    BASE_FRACTIONS,
+    [60.0, 30.0, 10.0, 0.0],
+    [0.0, 80.0, 20.0, 1.0],
+    [1.0, 0.0, 0.0, 0.0],
+]
+
+
+class TestSweep(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.isotopes_dir = os.path.join(cls.tmp_dir, "Isotopes")
+        synthetic.generate(
+            cls.isotopes_dir,
+            [("C", 12), ("C", 13), ("O", 16), ("H", 1), ("H", 2)],
+            synthetic.energy_grid(3.0),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def setUp(self):
+        self.isotopes_dir_patch = patch.object(talys, "ISOTOPES_DIR", self.isotopes_dir)
+        self.isotopes_dir_patch.start()
+
+        self.comp = self.composition(BASE_FRACTIONS)
+        energies = synthetic.energy_grid(3.0)[::-1]
+        self.condensed_alphas = [[energies[0], 40.0]] + [
+            [energy, 40.0 if energy > 2.0 else 100.0] for energy in energies
+        ]
+
+    def tearDown(self):
+        self.isotopes_dir_patch.stop()
+
+    def composition(self, fractions):
+        file_path = os.path.join(self.tmp_dir, "material.dat")
+
+        with open(file_path, "w") as file:
+            for (symbol, mass_number), fraction in zip(MATERIAL_LINES, fractions):
+                file.write(f"{symbol} {mass_number} {fraction}\n")
+
+        return material.Composition.from_file(file_path)
+
+    def test_matches_independent_runs(self):
+        results = sweep.run(
+            self.condensed_alphas, self.comp, FRACTION_VECTORS, 0.01, progress=False
+        )
+        cfg = config.Config({"quiet": True})
+
+        assert len(results) == len(FRACTION_VECTORS)
+
+        for fractions, point in zip(FRACTION_VECTORS, results):
+            expected = runner.create_runner(cfg).compute(
+                self.condensed_alphas, self.composition(fractions)
+            )
+
+            assert point["fractions"] == fractions
+            assert point["total_cross_section"] == pytest.approx(
+                expected["total_cross_section"], rel=1e-12
+            )
+            assert list(point["cross_sections"]) == ["C12", "C13", "O16", "H1", "H2"]
+            for name, xsect in point["cross_sections"].items():
+                assert xsect == pytest.approx(
+                    expected["cross_sections"][name], rel=1e-12
+                )
+            for e, value in point["spectra_totals"].items():
+                assert value == pytest.approx(
+                    expected["spectra_totals"].get(e, 0), rel=1e-12, abs=1e-30
+                )
+
+    def test_invalid_fractions(self):
+        with self.assertRaisesRegex(RuntimeError, r"need 4 fractions, got 3"):
+            sweep.run(self.condensed_alphas, self.comp, [[1, 2, 3]], 0.01)
+
+        with self.assertRaisesRegex(RuntimeError, r"must not be negative"):
+            sweep.run(self.condensed_alphas, self.comp, [[1, 2, 3, -1]], 0.01)
+
+        with self.assertRaisesRegex(RuntimeError, r"need a nonzero fraction"):
+            sweep.run(self.condensed_alphas, self.comp, [[0, 0, 0, 0]], 0.01)
+
+    def test_read_fractions_and_print_table(self):
+        file_path = os.path.join(self.tmp_dir, "sweep.txt")
+        with open(file_path, "w") as file:
+            file.write("# c o h c13\n50 30 15 5\n\n60 30 10 0\n")
+
+        fraction_vectors = sweep.read_fractions(file_path)
+        assert fraction_vectors == [[50, 30, 15, 5], [60, 30, 10, 0]]
+
+        results = sweep.run(
+            self.condensed_alphas, self.comp, fraction_vectors, 0.01, progress=False
+        )
+        output = io.StringIO()
+        sweep.print_table(results, output)
+        lines = output.getvalue().splitlines()
+
+        assert lines[1] == "# Composition sweep of 2 points"
+        assert lines[2] == "# fractions total C12 C13 O16 H1 H2 (n/decay)"
+        assert lines[4].startswith("60 30 10 0 ")
+        assert len(lines[4].split()) == 4 + 1 + 5
@@ -1,9 +1,12 @@
+import os
 import pytest
+import shutil
+import tempfile
 
 from unittest import TestCase
 from unittest.mock import call, mock_open, patch
 
-from neucbot.talys import command_template, Runner
+from neucbot.talys import command_template, run_parallel, Runner
 
 
 @patch("os.makedirs")
@@ -43,7 +46,7 @@ class TestRunner(TestCase):
             mocked_subprocess_call.assert_has_calls(
                 [
                     call(
-                        "talys < ./Data/Isotopes/C/C12/TalysInputs/inputE1.0 > ./Data/Isotopes/C/C12/TalysOut/outputE1.0",
+                        "talys < ./Data/Isotopes/C/C12/TalysInputs/inputE1.0 > ./Data/Isotopes/C/C12/.outputE1.0.part",
                         shell=True,
                     ),
                 ]
@@ -53,17 +56,22 @@ class TestRunner(TestCase):
 
             mocked_replace.assert_has_calls(
                 [
+                    call(
+                        "./Data/Isotopes/C/C12/.outputE1.0.part",
+                        "./Data/Isotopes/C/C12/TalysOut/outputE1.0",
+                    ),
                     call(
                         "nspec001.000.tot",
                         "./Data/Isotopes/C/C12/NSpectra/nspec001.000.tot",
-                    )
+                    ),
                 ]
             )
 
+    @patch("os.replace")
     @patch("glob.glob")
     @patch("subprocess.call", return_value=0)
     def test_run_empty_nspec_files(
-        self, mocked_subprocess_call, mocked_glob, mocked_makedirs
+        self, mocked_subprocess_call, mocked_glob, mocked_replace, mocked_makedirs
     ):
         mocked_open = mock_open()
         with patch("builtins.open", mocked_open):
@@ -87,16 +95,29 @@ class TestRunner(TestCase):
                         )
                     ),
                     call().close(),
-                    call("./Data/Isotopes/C/C12/NSpectra/nspec001.000.tot", "w"),
+                    call("./Data/Isotopes/C/C12/.nspec001.000.tot.part", "w"),
                     call().write("EMPTY"),
                     call().close(),
                 ]
             )
 
+            mocked_replace.assert_has_calls(
+                [
+                    call(
+                        "./Data/Isotopes/C/C12/.outputE1.0.part",
+                        "./Data/Isotopes/C/C12/TalysOut/outputE1.0",
+                    ),
+                    call(
+                        "./Data/Isotopes/C/C12/.nspec001.000.tot.part",
+                        "./Data/Isotopes/C/C12/NSpectra/nspec001.000.tot",
+                    ),
+                ]
+            )
+
             mocked_subprocess_call.assert_has_calls(
                 [
                     call(
-                        "talys < ./Data/Isotopes/C/C12/TalysInputs/inputE1.0 > ./Data/Isotopes/C/C12/TalysOut/outputE1.0",
+                        "talys < ./Data/Isotopes/C/C12/TalysInputs/inputE1.0 > ./Data/Isotopes/C/C12/.outputE1.0.part",
                         shell=True,
                     ),
                 ]
@@ -115,3 +136,121 @@ class TestRunner(TestCase):
 
             with self.assertRaisesRegex(RuntimeError, r"Failed TALYS command:"):
                 runner.run(1.00)
+
+
+FAKE_TALYS = """#!/bin/sh
+energy=$(grep energy | cut -d' ' -f2)
+if [ "$energy" = "9.99" ]; then
+  exit 1
+fi
+echo " neutron = 1.00000E+00"
+echo "spectrum for $energy" > nspec.fake.tot
+"""
+
+
+class TestParallelRunner(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.bin_dir = os.path.join(self.tmp_dir, "bin")
+        os.makedirs(self.bin_dir)
+
+        talys_path = os.path.join(self.bin_dir, "talys")
+        with open(talys_path, "w") as file:
+            file.write(FAKE_TALYS)
+        os.chmod(talys_path, 0o755)
+
+        self.isotopes_dir = os.path.join(self.tmp_dir, "Isotopes")
+        self.environ = patch.dict(
+            os.environ, {"PATH": self.bin_dir + os.pathsep + os.environ["PATH"]}
+        )
+        self.environ.start()
+
+    def tearDown(self):
+        self.environ.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_run_replaces_output_of_failed_run(self):
+        with patch("neucbot.talys.ISOTOPES_DIR", self.isotopes_dir):
+            runner = Runner("C", 12)
+
+        # A crashed run left an empty output behind
+        open(runner.output_file(1.05), "w").close()
+        past = os.stat(runner.output_dir).st_mtime_ns - 10**10
+        os.utime(runner.output_dir, ns=(past, past))
+
+        # The serial runner looks for spectra in the working directory
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        try:
+            runner.run(1.05)
+        finally:
+            os.chdir(cwd)
+
+        with open(runner.output_file(1.05)) as file:
+            assert file.read() == " neutron = 1.00000E+00\n"
+
+        # Replacing the file marks the directory as changed
+        assert os.stat(runner.output_dir).st_mtime_ns != past
+        assert not os.path.exists(runner.partial_file("outputE1.05"))
+
+    def test_run_in_scratch_dir(self):
+        with patch("neucbot.talys.ISOTOPES_DIR", self.isotopes_dir):
+            runner = Runner("C", 12)
+            runner.run_in_scratch_dir(1.05)
+
+        with open(runner.output_file(1.05)) as file:
+            assert file.read() == " neutron = 1.00000E+00\n"
+
+        with open(runner.spectra_file(1.05)) as file:
+            assert file.read() == "spectrum for 1.05\n"
+
+        # Only the final outputs remain, the scratch directory is removed
+        assert sorted(os.listdir(runner.base_path)) == [
+            "NSpectra",
+            "TalysInputs",
+            "TalysOut",
+        ]
+
+    def test_run_in_scratch_dir_failed_talys(self):
+        with patch("neucbot.talys.ISOTOPES_DIR", self.isotopes_dir):
+            runner = Runner("C", 12)
+
+            with self.assertRaisesRegex(RuntimeError, r"Failed TALYS command:"):
+                runner.run_in_scratch_dir(9.99)
+
+        assert not os.path.exists(runner.spectra_file(9.99))
+
+    def test_run_parallel(self):
+        jobs = [("C", 12, 1.0), ("C", 12, 1.01), ("O", 16, 1.0), ("C", 12, 9.99)]
+
+        with patch("neucbot.talys.ISOTOPES_DIR", self.isotopes_dir):
+            failed_jobs = run_parallel(jobs, 2)
+
+        assert failed_jobs == [("C", 12, 9.99)]
+
+        for element, mass_number, energy in jobs[:3]:
+            spectra_file = os.path.join(
+                self.isotopes_dir,
+                element,
+                f"{element}{mass_number}",
+                "NSpectra",
+                "nspec{0:0>7.3f}.tot".format(energy),
+            )
+
+            with open(spectra_file) as file:
+                assert file.read() == f"spectrum for {energy}\n"
+
+    def test_run_parallel_reports_any_failure(self):
+        # A file where the isotope directory belongs makes the worker raise
+        # an OSError rather than a RuntimeError
+        os.makedirs(self.isotopes_dir)
+        open(os.path.join(self.isotopes_dir, "N"), "w").close()
+
+        jobs = [("C", 12, 1.0), ("N", 14, 1.0)]
+
+        with patch("neucbot.talys.ISOTOPES_DIR", self.isotopes_dir):
+            with patch("builtins.print") as mocked_print:
+                failed_jobs = run_parallel(jobs, 2, quiet=True)
+
+        assert failed_jobs == [("N", 14, 1.0)]
+        mocked_print.assert_not_called()
@@ -1,4 +1,5 @@
 import pytest
+import numpy
 from unittest import TestCase
 
 from neucbot import utils
@@ -53,3 +54,58 @@ class TestHistogram(TestCase):
 
     def test_rebin(self):
         assert self.histogram.rebin().to_dict() == self.histogram.to_dict()
+
+    def test_get_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.histogram.get(150)
+
+    def test_items(self):
+        assert list(self.histogram.items()) == [
+            (100, 1),
+            (200, 2),
+            (300, 3),
+            (400, 4),
+            (500, 5),
+        ]
+
+    def test_from_arrays(self):
+        histogram = utils.Histogram.from_arrays(
+            numpy.array([100, 200]), numpy.array([1.0, 2.0])
+        )
+
+        assert histogram.to_dict() == {100: 1.0, 200: 2.0}
+        assert histogram.get(200) == 2.0
+
+    def test_empty(self):
+        histogram = utils.Histogram()
+
+        assert histogram.keys() == []
+        assert histogram.to_dict() == {}
+        assert histogram.integrate() == 0
+        assert histogram.rebin().to_dict() == {}
+
+    def test_rebin_combines_points(self):
+        histogram = utils.Histogram({50: 1.0, 100: 2.0, 120: 4.0, 180: 6.0})
+
+        # Each point is weighted by the spacing to the previous point (the
+        # first by its distance from 0) and each bin is renormalized
+        assert histogram.rebin().to_dict() == {
+            0: 1.0,
+            100: pytest.approx((2.0 * 50 + 4.0 * 20 + 6.0 * 60) / 130),
+        }
+
+    def test_rebin_underflow_and_overflow(self):
+        histogram = utils.Histogram({100: 1.0, 300: 2.0, 25000: 3.0})
+
+        assert histogram.rebin(min_bin=200).to_dict() == {
+            -1: 1.0,
+            300: 2.0,
+            1198: 3.0,
+        }
+
+    def test_rebin_custom_binning(self):
+        assert self.histogram.rebin(step=200).to_dict() == {
+            0: 1.0,
+            200: 2.5,
+            400: 4.5,
+        }